@@ -0,0 +1,9 @@
+"""
+benchmarks
+
+Benchmark suite for nmrPype, written for airspeed velocity (asv).
+
+Run with ``asv run`` from the repository root, or without asv through
+``python -m benchmarks``. Data sets are generated synthetically, see
+:py:mod:`benchmarks.synthetic`, so the suite runs offline.
+"""
@@ -0,0 +1,135 @@
+"""
+Run the benchmark suite without asv
+
+Usage::
+
+    python -m benchmarks [-b REGEX] [-size small|medium|large] [-repeat N] [-json FILE]
+
+Every ``time_*`` benchmark reports the minimum and median of its samples,
+``peakmem_*`` benchmarks report the peak memory traced while running once.
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import os
+import pkgutil
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+from .synthetic import SHAPES, SIZE_ENV
+
+
+def benchmarks(pattern : str = ''):
+    """
+    Collect the benchmark methods of every benchmark module
+
+    Yields
+    ------
+    tuple[str, type, str]
+        Benchmark name, benchmark class and method name
+    """
+    package = os.path.dirname(__file__)
+    for module in pkgutil.iter_modules([package]):
+        if not module.name.startswith('bench_'):
+            continue
+        mod = importlib.import_module('{}.{}'.format(__package__, module.name))
+        for clsName, cls in vars(mod).items():
+            if not isinstance(cls, type) or cls.__module__ != mod.__name__:
+                continue
+            for method in sorted(vars(cls)):
+                if not method.startswith(('time_', 'peakmem_')):
+                    continue
+                name = '{}.{}.{}'.format(module.name, clsName, method)
+                if re.search(pattern, name):
+                    yield name, cls, method
+
+
+def combinations(cls) -> list[tuple]:
+    """
+    Parameter combinations of a benchmark class
+    """
+    params = getattr(cls, 'params', None)
+    if params is None:
+        return [()]
+    if not params or not isinstance(params[0], list):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def sample(cls, method : str, args : tuple) -> float | None:
+    """
+    Time or trace one call of a benchmark on a freshly set up instance,
+    returns None if the parameters are not supported
+    """
+    bench = cls()
+    try:
+        if hasattr(bench, 'setup'):
+            bench.setup(*args)
+    except NotImplementedError:
+        return None
+    try:
+        func = getattr(bench, method)
+        if method.startswith('peakmem_'):
+            tracemalloc.start()
+            func(*args)
+            result = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            func(*args)
+            result = time.perf_counter() - start
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*args)
+    return result
+
+
+def main(argv : list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run the nmrPype benchmarks')
+    parser.add_argument('-b', '--bench', default='', metavar='REGEX',
+                        help='Only run benchmarks matching the regular expression')
+    parser.add_argument('-size', '--size', choices=list(SHAPES), default=None,
+                        help='Size of the synthetic data sets [{} or small]'.format(SIZE_ENV))
+    parser.add_argument('-repeat', '--repeat', type=int, default=None,
+                        help='Number of samples per benchmark, by default the benchmark repeat count')
+    parser.add_argument('-json', '--json', metavar='FILE', default=None,
+                        help='Write the results as JSON to a file')
+    args = parser.parse_args(argv)
+
+    if args.size:
+        os.environ[SIZE_ENV] = args.size
+
+    results = []
+    for name, cls, method in benchmarks(args.bench):
+        for params in combinations(cls):
+            count = 1 if method.startswith('peakmem_') else (args.repeat or getattr(cls, 'repeat', 5))
+            samples = []
+            for _ in range(count):
+                value = sample(cls, method, params)
+                if value is None:
+                    break
+                samples.append(value)
+            if not samples:
+                continue
+
+            label = "{}({})".format(name, ", ".join(str(p) for p in params))
+            if method.startswith('peakmem_'):
+                print("{:<72} {:>10.1f} MiB".format(label, samples[0] / 2**20), flush=True)
+            else:
+                print("{:<72} {:>10.3f} ms  median {:>10.3f} ms".format(
+                    label, min(samples) * 1e3, statistics.median(samples) * 1e3), flush=True)
+            results.append({'name' : name, 'params' : [str(p) for p in params], 'samples' : samples})
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'size' : os.environ.get(SIZE_ENV, 'small'), 'results' : results}, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
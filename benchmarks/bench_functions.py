@@ -0,0 +1,115 @@
+"""
+Benchmarks of each processing function, run serially and with -mp
+"""
+
+import os
+import shutil
+import tempfile
+
+from nmrPype.nmrio import write
+
+from .synthetic import benchShape, syntheticFrame, syntheticArray, syntheticHeader
+
+# Function arguments, matching the command-line destinations
+ARGS = {'FT' : {},
+        'ZF' : {},
+        'SP' : {'sp_off' : 0.5, 'sp_end' : 0.98, 'sp_pow' : 2.0},
+        'PS' : {'ps_p0' : 30.0, 'ps_p1' : -20.0},
+        'HT' : {},
+        'DI' : {},
+        'SPFT' : {'spft_off' : 0.5, 'spft_end' : 0.98, 'spft_pow' : 2.0}}
+
+# Functions that run on frequency domain data
+SPECTRAL = ('PS', 'HT', 'DI')
+
+# Parallel backends, 'serial' disables -mp
+BACKENDS = ['serial', 'threads', 'processes']
+
+
+def mpArgs(backend : str) -> dict:
+    """
+    Multiprocessing arguments for a backend, as given by -mp, -proc and -t
+    """
+    if backend == 'serial':
+        return {'mp_enable' : False, 'mp_proc' : 0, 'mp_threads' : 0}
+    return {'mp_enable' : backend, 'mp_proc' : os.cpu_count(), 'mp_threads' : min(os.cpu_count(), 4)}
+
+
+def spectralFrame(ndim : int):
+    """
+    Synthetic data frame after a fourier transform of the direct dimension
+    """
+    frame = syntheticFrame(benchShape(ndim))
+    frame.runFunc('FT', {})
+    return frame
+
+
+class Functions:
+    """
+    Single processing functions over 1D to 4D data and each backend
+    """
+    params = [list(ARGS), [1, 2, 3, 4], BACKENDS]
+    param_names = ['function', 'ndim', 'backend']
+    # Functions modify the data frame, every sample runs on a fresh frame
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, function, ndim, backend):
+        if ndim == 1 and backend != 'serial':
+            # 1D data is always processed serially
+            raise NotImplementedError
+        self.frame = spectralFrame(ndim) if function in SPECTRAL else syntheticFrame(benchShape(ndim))
+        if function == 'HT':
+            self.frame.runFunc('DI', {})
+        self.args = dict(ARGS[function], **mpArgs(backend))
+
+    def time_function(self, function, ndim, backend):
+        self.frame.runFunc(function, self.args)
+
+
+class Transpose:
+    """
+    Transposing 2D to 4D data
+    """
+    params = [['YTP', 'ZTP', 'ATP'], [2, 3, 4]]
+    param_names = ['function', 'ndim']
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, function, ndim):
+        if {'ZTP' : 3, 'ATP' : 4}.get(function, 2) > ndim:
+            raise NotImplementedError
+        self.frame = spectralFrame(ndim)
+
+    def time_transpose(self, function, ndim):
+        self.frame.runFunc(function, {})
+
+
+class Decomposition:
+    """
+    Decomposing 2D data with a basis set
+    """
+    params = [2, 4, 8]
+    param_names = ['bases']
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, bases):
+        shape = benchShape(2)
+        self.dir = tempfile.mkdtemp()
+        self.bases = []
+        for i in range(bases):
+            path = os.path.join(self.dir, 'basis{:02d}.fid'.format(i))
+            write(path, syntheticHeader(shape), syntheticArray(shape, seed=i + 1), overwrite=True)
+            self.bases.append(path)
+        self.frame = syntheticFrame(shape, seed=1)
+        self.args = {'deco_bases' : self.bases, 'deco_cfile' : os.path.join(self.dir, 'coef.dat')}
+
+    def teardown(self, bases):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_deco(self, bases):
+        self.frame.runFunc('DECO', self.args)
@@ -0,0 +1,81 @@
+"""
+Benchmarks of NMRPipe file reading, writing and header encoding
+"""
+
+import copy
+import io
+import os
+import shutil
+import tempfile
+
+from nmrPype.nmrio import read, read_header, write, write_to_buffer
+from nmrPype.utils.fdata import dic2fdata, fdata2dic
+
+from .synthetic import benchShape, syntheticHeader, syntheticFrame, writeSynthetic, _cached
+
+
+class Read:
+    """
+    Reading NMRPipe files and streams
+    """
+    params = [1, 2, 3, 4]
+    param_names = ['ndim']
+
+    def setup(self, ndim):
+        self.dir = tempfile.mkdtemp()
+        self.path = writeSynthetic(os.path.join(self.dir, 'data.fid'), benchShape(ndim))
+        with open(self.path, 'rb') as f:
+            self.stream = f.read()
+
+    def teardown(self, ndim):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_read(self, ndim):
+        read(self.path)
+
+    def time_read_stream(self, ndim):
+        read(io.BytesIO(self.stream))
+
+    def time_read_header(self, ndim):
+        read_header(self.path)
+
+    def peakmem_read(self, ndim):
+        read(self.path)
+
+
+class Write:
+    """
+    Writing NMRPipe files and streams
+    """
+    params = [1, 2, 3, 4]
+    param_names = ['ndim']
+
+    def setup(self, ndim):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'data.fid')
+        self.dic, self.array = _cached(benchShape(ndim), 0)
+        self.frame = syntheticFrame(benchShape(ndim))
+
+    def teardown(self, ndim):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_write(self, ndim):
+        write(self.path, copy.deepcopy(self.dic), self.array, overwrite=True)
+
+    def time_write_stream(self, ndim):
+        write_to_buffer(self.frame, io.BytesIO(), False)
+
+
+class HeaderCodec:
+    """
+    Converting headers between their dictionary and binary forms
+    """
+    def setup(self):
+        self.dic = syntheticHeader(benchShape(2))
+        self.fdata = dic2fdata(self.dic)
+
+    def time_dic2fdata(self):
+        dic2fdata(self.dic)
+
+    def time_fdata2dic(self):
+        fdata2dic(self.fdata)
@@ -0,0 +1,131 @@
+"""
+Benchmarks of canonical multi-function processing pipelines
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from .synthetic import benchShape, syntheticFrame, writeSynthetic
+from .bench_functions import BACKENDS, mpArgs
+
+TRANSPOSE = {2 : 'YTP', 3 : 'ZTP'}
+
+
+def dimension(size : int) -> list[tuple[str, dict]]:
+    """
+    Processing of one dimension of size complex points, zero filled to double its size
+    """
+    return [('SP', {'sp_off' : 0.5, 'sp_end' : 0.98, 'sp_pow' : 2.0, 'sp_c' : 0.5}),
+            ('ZF', {'zf_size' : 2 * size}),
+            ('FT', {}),
+            ('PS', {'ps_p0' : 30.0, 'ps_p1' : -20.0})]
+
+
+def pipeline(shape : tuple) -> list[tuple[str, dict]]:
+    """
+    Canonical pipeline processing every dimension of 2D or 3D data,
+    SP|ZF|FT|PS|YTP|SP|ZF|FT|PS for 2D data and followed by ZTP|SP|ZF|FT|PS for 3D data
+    """
+    # Indirect dimensions interleave real and imaginary vectors
+    sizes = [shape[-1]] + [n // 2 for n in reversed(shape[:-1])]
+    stages = dimension(sizes[0])
+    for dim in range(1, len(shape)):
+        stages += [(TRANSPOSE[dim + 1], {})] + dimension(sizes[dim])
+    return stages
+
+
+def command(stages : list[tuple[str, dict]]) -> list[str]:
+    """
+    Command-line switches of each pipeline stage
+    """
+    switches = {'sp_off' : '-off', 'sp_end' : '-end', 'sp_pow' : '-pow', 'sp_c' : '-c',
+                'zf_size' : '-size', 'ps_p0' : '-p0', 'ps_p1' : '-p1'}
+    commands = []
+    for code, args in stages:
+        words = ['-fn', code]
+        for dest, value in args.items():
+            words += [switches[dest]] if value is True else [switches[dest], str(value)]
+        commands.append(" ".join(words))
+    return commands
+
+
+class Pipeline:
+    """
+    Full processing of 2D and 3D data in a single process,
+    with and without fusing SP, ZF and FT
+    """
+    params = [[2, 3], [False, True], BACKENDS]
+    param_names = ['ndim', 'fuse', 'backend']
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, ndim, fuse, backend):
+        self.frame = syntheticFrame(benchShape(ndim))
+        mp = mpArgs(backend)
+        self.stages = [(code, dict(args, **mp)) for code, args in pipeline(benchShape(ndim))]
+
+    def time_pipeline(self, ndim, fuse, backend):
+        self.frame.runFuncs(self.stages, fuse=fuse)
+
+    def peakmem_pipeline(self, ndim, fuse, backend):
+        self.frame.runFuncs(self.stages, fuse=fuse)
+
+
+class Builder:
+    """
+    Full processing of 2D and 3D data with the pipeline builder,
+    choosing the parallelism of each function
+    """
+    params = [2, 3]
+    param_names = ['ndim']
+    number = 1
+    repeat = 5
+    warmup_time = 0
+
+    def setup(self, ndim):
+        from nmrPype.pipeline import Pipeline
+        self.frame = syntheticFrame(benchShape(ndim))
+        self.pipeline = Pipeline(self.frame)
+        for code, args in pipeline(benchShape(ndim)):
+            self.pipeline = self.pipeline.add(code, **args)
+
+    def time_builder(self, ndim):
+        self.pipeline.run()
+
+    def peakmem_builder(self, ndim):
+        self.pipeline.run()
+
+
+class CommandLine:
+    """
+    Full processing of 2D data as a shell pipeline of nmrPype processes
+    """
+    params = BACKENDS
+    param_names = ['backend']
+    number = 1
+    repeat = 3
+    warmup_time = 0
+    timeout = 600
+
+    def setup(self, backend):
+        self.dir = tempfile.mkdtemp()
+        path = writeSynthetic(os.path.join(self.dir, 'data.fid'), benchShape(2))
+        mp = '' if backend == 'serial' else ' -mp {}'.format(backend)
+        # Same entry point as the nmrPype console script
+        pype = "{} -c 'import sys; from nmrPype.pype import main; sys.exit(main())'{}".format(
+            shlex.quote(sys.executable), mp)
+        stages = command(pipeline(benchShape(2)))
+        stages[0] = "-in {} {}".format(shlex.quote(path), stages[0])
+        stages[-1] += " -out {} -ov".format(shlex.quote(os.path.join(self.dir, 'data.ft2')))
+        self.command = " | ".join("{} {}".format(pype, stage) for stage in stages)
+
+    def teardown(self, backend):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def time_command_line(self, backend):
+        subprocess.run(self.command, shell=True, check=True)
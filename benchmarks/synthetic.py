@@ -0,0 +1,218 @@
+"""
+synthetic
+
+Synthetic NMRPipe time-domain data sets for the benchmarks.
+
+Data sets are States-style complex in every dimension and hold a few decaying
+signals per dimension with a small amount of noise, so every function has
+realistic work to do. Sizes are selected by the ``NMRPYPE_BENCH_SIZE``
+environment variable (``small``, ``medium`` or ``large``, by default
+``small``) or by passing a shape directly.
+"""
+
+import copy
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from nmrPype.fn.DECO import HEADER_TEMPLATE
+from nmrPype.utils import DataFrame
+
+SIZE_ENV = 'NMRPYPE_BENCH_SIZE'
+
+# Array shapes per dimensionality, the last axis counts complex points
+SHAPES = {
+    'small' : {1 : (4096,),
+               2 : (256, 1024),
+               3 : (32, 64, 512),
+               4 : (8, 16, 32, 256)},
+    'medium' : {1 : (65536,),
+                2 : (1024, 2048),
+                3 : (64, 128, 1024),
+                4 : (16, 32, 64, 512)},
+    'large' : {1 : (1048576,),
+               2 : (2048, 8192),
+               3 : (128, 256, 2048),
+               4 : (32, 64, 64, 1024)},
+}
+
+# Dimension labels and spectral parameters in header dimension order
+LABELS = ('HN', 'N', 'CA', 'CB')
+SW = (8000.0, 2000.0, 6000.0, 6000.0)
+OBS = (600.0, 60.8, 150.9, 150.9)
+CAR = (4.7, 118.0, 56.0, 42.0)
+
+
+def benchSize() -> str:
+    """
+    Size selected for the benchmarks
+
+    Returns
+    -------
+    str
+        Key of :py:data:`SHAPES`
+    """
+    size = os.environ.get(SIZE_ENV, 'small').lower()
+    if size not in SHAPES:
+        raise ValueError("{} must be one of {}".format(SIZE_ENV, ", ".join(SHAPES)))
+    return size
+
+
+def benchShape(ndim : int, size : str | None = None) -> tuple:
+    """
+    Array shape of a synthetic data set
+
+    Parameters
+    ----------
+    ndim : int
+        Number of dimensions, 1 to 4
+    size : str | None
+        Key of :py:data:`SHAPES`, the environment selection is used if None
+
+    Returns
+    -------
+    tuple
+        Array shape, slowest dimension first
+    """
+    return SHAPES[size or benchSize()][ndim]
+
+
+def syntheticHeader(shape : tuple) -> dict:
+    """
+    NMRPipe header describing complex time-domain data of the given array shape
+
+    Parameters
+    ----------
+    shape : tuple
+        Array shape, the last axis counts complex points
+
+    Returns
+    -------
+    dict
+        Header dictionary
+    """
+    dic = copy.deepcopy(HEADER_TEMPLATE)
+    ndim = len(shape)
+    sizes = list(reversed(shape))   # header dimension order, direct dimension first
+    prefixes = ('FDF2', 'FDF1', 'FDF3', 'FDF4')
+
+    dic['FDDIMCOUNT'] = float(ndim)
+    dic['FDDIMORDER'] = [2.0, 1.0, 3.0, 4.0]
+    for i, order in enumerate(dic['FDDIMORDER']):
+        dic['FDDIMORDER{}'.format(i + 1)] = order
+    dic['FDQUADFLAG'] = 0.0
+    dic['FDTRANSPOSED'] = 0.0
+    dic['FDPIPEFLAG'] = 1.0 if ndim > 2 else 0.0
+    dic['FDFILECOUNT'] = 1.0
+
+    dic['FDSIZE'] = float(sizes[0])
+    dic['FDSPECNUM'] = float(sizes[1]) if ndim > 1 else 1.0
+    dic['FDF3SIZE'] = float(sizes[2]) if ndim > 2 else 1.0
+    dic['FDF4SIZE'] = float(sizes[3]) if ndim > 3 else 1.0
+
+    # Every dimension is complex, indirect dimensions interleave their real and imaginary vectors
+    for i, prefix in enumerate(prefixes[:ndim]):
+        size = sizes[i] if i == 0 else max(1, sizes[i] // 2)
+        dic[prefix + 'QUADFLAG'] = 0.0
+        dic[prefix + 'TDSIZE'] = float(size)
+        dic[prefix + 'APOD'] = float(size)
+        dic[prefix + 'CENTER'] = float(size // 2 + 1)
+        dic[prefix + 'SW'] = SW[i]
+        dic[prefix + 'OBS'] = OBS[i]
+        dic[prefix + 'CAR'] = CAR[i]
+        dic[prefix + 'ORIG'] = OBS[i] * CAR[i] - SW[i] * (size - size // 2 - 1) / size
+        dic[prefix + 'FTFLAG'] = 0.0
+        dic[prefix + 'LABEL'] = LABELS[i]
+    return dic
+
+
+def syntheticArray(shape : tuple, seed : int = 0, signals : int = 3) -> np.ndarray:
+    """
+    Complex time-domain data of decaying signals with noise
+
+    Parameters
+    ----------
+    shape : tuple
+        Array shape, the last axis counts complex points
+    seed : int
+        Seed of the signal frequencies and noise
+    signals : int
+        Number of signals
+
+    Returns
+    -------
+    ndarray
+        complex64 array
+    """
+    rng = np.random.default_rng(seed)
+    array = np.zeros(shape, dtype='complex64')
+    for _ in range(signals):
+        signal = np.ones((1,) * len(shape), dtype='complex64')
+        for axis, size in enumerate(shape):
+            t = np.arange(size, dtype='float32') / size
+            decay = np.exp(-rng.uniform(1, 5) * t)
+            phase = 2 * np.pi * rng.uniform(-0.4, 0.4) * size * t
+            if axis == len(shape) - 1:
+                vector = (decay * np.exp(1j * phase)).astype('complex64')
+            else:
+                vector = (decay * np.cos(phase)).astype('complex64')
+            signal = signal * vector.reshape([-1 if a == axis else 1 for a in range(len(shape))])
+        array += signal
+    noise = rng.standard_normal(shape + (2,), dtype='float32') * 1e-3
+    array += noise.view('complex64')[..., 0]
+    return array
+
+
+@lru_cache(maxsize=None)
+def _cached(shape : tuple, seed : int) -> tuple[dict, np.ndarray]:
+    array = syntheticArray(shape, seed)
+    array.flags.writeable = False
+    return syntheticHeader(shape), array
+
+
+def syntheticFrame(shape : tuple, seed : int = 0) -> DataFrame:
+    """
+    Fresh data frame holding a synthetic data set,
+    data sets are generated once and copied into each frame
+
+    Parameters
+    ----------
+    shape : tuple
+        Array shape, the last axis counts complex points
+    seed : int
+        Seed of the signal frequencies and noise
+
+    Returns
+    -------
+    DataFrame
+        Data frame owning a writable copy of the data
+    """
+    dic, array = _cached(tuple(shape), seed)
+    frame = DataFrame(header=copy.deepcopy(dic))
+    frame.setArray(frame.own(array.copy()))
+    return frame
+
+
+def writeSynthetic(path : str, shape : tuple, seed : int = 0) -> str:
+    """
+    Write a synthetic data set as a NMRPipe file
+
+    Parameters
+    ----------
+    path : str
+        Output file path
+    shape : tuple
+        Array shape, the last axis counts complex points
+    seed : int
+        Seed of the signal frequencies and noise
+
+    Returns
+    -------
+    str
+        Output file path
+    """
+    from nmrPype.nmrio import write
+    dic, array = _cached(tuple(shape), seed)
+    write(path, copy.deepcopy(dic), array, overwrite=True)
+    return path
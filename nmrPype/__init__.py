@@ -1,6 +1,29 @@
-from nmrPype.nmrio import *
-from nmrPype.utils import *
-from nmrPype.utils.fdata import *
-from nmrPype.fn import *
-from nmrPype.parse import *
-from nmrPype.pype import *
\ No newline at end of file
+import importlib
+
+# Modules exporting their public names from the package, later modules take precedence.
+# Modules are imported on first use, so light entry points (e.g. nmrPype.daemon) start quickly.
+_MODULES = ('nmrPype.nmrio', 'nmrPype.utils', 'nmrPype.utils.fdata',
+            'nmrPype.fn', 'nmrPype.parse', 'nmrPype.pype', 'nmrPype.pipeline')
+
+_SUBMODULES = ('nmrio', 'utils', 'fn', 'parse', 'pype', 'pipeline', 'batch', 'daemon')
+
+def _exports(module) -> list[str]:
+    names = getattr(module, '__all__', None)
+    return list(names) if names is not None else [name for name in vars(module) if not name.startswith('_')]
+
+def __getattr__(name : str):
+    if name == '__all__':
+        names = []
+        for path in _MODULES:
+            names += [n for n in _exports(importlib.import_module(path)) if n not in names]
+        return names
+    if name in _SUBMODULES:
+        return importlib.import_module('{}.{}'.format(__name__, name))
+    for path in reversed(_MODULES):
+        module = importlib.import_module(path)
+        if name in _exports(module):
+            return getattr(module, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__getattr__('__all__')))
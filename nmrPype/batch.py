@@ -0,0 +1,456 @@
+"""
+batch
+
+Batch processing of many data sets with the same processing script.
+
+The script holds nmrPype or NMRPipe stages as they are written in a shell
+pipeline, one stage per line or separated by ``|`` with lines continued by
+``\\``. Input and output switches in the script are ignored, the inputs are
+the files given to the batch and each output is named after its input::
+
+    nmrPipe -in test.fid \\
+    | nmrPipe -fn SP -off 0.5 -end 0.98 -pow 2 -c 0.5 \\
+    | nmrPipe -fn ZF -auto \\
+    | nmrPipe -fn FT \\
+    | nmrPipe -fn PS -p0 43 -p1 0 -di \\
+      -out test.ft1 -ov
+
+Every data set is read, processed and written by a single worker process
+of a pool that lives for the whole batch, so data sets are never passed between
+processes, and only a bounded number of data sets are handed to the pool at once.
+A data set that fails is reported without stopping the others, and a data set
+whose worker dies is retried on its own before being reported.
+
+Usage::
+
+    nmrPype-batch -script proc.com -in "fid/*.fid" -outdir ft -ext .ft1 -workers 8
+
+or from Python::
+
+    from nmrPype.batch import batch
+    results = batch("proc.com", "fid/*.fid", outdir="ft", ext=".ft1")
+"""
+
+import glob
+import os
+import shlex
+import sys
+import time
+from collections import deque
+
+from .pipeline import Pipeline, parameters
+from .utils import FunctionError, FileIOError
+
+# Characters marking a glob pattern among the inputs
+GLOB_CHARACTERS = '*?['
+
+# Data sets handed to the pool per worker, so a worker finishing one has the next ready
+INFLIGHT_PER_WORKER = 2
+
+# Pipeline run by each worker process, see _initWorker
+_pipeline = None
+
+
+############
+#  Script  #
+############
+
+def parseScript(text : str, fuse : bool = True) -> Pipeline:
+    """
+    Build the pipeline of a processing script
+
+    Parameters
+    ----------
+    text : str
+        Script text, with nmrPype or NMRPipe stages in the order they are run
+    fuse : bool
+        Fuse functions that can be run in a single pass, see :py:class:`nmrPype.pipeline.Pipeline`
+
+    Returns
+    -------
+    Pipeline
+        Pipeline of the script's functions, without a source
+    """
+    from .fn import fn_list
+    from .parse import parser
+
+    pipeline = Pipeline(None, fuse=fuse)
+
+    for words in scriptStages(text):
+        try:
+            args = parser(words)
+        except SystemExit:
+            raise FunctionError("FunctionError - Invalid stage in script: {0}".format(" ".join(words))) from None
+        if args.modify:
+            print("WARNING! Header modification is not supported in batch scripts:", *args.modify, file=sys.stderr)
+        if args.fc is None:
+            continue
+
+        params = parameters(fn_list[args.fc])
+        pipeline = pipeline.add(args.fc, **{name : value for name, value in vars(args).items() if name in params})
+
+        # Delete imaginary data after the function like the command-line
+        if args.di:
+            pipeline = pipeline.add('DI')
+
+    return pipeline
+
+
+def scriptStages(text : str) -> list[list[str]]:
+    """
+    Split a processing script into the switches of each stage
+
+    Parameters
+    ----------
+    text : str
+        Script text
+
+    Returns
+    -------
+    list[list[str]]
+        Switches of every stage holding a function, without the program name
+    """
+    stages = []
+    for line in text.replace('\\\n', ' ').splitlines():
+        lexer = shlex.shlex(line, posix=True, punctuation_chars='|')
+        lexer.whitespace_split = True
+        stage = []
+        for word in list(lexer) + ['|']:
+            if word != '|':
+                stage.append(word)
+                continue
+            # Drop the program name preceding the switches
+            while stage and not stage[0].startswith('-'):
+                stage.pop(0)
+            if any(word in ('-fn', '--function') for word in stage):
+                stages.append(stage)
+            stage = []
+    return stages
+
+
+def readScript(path : str, fuse : bool = True) -> Pipeline:
+    """
+    Build the pipeline of a processing script file, see :py:func:`parseScript`
+    """
+    with open(path) as script:
+        return parseScript(script.read(), fuse)
+
+
+############
+#  Inputs  #
+############
+
+def expandInputs(inputs : list[str] | str) -> list[str]:
+    """
+    Input files of a batch, with glob patterns expanded
+
+    Parameters
+    ----------
+    inputs : list[str] | str
+        Files or glob patterns, patterns are expanded in sorted order
+
+    Returns
+    -------
+    list[str]
+        Input files without duplicates, in the order given
+    """
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    files = []
+    for pattern in inputs:
+        if any(c in pattern for c in GLOB_CHARACTERS):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print("WARNING! No files match", pattern, file=sys.stderr)
+            files += matches
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+
+def outputPath(input : str, outdir : str | None, ext : str) -> str:
+    """
+    Output file of an input file, with the extension replaced
+
+    Parameters
+    ----------
+    input : str
+        Input file
+    outdir : str | None
+        Output directory, by default the directory of the input
+    ext : str
+        Output extension (e.g. .ft2), a ccp4 map is written for .map
+
+    Returns
+    -------
+    str
+        Output file path
+    """
+    directory, name = os.path.split(input)
+    return os.path.join(directory if outdir is None else outdir, os.path.splitext(name)[0] + ext)
+
+
+################
+#  Processing  #
+################
+
+def processFile(pipeline : Pipeline, input : str, output : str, overwrite : bool = False) -> dict:
+    """
+    Run a pipeline on one input file and write the result,
+    errors are reported in the result instead of raised
+
+    Parameters
+    ----------
+    pipeline : Pipeline
+        Pipeline to run
+    input : str
+        Input file
+    output : str
+        Output file
+    overwrite : bool
+        Choose whether or not to overwrite an existing output file
+
+    Returns
+    -------
+    dict
+        Result with the input, output, status (0 success 1 fail),
+        error message, shape of the output array and seconds taken
+    """
+    result = {'input' : input, 'output' : output, 'status' : 0, 'error' : None, 'shape' : None}
+    start = time.perf_counter()
+    try:
+        if os.path.abspath(input) == os.path.abspath(output):
+            raise FileIOError("FileIOError - Output file would replace the input file")
+        data = pipeline.withSource(input).run(output, overwrite)
+        result['shape'] = list(reversed(data.array.shape))
+    except Exception as e:
+        result['status'] = 1
+        result['error'] = "; ".join(str(arg) for arg in e.args) or type(e).__name__
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _initWorker(pipeline : Pipeline, double : bool):
+    """
+    Keep the pipeline in the worker process, so it is sent once per worker instead of once per file
+    """
+    from .utils import setPrecision
+    global _pipeline
+    setPrecision(double)
+    _pipeline = pipeline
+
+
+def _runFile(input : str, output : str, overwrite : bool) -> dict:
+    """
+    Process one file in a worker process with the worker's pipeline
+    """
+    return processFile(_pipeline, input, output, overwrite)
+
+
+def iterBatch(pipeline : Pipeline | str, inputs : list[str] | str, outdir : str | None = None,
+              ext : str = '.ft', overwrite : bool = False, workers : int | None = None,
+              inflight : int | None = None, double : bool = False):
+    """
+    Process every input file with the same pipeline, yielding results as files complete
+
+    Parameters
+    ----------
+    pipeline : Pipeline | str
+        Pipeline to run, or path of a processing script, see :py:func:`parseScript`
+    inputs : list[str] | str
+        Input files or glob patterns
+    outdir : str | None
+        Output directory, by default the directory of each input
+    ext : str
+        Output extension replacing the input extension, a ccp4 map is written for .map
+    overwrite : bool
+        Choose whether or not to overwrite existing output files
+    workers : int | None
+        Number of worker processes, by default the number of processors,
+        files are processed in this process with a single worker
+    inflight : int | None
+        Largest number of files handed to the workers at once, by default two per worker
+    double : bool
+        Process data in double precision, output remains float32
+
+    Yields
+    ------
+    dict
+        Result of each file in the order they complete, see :py:func:`processFile`,
+        with the position of the file among the inputs as index
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+
+    if isinstance(pipeline, str):
+        pipeline = readScript(pipeline)
+    workers = max(1, workers or os.cpu_count() or 1)
+    inflight = max(workers, inflight or INFLIGHT_PER_WORKER * workers)
+
+    files = expandInputs(inputs)
+    outputs = [outputPath(input, outdir, ext) for input in files]
+    duplicates = {output for output in outputs if outputs.count(output) > 1}
+    if duplicates:
+        raise FileIOError("FileIOError - Several inputs would be written to {0}".format(", ".join(sorted(duplicates))))
+    if outdir is not None:
+        os.makedirs(outdir, exist_ok=True)
+
+    def indexed(index : int, result : dict) -> dict:
+        return dict(result, index=index)
+
+    if workers == 1:
+        from .utils import setPrecision
+        setPrecision(double)
+        for index, (input, output) in enumerate(zip(files, outputs)):
+            yield indexed(index, processFile(pipeline, input, output, overwrite))
+        return
+
+    # Parallelism comes from processing files side by side
+    pipeline = pipeline.withSource(None)
+    pipeline.parallel = 'serial'
+
+    tasks = deque(enumerate(zip(files, outputs)))
+    # Files whose worker died alongside other files, run one at a time to find the cause
+    suspects = deque()
+    pending = {}
+
+    def submit(queue : deque, alone : bool):
+        pending[executor.submit(_runFile, *queue[0][1], overwrite)] = (queue[0], alone)
+        queue.popleft()
+
+    executor = ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(pipeline, double))
+    try:
+        while tasks or suspects or pending:
+            broken = False
+            try:
+                if suspects:
+                    if not pending:
+                        submit(suspects, True)
+                else:
+                    while tasks and len(pending) < inflight:
+                        submit(tasks, False)
+            except BrokenProcessPool:
+                broken = True
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED) if pending else (set(), set())
+            for future in done:
+                (index, (input, output)), alone = pending.pop(future)
+                try:
+                    yield indexed(index, future.result())
+                except BrokenProcessPool:
+                    broken = True
+                    if alone:
+                        yield indexed(index, {'input' : input, 'output' : output, 'status' : 1,
+                                              'error' : "Worker process exited while processing the file",
+                                              'shape' : None, 'seconds' : 0.0})
+                    else:
+                        suspects.append((index, (input, output)))
+
+            if broken:
+                # Every file left in the pool failed with it
+                for task, alone in pending.values():
+                    (suspects.appendleft if alone else suspects.append)(task)
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(pipeline, double))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def batch(pipeline : Pipeline | str, inputs : list[str] | str, outdir : str | None = None,
+          ext : str = '.ft', overwrite : bool = False, workers : int | None = None,
+          inflight : int | None = None, double : bool = False) -> list[dict]:
+    """
+    Process every input file with the same pipeline, see :py:func:`iterBatch`
+
+    Returns
+    -------
+    list[dict]
+        Result of each file in the order of the inputs, see :py:func:`processFile`
+    """
+    results = list(iterBatch(pipeline, inputs, outdir, ext, overwrite, workers, inflight, double))
+    return sorted(results, key=lambda result : result['index'])
+
+
+#################
+#  Entry Point  #
+#################
+
+def main(argv : list[str] | None = None) -> int:
+    """
+    Entry point of the nmrPype-batch console script
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Command-line arguments, by default the arguments of the current process
+
+    Returns
+    -------
+    int
+        Integer exit code, 1 if any file failed
+    """
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='nmrPype-batch',
+                            description='Process many NMR data files with the same processing script')
+    parser.add_argument('-script', metavar='scriptFile', required=True, dest='script',
+                        help='Processing script of nmrPype or NMRPipe stages')
+    parser.add_argument('-in', '--input', nargs='+', metavar='inName', default=[], dest='inputs',
+                        help='Input files or quoted glob patterns')
+    parser.add_argument('-list', metavar='listFile', default=None, dest='list',
+                        help='File listing an input file or glob pattern per line')
+    parser.add_argument('-outdir', metavar='outDir', default=None, dest='outdir',
+                        help='Output directory [input directory]')
+    parser.add_argument('-ext', metavar='outExt', default='.ft', dest='ext',
+                        help='Output extension replacing the input extension, .map for ccp4 maps [.ft]')
+    parser.add_argument('-ov', '--overwrite', action='store_true', dest='overwrite',
+                        help='Overwrite existing output files')
+    parser.add_argument('-workers', metavar='#', type=int, default=os.cpu_count(), dest='workers',
+                        help='Number of worker processes [{}]'.format(os.cpu_count()))
+    parser.add_argument('-inflight', metavar='#', type=int, default=None, dest='inflight',
+                        help='Largest number of files handed to the workers at once [2 per worker]')
+    parser.add_argument('-nofuse', action='store_false', dest='fuse',
+                        help='Run SP, ZF and FT as separate functions')
+    parser.add_argument('-double', '--double-precision', action='store_true', dest='double',
+                        help='Process data in double precision, output remains float32')
+    parser.add_argument('-verb', '--verbose', action='store_true', dest='verb',
+                        help='Report every file as it completes')
+    args = parser.parse_args(argv)
+
+    inputs = list(args.inputs)
+    if args.list:
+        with open(args.list) as listing:
+            inputs += [line.strip() for line in listing if line.strip() and not line.startswith('#')]
+    if not inputs:
+        parser.error("no input files, use -in or -list")
+
+    try:
+        pipeline = readScript(args.script, args.fuse)
+        count = len(expandInputs(inputs))
+        digits = len(str(count))
+        failed = []
+        for done, result in enumerate(iterBatch(pipeline, inputs, args.outdir, args.ext, args.overwrite,
+                                                args.workers, args.inflight, args.double), start=1):
+            if result['status']:
+                failed.append(result)
+            if args.verb or result['status']:
+                status = "FAILED" if result['status'] else "{:.2f} s".format(result['seconds'])
+                print("[{0:{2}d}/{1}] {3} -> {4} {5}".format(done, count, digits, result['input'],
+                      result['output'], status), file=sys.stderr)
+                if result['status']:
+                    print("    {}".format(result['error']), file=sys.stderr)
+    except (FunctionError, FileIOError, OSError) as e:
+        print("nmrPype-batch:", "; ".join(str(arg) for arg in e.args), file=sys.stderr)
+        return 1
+
+    print("Processed {0} of {1} files, {2} failed".format(count - len(failed), count, len(failed)), file=sys.stderr)
+    return 1 if failed else 0
+
+
+__all__ = ['batch', 'iterBatch', 'parseScript', 'readScript', 'processFile']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+daemon
+
+Persistent nmrPype server and its thin client.
+
+The server keeps an interpreter with every function module imported and every
+argument parser built, and listens on a Unix domain socket. The client sends its
+command-line arguments, working directory and environment together with its
+standard input, output and error file descriptors. The server forks a stage
+from the warm interpreter for each connection, which runs on the client's
+streams directly, so pipelines of clients pass data between each other exactly
+like pipelines of nmrPype processes do. The client falls back to running the
+stage itself if no server is listening.
+
+Messages are JSON frames preceded by their length as a 4-byte big-endian integer.
+
+Usage::
+
+    nmrPype-daemon [-socket PATH] [-stages N] &
+    nmrPype-client -in test.fid -fn FT | nmrPype-client -fn PS -p0 30 -out test.ft1
+
+The socket defaults to ``NMRPYPE_SOCKET`` or ``nmrPype-UID.sock`` in the
+runtime directory, and is only accessible by the user running the server.
+"""
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import tempfile
+
+SOCKET_ENV = 'NMRPYPE_SOCKET'
+
+# Frame header, length of the JSON message that follows
+FRAME = struct.Struct('>I')
+
+# Client file descriptors handed to the stage, standard input, output and error
+STREAMS = (0, 1, 2)
+
+
+def socketPath() -> str:
+    """
+    Path of the server socket
+
+    Returns
+    -------
+    str
+        ``NMRPYPE_SOCKET`` if set, otherwise nmrPype-UID.sock in
+        ``XDG_RUNTIME_DIR`` or the temporary directory
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, 'nmrPype-{}.sock'.format(os.getuid()))
+
+
+def sendFrame(sock : socket.socket, message : dict, fds : tuple[int, ...] = ()):
+    """
+    Send a message frame, with file descriptors attached if given
+    """
+    payload = json.dumps(message).encode()
+    data = FRAME.pack(len(payload)) + payload
+    if fds:
+        sent = socket.send_fds(sock, [data], list(fds))
+        data = data[sent:]
+    sock.sendall(data)
+
+
+def recvFrame(sock : socket.socket, maxfds : int = 0) -> tuple[dict | None, list[int]]:
+    """
+    Receive a message frame and the file descriptors attached to it
+
+    Returns
+    -------
+    tuple[dict | None, list[int]]
+        Message, None if the connection closed first, and the received file descriptors
+    """
+    fds = []
+    if maxfds:
+        head, fds, _, _ = socket.recv_fds(sock, FRAME.size, maxfds)
+    else:
+        head = sock.recv(FRAME.size)
+    head += recvExactly(sock, FRAME.size - len(head)) if head else b''
+    if len(head) < FRAME.size:
+        return None, fds
+    payload = recvExactly(sock, FRAME.unpack(head)[0])
+    return json.loads(payload), fds
+
+
+def recvExactly(sock : socket.socket, size : int) -> bytes:
+    """
+    Receive size bytes, fewer if the connection closes first
+    """
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+############
+#  Client  #
+############
+
+def client(argv : list[str] | None = None) -> int:
+    """
+    Run a stage on the server, or in this process if no server is listening
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        nmrPype command-line arguments, by default the arguments of the current process
+
+    Returns
+    -------
+    int
+        Integer exit code of the stage
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socketPath())
+    except OSError:
+        sock.close()
+        from .pype import main
+        return main(argv)
+
+    with sock:
+        sendFrame(sock, {'argv' : argv, 'cwd' : os.getcwd(), 'env' : dict(os.environ)}, STREAMS)
+        reply, _ = recvFrame(sock)
+
+    if reply is None:
+        print("nmrPype-client: the server closed the connection before the stage completed", file=sys.stderr)
+        return 1
+    return reply['status']
+
+
+def clientMain() -> int:
+    """
+    Entry point of the nmrPype-client console script
+    """
+    return client()
+
+
+############
+#  Server  #
+############
+
+def preload():
+    """
+    Import every function and build every argument parser ahead of the stages
+    """
+    import gc
+    from .fn import fn_list
+    from .parse.parser import buildParser
+    from . import pype
+
+    for code in fn_list:
+        fn_list[code]
+        buildParser(code)
+    buildParser('')
+    buildParser('*')
+
+    # Keep the loaded objects out of garbage collection, so forked stages share their memory
+    gc.collect()
+    gc.freeze()
+
+
+def runStage(request : dict, fds : list[int]) -> int:
+    """
+    Run a stage in a forked server process, on the client's streams
+
+    Parameters
+    ----------
+    request : dict
+        Client request with the argv, cwd and env of the client
+    fds : list[int]
+        Client standard input, output and error file descriptors
+
+    Returns
+    -------
+    int
+        Integer exit code of the stage
+    """
+    from .pype import main
+    from .utils.instrument import finishProfiling, enableProfiling, PROFILE_ENV
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    # Take over the client's streams
+    for fd, target in zip(fds, STREAMS):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', closefd=False)
+    sys.stderr = open(2, 'w', closefd=False)
+
+    # Run in the client's context
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    sys.argv = ['nmrPype'] + request['argv']
+
+    # Drop the server's instrumentation, the client may enable its own
+    finishProfiling()
+    profile = os.environ.get(PROFILE_ENV)
+    if profile and profile.lower() not in ('0', 'false', 'no', 'off'):
+        enableProfiling(profile)
+
+    try:
+        status = main(request['argv'])
+    except SystemExit as e:
+        # Help messages and argument errors
+        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        finishProfiling()
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+    return status or 0
+
+
+def serve(path : str | None = None, stages : int | None = None):
+    """
+    Serve stages on a Unix domain socket until interrupted
+
+    Parameters
+    ----------
+    path : str | None
+        Socket path, by default :py:func:`socketPath`
+    stages : int | None
+        Largest number of stages running at once, by default 4 per processor
+    """
+    import socketserver
+
+    class StageHandler(socketserver.BaseRequestHandler):
+        def handle(self):
+            request, fds = recvFrame(self.request, len(STREAMS))
+            if request is None or len(fds) != len(STREAMS):
+                for fd in fds:
+                    os.close(fd)
+                return
+            status = runStage(request, fds)
+            # Close the client's streams before replying, so the next stage sees the end of the data
+            for fd in STREAMS:
+                os.close(fd)
+            sendFrame(self.request, {'status' : status})
+
+    class StageServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        max_children = stages or 4 * (os.cpu_count() or 1)
+
+    path = path or socketPath()
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # Left behind by a server that did not shut down
+            os.unlink(path)
+        else:
+            probe.close()
+            raise OSError("An nmrPype server is already listening on {}".format(path))
+
+    preload()
+
+    # Terminating the server removes its socket
+    signal.signal(signal.SIGTERM, lambda signum, frame : sys.exit(0))
+
+    # Only the user running the server may connect to it
+    umask = os.umask(0o077)
+    try:
+        server = StageServer(path, StageHandler)
+    finally:
+        os.umask(umask)
+
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def serverMain(argv : list[str] | None = None) -> int:
+    """
+    Entry point of the nmrPype-daemon console script
+    """
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog='nmrPype-daemon', description='Serve nmrPype stages from a warm interpreter')
+    parser.add_argument('-socket', metavar='PATH', default=None, dest='socket',
+                        help='Socket path [{} or {}]'.format(SOCKET_ENV, socketPath()))
+    parser.add_argument('-stages', metavar='N', type=int, default=None, dest='stages',
+                        help='Largest number of stages running at once [4 per processor]')
+    args = parser.parse_args(argv)
+
+    serve(args.socket, args.stages)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(serverMain())
@@ -3,7 +3,7 @@ import numpy as np
 import numpy.linalg as la
 import os,sys
 from pathlib import Path
-from ..utils import catchError, DataFrame, FunctionError
+from ..utils import catchError, DataFrame, FunctionError, realType, toWorkType
 from ..nmrio import write_to_file
 
 # type Imports/Definitions
@@ -172,7 +172,7 @@ class Decomposition(Function):
                        ePrint = True)
             return synthetic_data
 
-    def parallelize(self, array : np.ndarray, bases : list[str], verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray,np.ndarray]:
+    def parallelize(self, array : np.ndarray, bases : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray,np.ndarray]:
         """
         The General Multiprocessing implementation for function, utilizing cores and threads. 
         Parallelize should be overloaded if array_shape changes in processing
@@ -183,8 +183,8 @@ class Decomposition(Function):
         array : ndarray
             Target data array to process with function
 
-        bases : list[ndarray]
-            List of basis vectors/matrices
+        bases : ndarray
+            Stacked basis vectors/matrices
         
         verb : tuple[int,int,str], optional
             Tuple containing elements for verbose print, by default (0, 16,'H')
@@ -210,7 +210,7 @@ class Decomposition(Function):
         if self.deco_mask:
             mask = DataFrame(self.deco_mask).getArray()
         else:
-            mask = np.empty(array_shape)
+            mask = np.empty(array_shape, dtype=realType())
 
         mask_chunks = [mask[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
         chunks = [array[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
@@ -250,7 +250,7 @@ class Decomposition(Function):
         return (array, beta)
 
     def decomposition(self, array : np.ndarray, 
-                      bases : list[np.ndarray], verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray, np.ndarray]:
+                      bases : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray, np.ndarray]:
         """
         Use A and b to solve for the x that minimizes Ax-b = 0
 
@@ -260,8 +260,8 @@ class Decomposition(Function):
         ----------
         array : ndarray
             Input array to calculate least squares
-        bases : list[ndarray]
-            List of bases
+        bases : ndarray
+            Stacked bases
 
         verb : tuple[int,int,str], optional
             Tuple containing elements for verbose print, by default (0, 16,'H')
@@ -276,13 +276,13 @@ class Decomposition(Function):
         # Check if applying the mask is necessary
         # if self.deco_mask:
         #     mask = DataFrame(self.deco_mask).getArray()
-        #     beta = _deco(array, np.array(bases), self.SIG_ERROR, True, mask)
+        #     beta = _deco(array, bases, self.SIG_ERROR, True, mask)
         # else:
-        #     beta = _deco(array, np.array(bases), self.SIG_ERROR)
-        # A = np.reshape(np.array(bases), (len(bases), -1,)).T
+        #     beta = _deco(array, bases, self.SIG_ERROR)
+        # A = np.reshape(bases, (len(bases), -1,)).T
         # approx = A @ beta
 
-        A = np.reshape(np.array(bases), (len(bases), -1)).T
+        A = np.reshape(bases, (len(bases), -1)).T
         max_val = max(np.max(np.abs(A.real)), np.max(np.abs(A.imag)))
 
         rcond = self.SIG_ERROR * max_val
@@ -293,19 +293,19 @@ class Decomposition(Function):
         if self.data_mode:
             if self.deco_mask:
                 mask = DataFrame(self.deco_mask).getArray()
-                beta = _deco(array, np.array(bases), rcond, True, mask)
+                beta = _deco(array, bases, rcond, True, mask)
             else:
-                beta = _deco(array, np.array(bases), rcond)
+                beta = _deco(array, bases, rcond)
 
             approx = A @ beta
         else:
             if self.deco_mask:
                 mask = DataFrame(self.deco_mask).getArray()
-                beta_real = _deco(array.real, np.array(bases).real, rcond, True, mask.real)
-                beta_imag = _deco(array.imag, np.array(bases).imag, rcond, True, mask.imag)
+                beta_real = _deco(array.real, bases.real, rcond, True, mask.real)
+                beta_imag = _deco(array.imag, bases.imag, rcond, True, mask.imag)
             else:
-                beta_real = _deco(array.real, np.array(bases).real, rcond)
-                beta_imag = _deco(array.imag, np.array(bases).imag, rcond)
+                beta_real = _deco(array.real, bases.real, rcond)
+                beta_imag = _deco(array.imag, bases.imag, rcond)
 
 
             approx_shape = A.shape[:-1] + beta_real.shape[1:]
@@ -328,7 +328,7 @@ class Decomposition(Function):
         return (array, beta)
     
     def parallelDecomposition(self, array : np.ndarray, bases, mask : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
-        A = np.reshape(np.array(bases), (len(bases), -1)).T
+        A = np.reshape(bases, (len(bases), -1)).T
 
         max_val = max(np.max(np.abs(A.real)), np.max(np.abs(A.imag)))
 
@@ -341,8 +341,8 @@ class Decomposition(Function):
             if self.deco_mask:
                 mask = DataFrame(self.deco_mask).getArray()
             else:
-                mask = np.empty(array.shape)
-            beta = self.deco_iter(array, np.array(bases), rcond, mask, bool(self.deco_mask), verb)
+                mask = np.empty(array.shape, dtype=realType())
+            beta = self.deco_iter(array, bases, rcond, mask, bool(self.deco_mask), verb)
 
             approx = A @ beta
 
@@ -350,11 +350,11 @@ class Decomposition(Function):
             real_args = ()
             imag_args = ()
             if self.deco_mask:
-                real_args = (array.real, np.array(bases).real, rcond, mask.real, bool(self.deco_mask), verb, 'DECO-R')
-                imag_args = (array.imag, np.array(bases).imag, rcond, mask.imag, bool(self.deco_mask), (0,0,'HN'), 'DECO-I')
+                real_args = (array.real, bases.real, rcond, mask.real, bool(self.deco_mask), verb, 'DECO-R')
+                imag_args = (array.imag, bases.imag, rcond, mask.imag, bool(self.deco_mask), (0,0,'HN'), 'DECO-I')
             else:
-                real_args = (array.real, np.array(bases).real, rcond, np.empty(array.shape), False, verb, 'DECO-R')
-                imag_args = (array.imag, np.array(bases).imag, rcond, np.empty(array.shape), False, (0,0,'HN'), 'DECO-I')
+                real_args = (array.real, bases.real, rcond, np.empty(array.shape, dtype=realType()), False, verb, 'DECO-R')
+                imag_args = (array.imag, bases.imag, rcond, np.empty(array.shape, dtype=realType()), False, (0,0,'HN'), 'DECO-I')
             
             with ThreadPoolExecutor() as executor:
                 real_thread = executor.submit(self.deco_iter, *real_args)
@@ -385,7 +385,7 @@ class Decomposition(Function):
 
 
     def asymmetricDecomposition(self, array : np.ndarray,
-                                bases : list[np.ndarray], verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray, np.ndarray]:
+                                bases : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> tuple[np.ndarray, np.ndarray]:
         """
         Perform a Decomposition with mismatch basis and data dimensions
 
@@ -396,8 +396,8 @@ class Decomposition(Function):
         array : ndarray
             Input array to calculate least squares
 
-        bases : list[ndarray]
-            List of basis vectors/matrices
+        bases : ndarray
+            Stacked basis vectors/matrices
         
         verb : tuple[int,int,str], optional
             Tuple containing elements for verbose print, by default (0, 16,'H')
@@ -419,7 +419,7 @@ class Decomposition(Function):
         
         Currently feasible in notebooks
         """
-        A = np.reshape(np.array(bases), (len(bases), -1)).T
+        A = np.reshape(bases, (len(bases), -1)).T
         max_val = max(np.max(np.abs(A.real)), np.max(np.abs(A.imag)))
 
         rcond = self.SIG_ERROR * max_val
@@ -432,22 +432,22 @@ class Decomposition(Function):
             if self.deco_mask:
                 mask = DataFrame(self.deco_mask).getArray()
             else:
-                mask = np.empty(array.shape)
-            beta = self.deco_iter(array, np.array(bases), self.SIG_ERROR, mask, bool(self.deco_mask), verb)
+                mask = np.empty(array.shape, dtype=realType())
+            beta = self.deco_iter(array, bases, self.SIG_ERROR, mask, bool(self.deco_mask), verb)
 
             approx = A @ beta
 
         else:
             if self.deco_mask:
                 mask = DataFrame(self.deco_mask).getArray()
-                beta_real = self.deco_iter(array.real, np.array(bases).real, rcond,
+                beta_real = self.deco_iter(array.real, bases.real, rcond,
                                             mask.real, bool(self.deco_mask), verb, 'DECO-R')
-                beta_imag = self.deco_iter(array.imag, np.array(bases).imag, rcond,
+                beta_imag = self.deco_iter(array.imag, bases.imag, rcond,
                                             mask.imag, bool(self.deco_mask), verb, 'DECO-I')
             else:
-                beta_real = self.deco_iter(array.real, np.array(bases).real, rcond,
+                beta_real = self.deco_iter(array.real, bases.real, rcond,
                                            verb=verb, msg='DECO-R')
-                beta_imag = self.deco_iter(array.imag, np.array(bases).imag, rcond,
+                beta_imag = self.deco_iter(array.imag, bases.imag, rcond,
                                            verb=verb, msg='DECO-I')
 
             approx_real = A.real @ beta_real
@@ -587,14 +587,15 @@ class Decomposition(Function):
     # Helper Functions #
     ####################
 
-    def collect_bases(self) -> tuple[list[np.ndarray], tuple]:
+    def collect_bases(self) -> tuple[np.ndarray, tuple]:
         """Obtain bases from deco basis file list and collect the shape of each basis
 
         Returns
         -------
-        tuple[list[np.ndarray], tuple]
-            bases : list[np.ndarray]
-                List of all basis sets
+        tuple[np.ndarray, tuple]
+            bases : np.ndarray
+                All basis sets stacked along the first axis once,
+                in the processing precision
             basis_shape : tuple
                 Shape of each basis set
         """
@@ -609,7 +610,7 @@ class Decomposition(Function):
 
             bases.append(basis_array)
 
-        return (bases, basis_shape)
+        return (toWorkType(np.stack(bases)), basis_shape)
 
     def deco_iter(self, array : np.ndarray, A : np.ndarray, rcond : float,
                    mask : np.ndarray | None = None, use_mask : bool = False, 
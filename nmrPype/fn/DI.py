@@ -2,12 +2,8 @@ from .function import DataFunction as Function
 import numpy as np
 from sys import stderr
 
-# Multiprocessing
-from multiprocessing import Pool, TimeoutError
-from concurrent.futures import ThreadPoolExecutor
-
 # type Imports/Definitions
-from ..utils import DataFrame
+from ..utils import DataFrame, catchError, FunctionError
 
 class DeleteImaginary(Function):
     """
@@ -15,6 +11,10 @@ class DeleteImaginary(Function):
 
     Parameters
     ----------
+    di_view : bool
+        Return the real part as a strided view of the complex data
+        instead of a contiguous copy
+
     mp_enable : bool
         Enable multiprocessing
 
@@ -24,11 +24,12 @@ class DeleteImaginary(Function):
     mp_threads : int
         Number of threads to utilize per process
     """
-    def __init__(self, mp_enable = False, mp_proc = 0, mp_threads = 0):
+    def __init__(self, di_view : bool = False, mp_enable = False, mp_proc = 0, mp_threads = 0):
+        self.di_view = di_view
         self.mp = [mp_enable, mp_proc, mp_threads]
         self.name = "DI"
         
-        params = {}
+        params = {'di_view':di_view}
         super().__init__(params)
 
     ############
@@ -45,11 +46,20 @@ class DeleteImaginary(Function):
         if quadFlag:
             self.updateHeader(data)
             return 0
-        # See function.py
-        exitCode = super().run(data)
-        if exitCode:
-            return exitCode
-        data.array = data.array.real
+        # Deleting the imaginary data is a single pass over the array,
+        # so it is always processed without multiprocessing
+        try:
+            self.initialize(data)
+
+            array = self.inputArray(data)
+            data.array = self.process(array, (data.verb, data.inc, data.getParam('NDLABEL')))
+            self.releaseInput(data, array)
+
+            self.updateHeader(data)
+
+        except Exception as e:
+            msg = "Unable to run function {0}!".format(type(self).__name__)
+            catchError(e, new_e=FunctionError, msg=msg)
 
         """
         # depreciated code for halfing all the indirect dimensions
@@ -88,29 +98,41 @@ class DeleteImaginary(Function):
         """
         See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
         """
-        dataLength = array.shape[-1]
-
-        # Operation strips imaginary component of array
-        operation = lambda a : a.real
-
-        # Check for parallelization
-        if self.mp[0]:
-            with ThreadPoolExecutor(max_workers=self.mp[2]) as executor:
-                processed_chunk = list(executor.map(operation, array))
-                array = np.array(processed_chunk)
+        # Take the real part directly, a view keeps the stride of the complex array
+        if self.di_view:
+            array = array.real
         else:
-            it = np.nditer(array, flags=['external_loop','buffered'], op_flags=['readwrite'], buffersize=dataLength, order='C')
-            iter_index = 0
-            with it:
-                for x in it:
-                    if verb[0]:
-                        iter_index += 1
-                        Function.verbPrint('DI', iter_index, it.itersize, array.shape[-1], verb[1:], True)
-                    x[...] = operation(x)
-                if verb[0]:
-                    print("", file=stderr)
+            real = array.real
+            array = self.empty(real.shape, real.dtype)
+            np.copyto(array, real)
+
+        if verb[0]:
+            traces = int(array.size / array.shape[-1])
+            Function.verbPrint('DI', traces, traces, 1, verb[1:], True)
+            print("", file=stderr)
 
         return array
+    
+    ##################
+    # Static Methods #
+    ##################
+        
+    @staticmethod
+    def clArgs(subparser, parent_parser):
+        """
+        Delete Imaginary command-line arguments
+
+        Adds Delete Imaginary parser to the subparser, with its corresponding default args
+        Called by :py:func:`nmrPype.parse.parser`.
+
+        Parameters
+        ----------
+        subparser : _SubParsersAction[ArgumentParser]
+            Subparser object that will receive function and its arguments
+        """
+        DI = subparser.add_parser('DI', parents=[parent_parser], help='Delete imaginary data')
+        DI.add_argument('-view', action='store_true',
+                        dest='di_view', help='Keep the real data as a view of the complex data')
         
     ####################
     #  Proc Functions  #
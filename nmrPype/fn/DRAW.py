@@ -1,7 +1,10 @@
 from .function import DataFunction as Function
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import sys
+import pickle
+import subprocess
+from multiprocessing import Pool
 from typing import TypeAlias
 
 # type Imports/Definitions
@@ -10,10 +13,40 @@ from ..utils import DataFrame
 
 ColorMap : TypeAlias = LinearSegmentedColormap | str
 
+# Figure layout, each slice is drawn as a real and an imaginary panel in a row of the figure
+FIG_WIDTH = 20
+ROW_HEIGHT = 9
+DPI = 100
+
+# Largest number of pixels a panel spans along x and y, data is decimated down to this resolution
+PANEL_PIXELS = (FIG_WIDTH * DPI // 2, ROW_HEIGHT * DPI)
+
+# Background renderer, reads the whole drawing before the slower matplotlib imports,
+# and removes its log file given as argument if rendering succeeded without messages
+RENDER_SCRIPT = """
+import io, os, sys
+drawing = io.BytesIO(sys.stdin.buffer.read())
+from nmrPype.fn.DRAW import Draw
+code = Draw.renderStream(drawing)
+sys.stderr.flush()
+if not code and not os.path.getsize(sys.argv[1]):
+    os.remove(sys.argv[1])
+sys.exit(code)
+"""
+
 class Draw(Function):
     """
     Data Function object for drawing the current state of the data to a file
 
+    The slices to draw are copied from the data and rendered by a background
+    process using the non-interactive Agg backend, so the function returns
+    without waiting for the drawing to complete unless draw_wait is set.
+    Errors of the background process are written to a log file named after
+    the output file (e.g. spec.log), kept only if rendering fails or warns.
+    Slices larger than the output resolution are decimated while preserving
+    their peaks unless draw_exact is set. Split drawings save each slice to
+    its own file, rendered concurrently by draw_workers processes.
+
     Parameters
     ----------
     draw_file : str
@@ -28,6 +61,19 @@ class Draw(Function):
     draw_slice : int
         Number of 1D/2D slices to draw out of the total vectors/planes
 
+    draw_wait : bool
+        Draw in the current process and wait for the drawing to be saved
+
+    draw_exact : bool
+        Draw every point instead of decimating data to the output resolution
+
+    draw_split : bool
+        Draw each slice to its own file named after the output file and the slice number
+        (e.g. spec_001.png, spec_002.png)
+
+    draw_workers : int
+        Number of processes rendering split drawings, more than one implies draw_split
+
     mp_enable : bool
         Enable multiprocessing
 
@@ -39,6 +85,8 @@ class Draw(Function):
     """
     def __init__(self, draw_file : str = "", draw_fmt : str = "",
                  draw_plot : str = "line", draw_slice : int = 5,
+                 draw_wait : bool = False, draw_exact : bool = False,
+                 draw_split : bool = False, draw_workers : int = 1,
                  mp_enable : bool = False, mp_proc : int = 0,
                  mp_threads : int = 0):
         
@@ -52,11 +100,17 @@ class Draw(Function):
         self.fmt = draw_fmt
         self.plot = draw_plot
         self.slice = draw_slice
+        self.wait = draw_wait
+        self.exact = draw_exact
+        self.workers = max(1, draw_workers)
+        self.split = draw_split or self.workers > 1
         self.mp = [mp_enable, mp_proc, mp_threads]
         self.name = "DRAW"
         
         params = { 'draw_file':draw_file, 'draw_fmt':draw_fmt,
-                  'draw_plot':draw_plot, 'draw_slice':draw_slice}
+                  'draw_plot':draw_plot, 'draw_slice':draw_slice,
+                  'draw_wait':draw_wait, 'draw_exact':draw_exact,
+                  'draw_split':draw_split, 'draw_workers':draw_workers}
         super().__init__(params)
 
     ############
@@ -76,19 +130,23 @@ class Draw(Function):
             else:
                 self.fmt = self.file.split('.')[-1]
 
-        if self.plot.lower() == 'line':
-            return self.graphLine(data)
-        if self.plot.lower() == 'contour' and data.array.ndim > 1:
-            return self.graphContour(data)
-        if data.array.ndim == 1:
-            return self.graphLine(data)
-        
-        return self.graphContour(data)
+        # Fail here rather than in the background renderer, where errors cannot reach the pipeline
+        self.checkOutput()
+
+        if self.plot.lower() == 'line' or data.array.ndim == 1:
+            drawing = self.graphLine(data)
+        else:
+            drawing = self.graphContour(data)
+
+        # Split drawings are rendered slice by slice across the workers
+        drawing['workers'] = self.workers if self.split else 0
 
+        return self.draw(drawing)
 
-    def graphLine(self, data : DataFrame, **kwargs) -> int:
+
+    def graphLine(self, data : DataFrame, **kwargs) -> dict:
         """
-        Graph a certain amount of lines based on the user parameters and data
+        Select a certain amount of lines to graph based on the user parameters and data
 
         Parameters
         ----------
@@ -100,8 +158,8 @@ class Draw(Function):
 
         Returns
         -------
-        int
-            Integer exit code (e.g. 0 success 1 fail)
+        dict
+            Drawing to render with :py:func:`render`
         """
         shape = data.array.shape
 
@@ -109,20 +167,41 @@ class Draw(Function):
         title, slice_num, slices = self.graphLineSyntax(data.array.ndim, shape)
 
         # Set the limit to be whichever value is smallest
-        limit = min(slice_num, self.slice)
+        limit = min(slice_num, self.slice) if self.slice else slice_num
 
-        # Generate figure and axes based on amount of slices
-        fig, axs = plt.subplots(limit, 2, squeeze=False, figsize=(20,9*limit))
+        # Avoid division by 0 through assertion
+        assert slices != 0
+
+        # Copy the vectors to draw at the output resolution,
+        # titles follow the vector's position in planes and cubes
+        vectors = data.array.reshape(-1, shape[-1])[:limit]
+        bins = 0 if self.exact else PANEL_PIXELS[0]
+        lines = []
+        titles = []
+        for graph_num in range(1, len(vectors) + 1):
+            vector = vectors[graph_num-1]
+            x, real = Draw.decimateLine(vector.real, bins)
+            x, imag = Draw.decimateLine(vector.imag, bins)
+            lines.append((x, real, imag))
+
+            # Make sure index 0 is the amount of 1D slices per plane
+            x = slices if (graph_num % slices == 0) else graph_num % slices
+
+            # Number of planes and cubes essentially in base(slices)
+            y = int(np.floor(graph_num / slices) + 1)
+            z = int(np.floor(graph_num / slices**2) + 1)
+            titles.append(title(x, y, z, graph_num))
 
         # Create xlabel with NDLABEL and the direct dimension's index
         xLabel = "{} pts {}".format(data.getParam('NDLABEL'), chr(87+data.getDimOrder(1)))
 
-        return self.drawLineToFile(data.array, title, fig, axs, limit, slices, xLabel, **kwargs)
+        return {'plot' : 'line', 'file' : self.outputFile(), 'fmt' : self.fmt,
+                'slices' : lines, 'titles' : titles, 'xLabel' : xLabel, 'kwargs' : kwargs}
 
 
-    def graphContour(self, data : DataFrame, cmap : ColorMap ="", **kwargs) -> int:
+    def graphContour(self, data : DataFrame, cmap : ColorMap ="", **kwargs) -> dict:
         """
-        Graph a certain amount of contour planes based on the user parameters and data
+        Select a certain amount of contour planes to graph based on the user parameters and data
 
         Parameters
         ----------
@@ -137,8 +216,8 @@ class Draw(Function):
 
         Returns
         -------
-        int
-            Integer exit code (e.g. 0 success 1 fail)
+        dict
+            Drawing to render with :py:func:`render`
         """
         shape = data.array.shape
 
@@ -146,10 +225,30 @@ class Draw(Function):
         title, slice_num, slices = self.graphContourSyntax(data.array.ndim, shape)
 
         # Set the limit to be whichever value is the smallest
-        limit = min(slice_num, self.slice)
+        limit = min(slice_num, self.slice) if self.slice else slice_num
 
-        # Generate figure and axes based on amount of slices
-        fig, axs = plt.subplots(limit, 2, squeeze=False, figsize=(20,9*limit))
+        # Avoid division by 0 through assertion
+        assert slices != 0
+
+        # Copy the planes to draw at the output resolution, with the color limits of the full planes
+        planes = data.array.reshape((-1,) + shape[-2:])[:limit]
+        pixels = (0, 0) if self.exact else PANEL_PIXELS[::-1]
+        meshes = []
+        titles = []
+        for graph_num in range(1, len(planes) + 1):
+            plane = planes[graph_num-1]
+            vmin = min(np.min(plane.real), np.min(plane.imag))
+            vmax = max(np.max(plane.real), np.max(plane.imag))
+            yEdges, xEdges, real = Draw.decimatePlane(plane.real, pixels)
+            yEdges, xEdges, imag = Draw.decimatePlane(plane.imag, pixels)
+            meshes.append((xEdges, yEdges, real, imag, vmin, vmax))
+
+            # Make sure index 0 is the amount of 1D slices per plane
+            x = slices if (graph_num % slices == 0) else graph_num % slices
+            
+            # Number of planes and cubes essentially in base(slices)
+            y = int(np.floor(graph_num / slices) + 1)
+            titles.append(title(x, y, graph_num))
 
         # Create xLabel with NDLABEL and the direct dimension's index
         xLabel = "{} pts {}".format(data.getParam('NDLABEL'), chr(87+data.getDimOrder(1)))
@@ -157,208 +256,250 @@ class Draw(Function):
         # Create yLabel with NDLABEL and the first indirect dimension's index
         yLabel = "{} pts {}".format(data.getParam('NDLABEL', data.getDimOrder(2)), chr(87+data.getDimOrder(2)))
 
-        # Configure color map
-        cmap = cmap if cmap != "" else plt.get_cmap('RdBu')
-        cmap = plt.get_cmap(cmap) if type(cmap) == str else cmap
- 
-        return self.drawContourToFile(data.array, cmap, title, fig, axs, limit, slices, xLabel, yLabel, **kwargs)
+        return {'plot' : 'contour', 'file' : self.outputFile(), 'fmt' : self.fmt,
+                'slices' : meshes, 'titles' : titles, 'xLabel' : xLabel, 'yLabel' : yLabel,
+                'cmap' : cmap if cmap != "" else 'RdBu', 'kwargs' : kwargs}
 
 
-    ####################
-    # Helper Functions #
-    ####################
-    
-    def drawLineToFile(self, array : np.ndarray, title,
-                       fig, axs, limit : int, slices : int, xLabel : str, **kwargs) -> int:
+    def checkOutput(self):
+        """
+        Check that the drawing can be saved in its format and directory before rendering
         """
-        Takes parameters processed in graphLine and plots using matplotlib
+        from matplotlib.backend_bases import FigureCanvasBase
 
-        Parameters
-        ----------
-        array : np.ndarray
-            ndarray to plot
+        formats = FigureCanvasBase.get_supported_filetypes()
+        if self.fmt.lower() not in formats:
+            raise ValueError("Format '{0}' is not supported (supported formats: {1})".format(
+                self.fmt, ", ".join(sorted(formats))))
+        if not os.access(self.dir, os.W_OK):
+            raise PermissionError("Unable to write drawings to {0}".format(self.dir))
 
-        title : function
-            Title lambda function for outputting the title (see graphLineSyntax)
 
-        fig : pyplot.Figure
-            Figure used to plot 
+    def outputFile(self) -> str:
+        """
+        Absolute path of the drawing to save
+        """
+        outfile = os.path.join(self.dir, "{0}.{1}".format(self.file.split('.')[0], self.fmt))
+        return os.path.abspath(outfile)
 
-        axs : np.ndarray[pyplot.Axes]
-            ndarray of axes objects to plot 1D vectors onto
 
-        limit : int
-            Maximum number of plots to output
+    def logFile(self) -> str:
+        """
+        Absolute path of the file receiving errors of the background renderer
+        """
+        logfile = os.path.join(self.dir, "{0}.log".format(self.file.split('.')[0]))
+        return os.path.abspath(logfile)
 
-        slices : int
-            Number of 1D vectors in a plane
 
-        xLabel : str
-            x-axis label (eg. H1 pts X)
+    def draw(self, drawing : dict) -> int:
+        """
+        Render a drawing in the current process if waiting for it,
+        otherwise hand it to a detached background process
 
-        **kwargs
-            Plotting arguments, *** CURRENTLY UNUSED ***
+        Parameters
+        ----------
+        drawing : dict
+            Drawing obtained from :py:func:`graphLine` or :py:func:`graphContour`
 
         Returns
         -------
         int
             Integer exit code (e.g. 0 success 1 fail)
         """
-        # Avoid division by 0 through assertion
-        assert slices != 0
+        if self.wait:
+            return Draw.render(drawing)
+
+        # The renderer must not hold the pipeline's output or error pipes open
+        # or take its signals, its errors are written to a log next to the drawing
+        env = dict(os.environ, MPLBACKEND='Agg')
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+        logfile = self.logFile()
+        with open(logfile, 'wb') as log:
+            renderer = subprocess.Popen([sys.executable, '-c', RENDER_SCRIPT, logfile],
+                                        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=log, env=env, start_new_session=True)
+        with renderer.stdin:
+            pickle.dump(drawing, renderer.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+        return 0
 
-        # Datalength for buffer is based on number of points in vector
-        dataLength = array.shape[-1]
 
-        
-        gridspec = axs[0, 0].get_subplotspec().get_gridspec()
+    ####################
+    # Helper Functions #
+    ####################
 
-        for ax in axs.flat:
-            ax.remove()
+    @staticmethod
+    def render(drawing : dict) -> int:
+        """
+        Render a drawing to its output file
 
-        # Iterate over each vector and plot with proper formatting
-        with np.nditer(array, flags=['external_loop','buffered'], op_flags=['readonly'], buffersize=dataLength, order='C') as it:
-            graph_num = 1
-            
-            for vector in it:
-                subfig = fig.add_subfigure(gridspec[graph_num-1, :])
-                ax = subfig.subplots(1,2, squeeze=False)
-
-                # Make sure index 0 is the amount of 1D slices per plane
-                x = slices if (graph_num % slices == 0) else graph_num % slices
-                
-                # Number of planes and cubes essentially in base(slices)
-                y = int(np.floor(graph_num / slices) + 1)
-                z = int(np.floor(graph_num / slices**2) + 1)
-
-                # Generate title
-                subfig.suptitle(title(x,y,z, graph_num), fontsize='xx-large')
-
-                # Plot real and imaginary axes and label
-                #subfig.colorbar(pc, shrink=0.6, ax=axsLeft, location='bottom')
-                ax[0,0].plot(vector.real, 'r', **kwargs)
-                ax[0,0].set_title("Real", fontsize='x-large')
-                ax[0,0].set_xlabel(xLabel, fontsize='x-large')
-                
-                ax[0,1].plot(vector.imag, 'b', **kwargs)
-                ax[0,1].set_title("Imaginary", fontsize='x-large')
-                ax[0,1].set_xlabel(xLabel, fontsize='x-large')
-                
-                graph_num += 1
-                # Ensure limit has not been reached
-                if limit:
-                    if graph_num > limit:
-                        break       
-
-        # Generate out file for saving
-        outfile = os.path.join(self.dir, "{0}.{1}".format(self.file.split('.')[0], self.fmt))
-        fpath = os.path.abspath(outfile)
-        fig.savefig(fpath, format=self.fmt)
+        Parameters
+        ----------
+        drawing : dict
+            Drawing obtained from :py:func:`graphLine` or :py:func:`graphContour`
 
+        Returns
+        -------
+        int
+            Integer exit code (e.g. 0 success 1 fail)
+        """
+        if drawing.get('workers'):
+            drawings = Draw.splitDrawing(drawing)
+            workers = min(drawing['workers'], len(drawings))
+            if workers <= 1:
+                return max((Draw.render(part) for part in drawings), default=0)
+            with Pool(processes=workers) as pool:
+                return max(pool.imap_unordered(Draw.render, drawings, chunksize=1), default=0)
+
+        # Figures are created without pyplot, so no interactive backend is ever loaded
+        from matplotlib.figure import Figure
+
+        limit = len(drawing['slices'])
+        fig = Figure(figsize=(FIG_WIDTH, ROW_HEIGHT*limit), dpi=DPI)
+        axs = fig.subplots(limit, 2, squeeze=False)
+
+        if drawing['plot'] == 'line':
+            Draw.drawLineToFile(drawing, fig, axs)
+        else:
+            Draw.drawContourToFile(drawing, fig, axs)
+        return 0
 
-    def drawContourToFile(self, array : np.ndarray, cmap : ColorMap, title,
-                       fig : plt.Figure, axs : plt.Axes, limit : int, 
-                       slices : int, xLabel : str, yLabel : str, **kwargs) -> int:
+    @staticmethod
+    def splitDrawing(drawing : dict) -> list[dict]:
         """
-        Takes parameters processed in graphContour and plots using matplotlib
+        Split a drawing into one drawing per slice, each saved to the output file
+        name followed by the 1-based slice number (e.g. spec.png to spec_001.png)
 
         Parameters
         ----------
-        array : np.ndarray
-            ndarray to plot
+        drawing : dict
+            Drawing obtained from :py:func:`graphLine` or :py:func:`graphContour`
 
-        cmap : ColorMap [LinearSegmentedColorMap or str]
-            Designated color map for contour plot 
+        Returns
+        -------
+        list[dict]
+            Drawings of a single slice each
+        """
+        stem, ext = os.path.splitext(drawing['file'])
+        return [dict(drawing, file="{}_{:03d}{}".format(stem, num, ext), slices=[part],
+                     titles=[title], workers=0)
+                for num, (part, title) in enumerate(zip(drawing['slices'], drawing['titles']), start=1)]
 
-        title : function
-            Title lambda function for outputting the title (see graphContourSyntax)
+    @staticmethod
+    def renderStream(stream = None) -> int:
+        """
+        Render a pickled drawing read from a stream, standard input by default.
+        Entry point of the background renderer.
+        """
+        stream = stream if stream is not None else sys.stdin.buffer
+        return Draw.render(pickle.load(stream))
+
+    @staticmethod
+    def drawLineToFile(drawing : dict, fig, axs) -> int:
+        """
+        Plots the vectors of a drawing made by graphLine using matplotlib
 
-        fig : pyplot.Figure
+        Parameters
+        ----------
+        drawing : dict
+            Drawing obtained from :py:func:`graphLine`
+
+        fig : matplotlib.figure.Figure
             Figure used to plot 
 
-        axs : np.ndarray[pyplot.Axes]
+        axs : np.ndarray[matplotlib.axes.Axes]
             ndarray of axes objects to plot 1D vectors onto
 
-        limit : int
-            Maximum number of plots to output
+        Returns
+        -------
+        int
+            Integer exit code (e.g. 0 success 1 fail)
+        """
+        xLabel = drawing['xLabel']
+        kwargs = drawing['kwargs']
 
-        slices : int
-            Number of 1D vectors in a plane
+        gridspec = axs[0, 0].get_subplotspec().get_gridspec()
 
-        xLabel : str
-            x-axis label (eg. H1 pts X)
+        for ax in axs.flat:
+            ax.remove()
 
-        yLabel : str
-            y-axis label (eg. N pts Y)
+        # Plot each vector with proper formatting
+        for graph_num, ((x, real, imag), title) in enumerate(zip(drawing['slices'], drawing['titles']), start=1):
+            subfig = fig.add_subfigure(gridspec[graph_num-1, :])
+            ax = subfig.subplots(1,2, squeeze=False)
 
-        **kwargs
-            Plotting arguments, *** CURRENTLY UNUSED ***
+            # Generate title
+            subfig.suptitle(title, fontsize='xx-large')
+
+            # Plot real and imaginary axes and label
+            ax[0,0].plot(x, real, 'r', **kwargs)
+            ax[0,0].set_title("Real", fontsize='x-large')
+            ax[0,0].set_xlabel(xLabel, fontsize='x-large')
+            
+            ax[0,1].plot(x, imag, 'b', **kwargs)
+            ax[0,1].set_title("Imaginary", fontsize='x-large')
+            ax[0,1].set_xlabel(xLabel, fontsize='x-large')
+
+        fig.savefig(drawing['file'], format=drawing['fmt'])
+        return 0
+
+
+    @staticmethod
+    def drawContourToFile(drawing : dict, fig, axs) -> int:
+        """
+        Plots the planes of a drawing made by graphContour using matplotlib
+
+        Parameters
+        ----------
+        drawing : dict
+            Drawing obtained from :py:func:`graphContour`
+
+        fig : matplotlib.figure.Figure
+            Figure used to plot 
+
+        axs : np.ndarray[matplotlib.axes.Axes]
+            ndarray of axes objects to plot 2D planes onto
 
         Returns
         -------
         int
             Integer exit code (e.g. 0 success 1 fail)
         """
-        # Avoid division by 0 through assertion
-        assert slices != 0
+        from matplotlib import colormaps
+
+        xLabel, yLabel = drawing['xLabel'], drawing['yLabel']
+        kwargs = drawing['kwargs']
+
+        # Configure color map
+        cmap = drawing['cmap']
+        cmap = colormaps[cmap] if type(cmap) == str else cmap
 
         gridspec = axs[0, 0].get_subplotspec().get_gridspec()
 
         for ax in axs.flat:
             ax.remove()
 
-        # Iterate over each vector and plot with proper formatting
-        it = np.nditer(array, flags=['multi_index'], order='C')
-        with it:
-            graph_num = 1
-            while not it.finished:
-                indices = it.multi_index
-                slice_indices = tuple(indices[:-2])
-                # Obtain 2D slice from current axes
-                slice_2d = it.operands[0][slice_indices]
+        # Plot each plane with proper formatting
+        for graph_num, (mesh, title) in enumerate(zip(drawing['slices'], drawing['titles']), start=1):
+            subfig = fig.add_subfigure(gridspec[graph_num-1, :])
+            ax = subfig.subplots(1,2, squeeze=False)
+
+            # Generate title
+            subfig.suptitle(title, fontsize='xx-large')
             
-                subfig = fig.add_subfigure(gridspec[graph_num-1, :])
-                ax = subfig.subplots(1,2, squeeze=False)
-
-                # Make sure index 0 is the amount of 1D slices per plane
-                x = slices if (graph_num % slices == 0) else graph_num % slices
-                
-                # Number of planes and cubes essentially in base(slices)
-                y = int(np.floor(graph_num / slices) + 1)
-
-                # Generate title
-                subfig.suptitle(title(x,y, graph_num), fontsize='xx-large')
-                
-                # Find min and max
-                vmin = min(np.min(slice_2d.real), np.min(slice_2d.imag))
-                vmax = max(np.max(slice_2d.real), np.max(slice_2d.imag))
-                
-                # Plot real and imaginary axes and label
-                plots = (slice_2d.real, slice_2d.imag)
-                plot_type = ('Real', 'Imaginary')
-                for i in range(len(plots)):
-                    ax[0,i].pcolormesh(plots[i], cmap=cmap, vmin=vmin, vmax=vmax, **kwargs)
-                    ax[0,i].set_title(plot_type[i], fontsize='x-large')
-                    ax[0,i].set_xlabel(xLabel, fontsize='x-large')
-                    ax[0,i].set_ylabel(yLabel, fontsize='x-large')
-
-                
-                # Skip over duplicate iterations by moving to the next non 2-D array
-                bound2D = tuple(x - 1 for x in it.shape[-2:])
-                it.multi_index = indices[:-2] + bound2D
-                
-                graph_num += 1
-                it.iternext()
-
-                # Ensure limit has not been reached
-                if limit:
-                    if graph_num > limit:
-                        break    
-
-        # Generate out file for saving
-        outfile = os.path.join(self.dir, "{0}.{1}".format(self.file.split('.')[0], self.fmt))
-        fpath = os.path.abspath(outfile)
-        fig.savefig(fpath, format=self.fmt)
+            xEdges, yEdges, real, imag, vmin, vmax = mesh
+            
+            # Plot real and imaginary axes and label
+            plots = (real, imag)
+            plot_type = ('Real', 'Imaginary')
+            for i in range(len(plots)):
+                ax[0,i].pcolormesh(xEdges, yEdges, plots[i], cmap=cmap, vmin=vmin, vmax=vmax, **kwargs)
+                ax[0,i].set_title(plot_type[i], fontsize='x-large')
+                ax[0,i].set_xlabel(xLabel, fontsize='x-large')
+                ax[0,i].set_ylabel(yLabel, fontsize='x-large')
+
+        fig.savefig(drawing['file'], format=drawing['fmt'])
+        return 0
 
 
     def graphLineSyntax(self, ndim : int, shape : tuple[int, ...]):
@@ -474,6 +615,14 @@ class Draw(Function):
                           dest='draw_plot', help='Plotting method (line or contour)')
         DRAW.add_argument('-slice', type=int, metavar='SLICECOUNT', default=5,
                           dest='draw_slice', help='Number of data 1D/2D slices to draw from full set')
+        DRAW.add_argument('-wait', action='store_true',
+                          dest='draw_wait', help='Wait for the drawing to be saved instead of drawing in the background')
+        DRAW.add_argument('-exact', action='store_true',
+                          dest='draw_exact', help='Draw every point instead of decimating to the output resolution')
+        DRAW.add_argument('-split', action='store_true',
+                          dest='draw_split', help='Draw each slice to its own file, NAME_001.FMT, NAME_002.FMT, ...')
+        DRAW.add_argument('-workers', type=int, metavar='N', default=1,
+                          dest='draw_workers', help='Number of processes drawing split files (implies -split when above 1)')
         
         # Include universal commands proceeding function call
         # Function.clArgsTail(DRAW)
@@ -481,4 +630,86 @@ class Draw(Function):
 
     ####################
     #  Proc Functions  #
-    ####################
\ No newline at end of file
+    ####################
+
+    @staticmethod
+    def binEdges(size : int, bins : int) -> np.ndarray:
+        """
+        Start indices of at most bins nearly equal bins covering size points,
+        followed by size
+        """
+        return np.unique(np.linspace(0, size, bins + 1).astype(int))
+
+    @staticmethod
+    def decimateLine(vector : np.ndarray, bins : int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Reduce a real vector to the minimum and maximum of each of at most bins bins,
+        so the plotted line keeps every peak at the output resolution
+
+        Parameters
+        ----------
+        vector : ndarray
+            Real vector to decimate
+
+        bins : int
+            Number of bins, the vector is returned whole if 0 or if the vector is small enough
+
+        Returns
+        -------
+        x : ndarray
+            Point index of each value
+        y : ndarray
+            Values to plot
+        """
+        size = vector.shape[-1]
+        if not bins or size <= 2 * bins:
+            return np.arange(size), np.array(vector)
+
+        edges = Draw.binEdges(size, bins)
+        starts = edges[:-1]
+        y = np.empty(2 * len(starts), dtype=vector.dtype)
+        y[0::2] = np.minimum.reduceat(vector, starts)
+        y[1::2] = np.maximum.reduceat(vector, starts)
+
+        # Draw each bin as a vertical segment at its center
+        x = np.repeat((starts + edges[1:] - 1) / 2, 2)
+        return x, y
+
+    @staticmethod
+    def decimatePlane(plane : np.ndarray, pixels : tuple[int, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reduce a real plane to blocks of at most pixels rows and columns, keeping the value
+        of largest magnitude in each block so positive and negative peaks are preserved
+
+        Parameters
+        ----------
+        plane : ndarray
+            Real plane to decimate
+
+        pixels : tuple[int, int]
+            Number of rows and columns, an axis is kept whole if 0 or if it is small enough
+
+        Returns
+        -------
+        yEdges : ndarray
+            Row edges of the blocks in points
+        xEdges : ndarray
+            Column edges of the blocks in points
+        plane : ndarray
+            Decimated plane
+        """
+        high = low = plane
+        edges = []
+        for axis, bins in enumerate(pixels):
+            size = plane.shape[axis]
+            if not bins or size <= bins:
+                edges.append(np.arange(size + 1))
+                continue
+            axisEdges = Draw.binEdges(size, bins)
+            high = np.maximum.reduceat(high, axisEdges[:-1], axis=axis)
+            low = np.minimum.reduceat(low, axisEdges[:-1], axis=axis)
+            edges.append(axisEdges)
+
+        plane = np.where(np.abs(low) > np.abs(high), low, high) if high is not low else np.array(plane)
+        return edges[0], edges[1], plane
+
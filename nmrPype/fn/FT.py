@@ -1,10 +1,8 @@
 from .function import DataFunction as Function
 import numpy as np
 from scipy import fft
+from functools import lru_cache
 from sys import stderr
-# Multiprocessing
-from multiprocessing import Pool, TimeoutError
-from concurrent.futures import ThreadPoolExecutor
 
 # type Imports/Definitions
 from ..utils import DataFrame
@@ -27,8 +25,9 @@ class FourierTransform(Function):
     ft_alt : bool
         Alternate the signs of even and odd data points
     
-    mp_enable : bool
-        Enable multiprocessing
+    mp_enable : bool | str
+        Enable multiprocessing, 'threads' runs tasks on worker threads
+        instead of processes
 
     mp_proc : int
         Number of processors to utilize for multiprocessing
@@ -36,6 +35,9 @@ class FourierTransform(Function):
     mp_threads : int
         Number of threads to utilize per process
     """
+    inPlace = True
+    threaded = True
+
     def __init__(self, ft_inv: bool = False, ft_real: bool = False, ft_neg: bool = False, ft_alt: bool = False, 
                  mp_enable : bool = False, mp_proc : int = 0, mp_threads : int = 0):
             self.ft_inv = ft_inv 
@@ -59,14 +61,18 @@ class FourierTransform(Function):
         """
 
         self.initialize(data)
+
+        array = self.inputArray(data)
         
-        ndQuad = 1 if not np.all(data.array.imag) else 2
+        ndQuad = 1 if not np.all(array.imag) else 2
 
         # Perform fft without multiprocessing
-        if not self.mp[0] or data.array.ndim == 1:
-            data.array = self.process(data.array, ndQuad, (data.verb, data.inc, data.getParam('NDLABEL')))
+        if not self.mp[0] or array.ndim == 1:
+            data.array = self.process(array, ndQuad, (data.verb, data.inc, data.getParam('NDLABEL')))
         else:
-            data.array = self.parallelize(data.array, ndQuad, (data.verb, data.inc, data.getParam('NDLABEL')))
+            data.array = self.parallelize(array, ndQuad, (data.verb, data.inc, data.getParam('NDLABEL')))
+
+        self.releaseInput(data, array)
 
         # Update header once processing is complete
         self.updateHeader(data)
@@ -95,38 +101,12 @@ class FourierTransform(Function):
         new_array : ndarray
             Updated array after function operation
         """
-        # Save array shape for reshaping later
-        array_shape = array.shape
-
-        # Split array into manageable chunks
-        chunk_size = int(array_shape[0] / self.mp[1])
-        
-        # Assure chunk_size is nonzero
-        chunk_size = array_shape[0] if chunk_size == 0 else chunk_size
-        
-        chunks = [array[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
-        
-        chunk_num = len(chunks)
-        # Process each chunk in processing pool
-        args = []
-        for i in range(chunk_num):
-            if i == 0:
-                args.append((chunks[i], ndQuad, verb))
-            else:
-                args.append((chunks[i], ndQuad))
-
-        if verb[0]:
-            Function.mpPrint("FT", chunk_num, (len(chunks[0]), len(chunks[-1])), 'start')
-
-        with Pool(processes=self.mp[1]) as pool:
-            output = pool.starmap(self.process, args, chunksize=chunk_size)
+        vectors, tasks = self.schedule(array)
 
-        if verb[0]:
-            Function.mpPrint("FT", chunk_num, (len(chunks[0]), len(chunks[-1])), 'end')
+        new_array = self.mapTasks(self.process, vectors, tasks, (ndQuad,), verb)
 
         # Recombine and reshape data
-        new_array = np.concatenate(output).reshape(array_shape, order='C')
-        return new_array
+        return new_array.reshape(array.shape[:-1] + new_array.shape[-1:])
 
     def vectorFFT(self, array : np.ndarray) -> np.ndarray:
         """
@@ -143,10 +123,7 @@ class FourierTransform(Function):
             Processed vector
         """
         array = fft.fft(array)
-        array = fft.fftshift(array)
-        array = np.flip(array)
-        array = np.roll(array, 1)
-        return(array)
+        return(array[FourierTransform.nmrOrder(array.shape[-1])])
         
     def vectorIFFT(self, array : np.ndarray) -> np.ndarray:
         """
@@ -163,10 +140,38 @@ class FourierTransform(Function):
             Processed vector
         """
         array = fft.ifft(array)
-        array = fft.ifftshift(array)
-        array = np.flip(array)
-        array = np.roll(array, 1)
-        return(array)
+        return(array[FourierTransform.nmrOrder(array.shape[-1], True)])
+
+    def blockFFT(self, array : np.ndarray, size : int | None = None,
+                 workers : int = 1, out : np.ndarray | None = None) -> np.ndarray:
+        """
+        Perform the fourier transform on every vector of a block at once,
+        transform result to match nmrPipe
+
+        Parameters
+        ----------
+        array : ndarray
+            Target block of vectors, transformed along the last axis
+
+        size : int, optional
+            Length of the transform, vectors are zero padded or truncated
+            to size points before the transform, by default the vector length
+
+        workers : int
+            Number of threads used by the transform
+
+        out : ndarray, optional
+            Array receiving the processed vectors, allocated if not provided
+
+        Returns
+        -------
+        ndarray
+            Processed vectors
+        """
+        operation = fft.fft if not self.ft_inv else fft.ifft
+        array = operation(array, n=size, axis=-1, workers=workers)
+        order = FourierTransform.nmrOrder(array.shape[-1], self.ft_inv)
+        return np.take(array, order, axis=-1, out=out)
 
 
     ######################
@@ -180,16 +185,15 @@ class FourierTransform(Function):
         # Change operation based on parameters
         if (self.ft_alt and not self.ft_inv):
             # Alternate real and imaginary prior to transform
-            array.real = FourierTransform.alternate(array.real)
-            array.imag = FourierTransform.alternate(array.imag)
+            FourierTransform.alternate(array, out=array)
             
         if (self.ft_neg and not self.ft_inv):
             # Negate all imaginary values prior to transform
-            array.imag = FourierTransform.negate(array.imag)
+            FourierTransform.negate(array.imag, out=array.imag)
 
         if (self.ft_real and ndQuad != 1):
             # Set all imaginary values to 0
-            array.imag = np.zeros_like(array.imag)
+            array.imag[...] = 0
 
         # Perform dfft or idfft depending on args
         operation = self.vectorFFT if not self.ft_inv else self.vectorIFFT
@@ -223,12 +227,11 @@ class FourierTransform(Function):
     
         if (self.ft_alt and self.ft_inv):
             # Alternate after ifft if necessary
-            array.real = FourierTransform.alternate(array.real)
-            array.imag = FourierTransform.alternate(array.imag)
+            FourierTransform.alternate(array, out=array)
 
         if (self.ft_neg and self.ft_inv):
             # Negate all imaginary values after ifft if necessary
-            array.imag = FourierTransform.negate(array.imag)
+            FourierTransform.negate(array.imag, out=array.imag)
         
         return array
     
@@ -265,39 +268,68 @@ class FourierTransform(Function):
         # Function.clArgsTail(FT)
 
     @staticmethod
-    def negate(array : np.ndarray) -> np.ndarray:
+    @lru_cache(maxsize=16)
+    def nmrOrder(size : int, inverse : bool = False) -> np.ndarray:
+        """
+        Index order that rearranges a transformed vector of size points to
+        match nmrPipe, equivalent to shifting the zero frequency to the center,
+        reversing the vector and rolling it by one point
+
+        Parameters
+        ----------
+        size : int
+            Number of points in the transformed vector
+
+        inverse : bool
+            Obtain the order for the inverse transform
+
+        Returns
+        -------
+        ndarray
+            Read-only index array
+        """
+        shift = fft.ifftshift if inverse else fft.fftshift
+        order = np.roll(np.flip(shift(np.arange(size))), 1)
+        order.flags.writeable = False
+        return order
+
+    @staticmethod
+    def negate(array : np.ndarray, out : np.ndarray | None = None) -> np.ndarray:
         """
-        Negate values of inputted array
+        Negate values of inputted array, into out if provided
         """
-        return -1 * array
+        return np.negative(array, out=out)
 
     @staticmethod
-    def alternate(array : np.ndarray, positiveStart : bool = True):
+    def alternate(array : np.ndarray, positiveStart : bool = True, out : np.ndarray | None = None):
         """
-        Return inputted array with alternating signs from postitive to negative
+        Return inputted array with every other point negated along the last axis
 
         Parameters
         ----------
         array : ndarray
-            Target array to sign alternate, assumed to be non-complex
+            Target array to sign alternate
 
         positiveStart : bool
-            Set whether the values start as negative or positive
+            Set whether the first point keeps its sign or is negated
+
+        out : ndarray, optional
+            Array receiving the result, may be the inputted array itself
 
         Returns
         -------
         ndarray
             Sign alternating array
         """
-        # Make an array of ones similar to the array
-        signs = np.ones_like(array)
-
-        # Half of the ones are set to negative, the other half positive 
-        negative = -1*signs[...,1::2]
-        positive = np.absolute(signs[...,::2])
-        signs[...,1::2] = negative if positiveStart else positive
-        signs[...,::2] = positive if positiveStart else negative
-        return np.absolute(array) * signs
+        if out is None:
+            out = np.array(array)
+        elif out is not array:
+            np.copyto(out, array)
+
+        # Negate the odd points, or the even points when starting negative
+        start = 1 if positiveStart else 0
+        np.negative(out[...,start::2], out=out[...,start::2])
+        return out
 
 
     ####################
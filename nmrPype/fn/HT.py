@@ -1,14 +1,12 @@
 from nmrPype.utils import DataFrame
 from .function import DataFunction as Function
 import numpy as np
-from scipy.signal import hilbert
+from scipy import fft
+from functools import lru_cache
 from sys import stderr
-# Multiprocessing
-from multiprocessing import Pool, TimeoutError
-from concurrent.futures import ThreadPoolExecutor
 
 # type Imports/Definitions
-from ..utils import DataFrame
+from ..utils import DataFrame, realType
 
 class HilbertTransform(Function):
     """
@@ -18,6 +16,8 @@ class HilbertTransform(Function):
     ----------
     ht_ps90_180 : bool, optional
         Enable mirror image Hilbert transform, by default False
+    ht_zf : bool, optional
+        Temporarily zero fill to a power of two for speed, by default False
     ht_td : bool, optional
         Set time domain size to SIZE/2, by default False
     mp_enable : bool, optional
@@ -27,11 +27,13 @@ class HilbertTransform(Function):
     mp_threads : int, optional
         Number of threads to utilize per process, by default 0
     """
-    def __init__(self, ht_ps90_180 : bool = False, ht_td : bool = False, 
+    threaded = True
+
+    def __init__(self, ht_ps90_180 : bool = False, ht_zf : bool = False, ht_td : bool = False, 
                  mp_enable : bool = False, mp_proc : int = 0, mp_threads : int = 0):
         
         self.ht_ps90_180 = ht_ps90_180
-        # self.ht_zf = ht_zf
+        self.ht_zf = ht_zf
         self.ht_td = ht_td
         # self.ht_auto = ht_auto
         # self.ht_ps0_0 = ht_ps0_0
@@ -40,34 +42,21 @@ class HilbertTransform(Function):
         self.mp = [mp_enable, mp_proc, mp_threads]
         self.name = "HT"
         
-        params = {'ht_ps90_180':ht_ps90_180, 'ht_td':ht_td}
+        params = {'ht_ps90_180':ht_ps90_180, 'ht_zf':ht_zf, 'ht_td':ht_td}
         super().__init__(params)
 
-    ############
-    # Function #
-    ############
-
-    def run(self, data : DataFrame) -> int:
-        """
-        See :py:func:`nmrPype.fn.function.DataFunction.run` for documentation
-        """
-
-        self.initialize(data)
-
-        if not self.mp[0] or data.array.ndim == 1:
-            data.array = self.process(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
-        else:
-            data.array = self.parallelize(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
-
-        # Update header once processing is complete
-        self.updateHeader(data)
-
-        return 0
-    
     ###################
     # Multiprocessing #
     ###################
 
+    def parallelize(self, array : np.ndarray, verb : tuple[int,int, str] = (0,16,'H')) -> np.ndarray:
+        """
+        See :py:func:`nmrPype.fn.function.DataFunction.parallelize` for documentation.
+
+        The batched transforms are split over threads by the fft itself.
+        """
+        return self.transform(array, verb, max(1, self.mp[1]))
+
     ######################
     # Default Processing #
     ######################
@@ -93,27 +82,47 @@ class HilbertTransform(Function):
         ndarray
             Updated array after function operation
         """
-        # Ensure support for an odd number of points
-
-        it = np.nditer(array, flags=['external_loop','buffered'], op_flags=['readwrite'], buffersize=array.shape[-1], order='C')
-        with it:
-            for x in it:
-                if verb[0]:
-                    Function.verbPrint('HT', it.iterindex, it.itersize, array.shape[-1], verb[1:])
-                    x[...] = self.hilb(x)
-            if verb[0]:
-                print("", file=stderr)
-
-        return array
+        return self.transform(array, verb)
     
-    def hilb(self, array : np.ndarray) -> np.ndarray:
-        x = array.real
-        htSize = len(x)
+    def transform(self, array : np.ndarray, verb : tuple[int,int, str] = (0,16,'H'), workers : int = 1) -> np.ndarray:
+        """
+        Reconstruct the imaginary data of every vector from the real data
+        with one forward and one inverse fft over the whole array
 
-        if (self.ht_ps90_180):
-            htSize = 2*htSize
-        
-        return hilbert(x, htSize)
+        Parameters
+        ----------
+        array : ndarray
+            Target data array, transformed along the last axis
+
+        verb : tuple[int,int,str], optional
+        Tuple containing elements for verbose print, by default (0, 16,'H')
+            - Verbosity level
+            - Verbosity Increment
+            - Direct Dimension Label
+
+        workers : int
+            Number of threads used by the transforms
+
+        Returns
+        -------
+        ndarray
+            Complex array with the same shape as the input array
+        """
+        size = array.shape[-1]
+        h = HilbertTransform.multiplier(size, self.ht_ps90_180, self.ht_zf)
+
+        # Transforms are padded to the multiplier size and truncated back after the inverse
+        spectrum = fft.fft(array.real, n=len(h), axis=-1, workers=workers)
+        spectrum *= h.astype(realType(), copy=False)
+        new_array = fft.ifft(spectrum, axis=-1, workers=workers, overwrite_x=True)[..., :size]
+        new_array = new_array.astype(np.result_type(array.dtype, np.complex64), copy=False)
+
+        if verb[0]:
+            traces = int(array.size / size)
+            Function.verbPrint('HT', traces, traces, 1, verb[1:], True)
+            print("", file=stderr)
+
+        return new_array
 
 
     ##################
@@ -137,8 +146,8 @@ class HilbertTransform(Function):
         HT = subparser.add_parser('HT', parents=[parent_parser], help='Perform a Hilbert Transform (HT) on the data')
         HT.add_argument('-ps90-180', action='store_true', 
                         dest='ht_ps90_180', help='Mirror Image Hilbert Transform.')
-        # HT.add_argument('-zf', action='store_true', 
-        #                 dest='ht_zf', help='Temporary Zero Fill for Speed')
+        HT.add_argument('-zf', action='store_true', 
+                        dest='ht_zf', help='Temporary Zero Fill for Speed')
         HT.add_argument('-td', action='store_true', 
                         dest='ht_td', help='Set Time-Domain Size to SIZE/2')
         # HT.add_argument('-auto', action='store_true', 
@@ -147,6 +156,44 @@ class HilbertTransform(Function):
         #                 dest='ht_ps0_0', help='Force Ordinary Hilbert Transform')
         # HT.add_argument('-nozf', action='store_true',
         #                 dest='ht_nozf', help='No Temporary Zero Fill')
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def multiplier(size : int, ps90_180 : bool = False, zf : bool = False) -> np.ndarray:
+        """
+        Spectral step filter of the Hilbert transform, the transform length is
+        the length of the filter
+
+        Parameters
+        ----------
+        size : int
+            Number of points in each vector
+
+        ps90_180 : bool
+            Double the transform length for the mirror image Hilbert transform
+
+        zf : bool
+            Extend the transform length to the next power of two
+
+        Returns
+        -------
+        ndarray
+            Read-only filter that keeps the zero frequency, doubles the
+            positive frequencies and removes the negative frequencies
+        """
+        htSize = 2*size if ps90_180 else size
+        if zf:
+            htSize = 1 if htSize == 0 else 2**(htSize-1).bit_length()
+
+        h = np.zeros(htSize)
+        h[0] = 1
+        if htSize % 2 == 0:
+            h[htSize // 2] = 1
+            h[1:htSize // 2] = 2
+        else:
+            h[1:(htSize + 1) // 2] = 2
+        h.flags.writeable = False
+        return h
         
 
     ####################
@@ -181,7 +228,7 @@ class HilbertTransform(Function):
         # Set data to complex if needed
         currDim = data.getCurrDim()
         if data.getParam("NDQUADFLAG", currDim) == 1:
-            data.setParam("NDQUADFLAG", currDim, 0.0)
+            data.setParam("NDQUADFLAG", 0.0, currDim)
 
         shape = data.array.shape
         qFlags = []
@@ -1,14 +1,9 @@
 from .function import DataFunction as Function
 import numpy as np
-import operator
 from sys import stderr
 
-# Multiprocessing
-from multiprocessing import Pool, TimeoutError
-from concurrent.futures import ThreadPoolExecutor
-
 # type Imports/Definitions
-from ..utils import DataFrame
+from ..utils import DataFrame, complexType
 
 class PhaseCorrection(Function):
     """
@@ -40,8 +35,9 @@ class PhaseCorrection(Function):
     ps_zf : bool
         Use Temporary Zero Fill for the Hilbert Transform.
 
-    mp_enable : bool
-        Enable multiprocessing
+    mp_enable : bool | str
+        Enable multiprocessing, 'threads' runs tasks on worker threads
+        instead of processes
 
     mp_proc : int
         Number of processors to utilize for multiprocessing
@@ -49,6 +45,9 @@ class PhaseCorrection(Function):
     mp_threads : int
         Number of threads to utilize per process
     """
+    inPlace = True
+    threaded = True
+
     def __init__(self, ps_p0 : float = 0, ps_p1 : float = 0,
                  ps_inv : bool = False, ps_hdr : bool = False, 
                  ps_noup : bool = False, ps_df : bool = False,
@@ -81,82 +80,7 @@ class PhaseCorrection(Function):
     # Multiprocessing #
     ###################
     
-    def parallelize(self, array: np.ndarray, verb : tuple[int,str] = (16,'H')) -> np.ndarray:
-        """
-        Multiprocessing implementation for function to properly optimize for hardware
-
-        Parameters
-        ----------
-        array : ndarray
-            Target data array to process with function
-
-        ndQuad : int
-            NDQUADFLAG header value
-
-        verb : tuple[int,int,str], optional
-        Tuple containing elements for verbose print, by default (0, 16,'H')
-            - Verbosity level
-            - Verbosity Increment
-            - Direct Dimension Label
-
-        Returns
-        -------
-        new_array : ndarray
-            Updated array after function operation
-        """
-        # Save array shape for reshaping later
-        array_shape = array.shape
-
-        # Split array into manageable chunks
-        chunk_size = int(array_shape[0] / self.mp[1])
-        
-        # Assure chunk_size is nonzero
-        chunk_size = array_shape[0] if chunk_size == 0 else chunk_size
-        
-        chunks = [array[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
-        
-        chunk_num = len(chunks)
-        # Process each chunk in processing pool
-        args = []
-        for i in range(chunk_num):
-            if i == 0:
-                args.append((chunks[i], verb))
-            else:
-                args.append((chunks[i]))
-
-        if verb[0]:
-            Function.mpPrint("PS", chunk_num, (len(chunks[0]), len(chunks[-1])), 'start')
-
-        with Pool(processes=self.mp[1]) as pool:
-            output = pool.starmap(self.phaseCorrect, args, chunksize=chunk_size)
-
-        if verb[0]:
-            Function.mpPrint("PS", chunk_num, (len(chunks[0]), len(chunks[-1])), 'end')
-
-        # Recombine and reshape data
-        new_array = np.concatenate(output).reshape(array_shape)
-        return new_array
-
-    def phaseCorrect(self, array: np.ndarray) -> np.ndarray:
-        """
-        Phase correction helper function for multiprocessing
-
-        Parameters
-        ----------
-        array : ndarray
-            Target data array to phase correct
-
-        Returns
-        -------
-        new_array : ndarray
-            Updated array after function operation
-        """
-        # Set arguments for function
-        args = [(a, self.phase) for a in array]
-        with ThreadPoolExecutor(max_workers=self.mp[2]) as executor:
-            processed_chunk = list(executor.map(lambda p: operator.mul(*p), args))
-        array = np.array(processed_chunk)
-        return array
+    # Vectors are phase corrected in place by the scheduled default parallelize
     
 
     ######################
@@ -237,25 +161,17 @@ class PhaseCorrection(Function):
         data : DataFrame
             target data to manipulate 
         """
-        # Obtain size for phase correction from data
-        size = data.array.shape[-1*data.getDimOrder(1)]
+        # Obtain size for phase correction from the vectors of the current dimension
+        size = data.array.shape[-1]
 
         # Convert from degrees to radians
         # C code uses 3.14159265
         p0 = np.radians(self.ps_p0)
         p1 = np.radians(self.ps_p1)
 
-        realList = []
-        imagList = []
-        for x in range(size):
-            realVal = np.cos(p0 + (p1*x)/size) # Ensure radians output is sufficient
-            imagVal = np.sin(p0 + (p1*x)/size)
-            realList.append(float(realVal))
-            imagList.append(float(imagVal))
-
-        imag = np.array(imagList)
-        self.phase = np.array(realVal + 1j * imag, dtype='complex64')
-        import sys
+        # Phase of every point, computed in double precision then stored in the processing precision
+        angle = p0 + (p1*np.arange(size))/size
+        self.phase = np.exp(1j * angle).astype(complexType())
         # Add values to header if noup is off
         if (not self.ps_noup):
             currDim = data.getCurrDim()
@@ -3,11 +3,10 @@ import numpy as np
 from sys import stderr
 
 # Multiprocessing
-from multiprocessing import Pool, TimeoutError
 from concurrent.futures import ThreadPoolExecutor
 
 # type Imports/Definitions
-from ..utils import DataFrame
+from ..utils import DataFrame, realType
 
 class SineBell(Function):
     """
@@ -64,6 +63,9 @@ class SineBell(Function):
     mp_threads : int
         Number of threads to utilize per process
     """
+    inPlace = True
+    threaded = True
+
     def __init__(self, sp_off : float = 0.0, sp_end : float = 1.0,
                  sp_pow : float = 1.0, sp_size : int = 0, sp_start : int = 1,
                  sp_c : float = 1, sp_one : bool = False, sp_hdr : bool = False,
@@ -86,6 +88,7 @@ class SineBell(Function):
         self.sp_goff = sp_goff
         self.mp = [mp_enable, mp_proc, mp_threads]
         self.headerParams = {}
+        self.windows = {}
         self.name = "SP"
 
         params = {
@@ -127,37 +130,27 @@ class SineBell(Function):
     def parallelize(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         See :py:func:`nmrPype.fn.function.DataFunction.parallelize` for documentation.
+
+        The window is a single multiplication per point, so chunks of traces
+        are multiplied in place by threads sharing the cached window.
         """
-        # Set length of each vector
-        dataLength = array.shape[-1]
+        window = self.window(array.shape[-1])
+        traces, tasks = self.schedule(array)
 
-        # Allocate variables from parameters for code simplification
-        if self.sp_hdr and self.headerParams:
-            a1 = self.headerParams['Q1']
-            a2 = self.headerParams['Q2']
-            a3 = self.headerParams['Q3']
-            firstPointScale = 1.0 + self.headerParams['C1']
-        else:
-            a1 = self.sp_off
-            a2 = self.sp_end
-            a3 = self.sp_pow
-            firstPointScale = self.sp_c
+        if verb[0]:
+            Function.mpPrint("SP", len(tasks), (tasks[0].stop - tasks[0].start, tasks[-1].stop - tasks[-1].start), 'start')
 
-        df = self.headerParams['DFVAL'] if self.sp_df else 0.0
+        def apply(task : slice):
+            chunk = traces[task]
+            np.multiply(chunk, window, out=chunk, casting='same_kind')
 
-        # Set arguments for function
-        args = []
-        for i in range(len(array)):
-            if i == 0:
-                args.append((array[i], a1, a2, a3, firstPointScale, df, verb))
-            else:
-                args.append((array[i], a1, a2, a3, firstPointScale, df))
-        
-        with ThreadPoolExecutor(max_workers=self.mp[2]) as executor:
-            processed_chunk = list(executor.map(lambda p: self.applyFunc(*p), args))
-            array = np.array(processed_chunk)
+        with ThreadPoolExecutor(max_workers=max(1, self.mp[1])) as executor:
+            list(executor.map(apply, tasks))
 
-        return array
+        if verb[0]:
+            Function.mpPrint("SP", len(tasks), (tasks[0].stop - tasks[0].start, tasks[-1].stop - tasks[-1].start), 'end')
+
+        return traces.reshape(array.shape)
     
     ######################
     # Default Processing #
@@ -167,9 +160,27 @@ class SineBell(Function):
         """
         See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
         """
-        dataLength = array.shape[-1]
-        
-        # Allocate variables from parameters for code simplification
+        # Every trace shares the same window, apply it to the whole array at once
+        np.multiply(array, self.window(array.shape[-1]), out=array, casting='same_kind')
+
+        if verb[0]:
+            traces = int(array.size / array.shape[-1])
+            Function.verbPrint('SP', traces, traces, 1, verb[1:], True)
+            print("", file=stderr)
+
+        return array
+
+
+    def windowParams(self) -> tuple[float,float,float,float,float]:
+        """
+        Obtain the offset, end, power, first point scale and digital filter
+        values of the window, from the header if requested
+
+        Returns
+        -------
+        tuple[float,float,float,float,float]
+            Offset, end, power, first point scale and digital filter values
+        """
         if self.sp_hdr and self.headerParams:
             a1 = self.headerParams['Q1']
             a2 = self.headerParams['Q2']
@@ -183,56 +194,35 @@ class SineBell(Function):
 
         df = self.headerParams['DFVAL'] if self.sp_df else 0.0
 
-        it = np.nditer(array, flags=['external_loop','buffered'], op_flags=['readwrite'], buffersize=dataLength, order='C')
-        with it:
-            for x in it:
-                if verb[0]:
-                    Function.verbPrint('SP', it.iterindex, it.itersize, array.shape[-1], verb[1:])
-                x[...] = self.applyFunc(x, a1, a2, a3, firstPointScale, df)
-            if verb[0]:
-                print("", file=stderr)
-
-        return array
+        return a1, a2, a3, firstPointScale, df
 
 
-    def applyFunc(self, array : np.ndarray, a1 : float, a2 : float,
-                  a3 : float, fps : int, df : float, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
+    def window(self, tSize : int) -> np.ndarray:
         """
-        Apply sine bell to array
+        Build the sine bell window for vectors of tSize points.
+
+        The window covers the whole vector, including the points outside of
+        the apodized region and the first point scale, so that applying the
+        filter is a single multiplication. Windows are cached by vector size,
+        in the processing precision.
 
         Parameters
         ----------
-        array : np.ndarray
-            Target array to apply function to
-
-        a1 : float
-            offset value
-        a2 : float 
-            end value
-        a3 : float
-            exponential power value
-        fps : int
-            first point scale to apply
-        df : float
-            digital filter value
-        verb : tuple[int,int,str], optional
-        Tuple containing elements for verbose print, by default (0, 16,'H')
-            - Verbosity level
-            - Verbosity Increment
-            - Direct Dimension Label
-            
+        tSize : int
+            Number of points in each vector
+
         Returns
         -------
-        new_array : np.ndarray
-            Array with sinusoidal filter
+        window : np.ndarray
+            Window to multiply each vector by
         """
-        if array.ndim == 1:
-            tSize = len(array)
-        else:
-            tSize = array.shape[-1]
+        if tSize in self.windows:
+            return self.windows[tSize]
+
+        a1, a2, a3, fps, df = self.windowParams()
 
         # Set size to the size of array if one is not provided
-        aSize = self.sp_size if self.sp_size else tSize
+        aSize = int(self.sp_size) if self.sp_size else tSize
 
          #mSize = aStart + aSize - 1 > tSize ? tSize - aStart + 1 : aSize;
         mSize = tSize - self.sp_start + 1 if self.sp_start + aSize - 1 > tSize else aSize
@@ -246,8 +236,7 @@ class SineBell(Function):
         
         q = 1 if q <= 0.0 else q
 
-        new_shape = array.shape[:-1] + (tSize,)
-        new_array = np.ones(new_shape, dtype=array.dtype) if self.sp_one else np.zeros(new_shape, dtype=array.dtype)
+        window = np.ones(tSize) if self.sp_one else np.zeros(tSize)
         
         startIndex = self.sp_start - 1
 
@@ -258,15 +247,17 @@ class SineBell(Function):
         in_closed_unit_interval = (0.0 <= a1 <= 1.0) and (0.0 <= a2 <= 1.0)
         a = np.absolute(a) if (in_closed_unit_interval) else a
 
-        # Place window function region into dummy array
-        new_array[...,startIndex:startIndex + mSize] = array[startIndex:startIndex + mSize] * a
+        # Place window function region into full window
+        window[startIndex:startIndex + mSize] = a
         
         if self.sp_inv: 
-            new_array[0] /= fps
+            window[0] /= fps
         else:
-            new_array[0] *= fps
+            window[0] *= fps
 
-        return(new_array)
+        window = window.astype(realType())
+        self.windows[tSize] = window
+        return window
 
 
 
@@ -344,6 +335,8 @@ class SineBell(Function):
             'DF':data.getParam('FDDMXVAL', currDim),
             'C1':data.getParam('NDC1', currDim)
         }
+        # Windows depend on the header parameters, rebuild them for new data
+        self.windows = {}
 
         # Variable initialization for clarity
         q1 = self.sp_off
@@ -0,0 +1,380 @@
+from .function import DataFunction as Function
+from .SP import SineBell
+from .ZF import ZeroFill
+from .FT import FourierTransform
+import numpy as np
+from sys import stderr
+
+# Multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+# type Imports/Definitions
+from ..utils import DataFrame
+
+# Target size in bytes of the block of vectors transformed at once
+BLOCK_BYTES = 4 * 1024 * 1024
+
+class FusedFourierTransform(Function):
+    """
+    Data Function object for performing a Sine Bell window, Zero Fill and
+    Fourier Transform on the data in a single pass.
+
+    Equivalent to running SP, ZF and FT back to back, but each block of vectors
+    is windowed into a small buffer and transformed straight into the output,
+    so the intermediate windowed and zero filled arrays are never allocated.
+    The zero fill is performed by the transform length.
+
+    Parameters
+    ----------
+    spft_off : float
+        PI value starting offset
+
+    spft_end : float
+        PI value ending offset
+
+    spft_pow : float
+        Sine function exponent
+
+    spft_size : int
+        Span of data to apply sinusoidal filter to
+
+    spft_start : int
+        Starting point of sinusoidal filter window
+
+    spft_c : float
+        Scaling value for the first point of the sinusoidal filter window
+
+    spft_one : bool
+        Set all points outside of sinusoidal filter window to 1 instead of 0
+
+    spft_hdr : bool
+        Use constant values from the header
+
+    spft_inv : bool
+        Invert the sinusoidal filter window
+
+    spft_df : bool
+        Adjust PI value starting offset for Digital Oversampling.
+
+    spft_zf : int
+        Number of times to double the data
+
+    spft_pad : int
+        Number of zeros to pad the data by
+
+    spft_zfsize : int
+        Set data to new size while filling empty data with zeros
+
+    spft_auto : bool
+        Automatically add zeros to pad data to the next power of two
+
+    mp_enable : bool
+        Enable multiprocessing
+
+    mp_proc : int
+        Number of processors to utilize for multiprocessing
+
+    mp_threads : int
+        Number of threads to utilize per process
+    """
+    threaded = True
+
+    def __init__(self, spft_off : float = 0.0, spft_end : float = 1.0,
+                 spft_pow : float = 1.0, spft_size : int = 0, spft_start : int = 1,
+                 spft_c : float = 1, spft_one : bool = False, spft_hdr : bool = False,
+                 spft_inv : bool = False, spft_df : bool = False,
+                 spft_zf : int = -1, spft_pad : int = 0, spft_zfsize : int = 0,
+                 spft_auto : bool = False,
+                 mp_enable : bool = False, mp_proc : int = 0, mp_threads : int = 0):
+        self.sp = SineBell(sp_off=spft_off, sp_end=spft_end, sp_pow=spft_pow,
+                           sp_size=spft_size, sp_start=spft_start, sp_c=spft_c,
+                           sp_one=spft_one, sp_hdr=spft_hdr, sp_inv=spft_inv, sp_df=spft_df)
+        self.zf = ZeroFill(zf_count=spft_zf, zf_pad=spft_pad, zf_size=spft_zfsize,
+                           zf_auto=spft_auto)
+        self.ft = FourierTransform()
+        self.apodize = True
+        self.mp = [mp_enable, mp_proc, mp_threads]
+        self.name = "SPFT"
+
+        params = {
+        'spft_off': spft_off, 'spft_end': spft_end, 'spft_pow': spft_pow,
+        'spft_size': spft_size, 'spft_start': spft_start, 'spft_c': spft_c,
+        'spft_one': spft_one, 'spft_hdr': spft_hdr, 'spft_inv': spft_inv,
+        'spft_df': spft_df, 'spft_zf': spft_zf, 'spft_pad': spft_pad,
+        'spft_zfsize': spft_zfsize, 'spft_auto': spft_auto}
+        super().__init__(params)
+
+    ###################
+    # Multiprocessing #
+    ###################
+
+    def parallelize(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
+        """
+        See :py:func:`nmrPype.fn.function.DataFunction.parallelize` for documentation.
+
+        Blocks of vectors are transformed by threads directly into the shared output array,
+        the transform releases the GIL so no worker processes are needed.
+        """
+        traces, out, window, size, rows = self.prepare(array)
+        starts = range(0, traces.shape[0], rows)
+
+        if verb[0]:
+            Function.mpPrint("SPFT", len(starts), (rows, traces.shape[0] - starts[-1]), 'start')
+
+        def transform(i : int):
+            self.kernel(traces[i:i+rows], out[i:i+rows], window, size)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.mp[1])) as executor:
+            list(executor.map(transform, starts))
+
+        if verb[0]:
+            Function.mpPrint("SPFT", len(starts), (rows, traces.shape[0] - starts[-1]), 'end')
+
+        return out.reshape(array.shape[:-1] + (size,))
+
+    ######################
+    # Default Processing #
+    ######################
+
+    def process(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
+        """
+        See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
+        """
+        traces, out, window, size, rows = self.prepare(array)
+
+        # Reuse one buffer for every block
+        buffer = np.empty((min(rows, traces.shape[0]), traces.shape[-1]), dtype=out.dtype)
+        for i in range(0, traces.shape[0], rows):
+            self.kernel(traces[i:i+rows], out[i:i+rows], window, size, buffer)
+
+        if verb[0]:
+            Function.verbPrint('SPFT', traces.shape[0], traces.shape[0], 1, verb[1:], True)
+            print("", file=stderr)
+
+        return out.reshape(array.shape[:-1] + (size,))
+
+    def prepare(self, array : np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray | None, int, int]:
+        """
+        Obtain the vectors of the array, the output array, window, transform size
+        and number of vectors per block for processing the array
+
+        Parameters
+        ----------
+        array : ndarray
+            Target data array to process with function
+
+        Returns
+        -------
+        traces : ndarray
+            Array viewed as a 2D array of vectors
+        out : ndarray
+            Uninitialized 2D output array
+        window : ndarray | None
+            Window to apply to each vector, None if no window is applied
+        size : int
+            Length of each vector after zero filling
+        rows : int
+            Number of vectors per block
+        """
+        tSize = array.shape[-1]
+        size = self.zf.zfSize(tSize) if self.zf is not None else tSize
+        window = self.sp.window(tSize) if self.apodize else None
+
+        traces = array.reshape(-1, tSize)
+        out = self.empty((traces.shape[0], size), np.result_type(array.dtype, np.complex64))
+
+        # Size blocks by the larger of the input and output vectors
+        rows = max(1, BLOCK_BYTES // (max(tSize, size) * out.itemsize))
+
+        return traces, out, window, size, rows
+
+    def kernel(self, traces : np.ndarray, out : np.ndarray, window : np.ndarray | None,
+               size : int, buffer : np.ndarray | None = None):
+        """
+        Window, zero fill and transform a block of vectors into out
+
+        Parameters
+        ----------
+        traces : ndarray
+            Block of vectors to process
+        out : ndarray
+            Array receiving the processed block
+        window : ndarray | None
+            Window to apply to each vector, None if no window is applied
+        size : int
+            Length of each vector after zero filling
+        buffer : ndarray, optional
+            Scratch array of at least as many vectors as the block
+        """
+        if buffer is None:
+            buffer = np.empty(traces.shape, dtype=out.dtype)
+        buffer = buffer[:len(traces)]
+
+        if window is None:
+            buffer[...] = traces
+        else:
+            np.multiply(traces, window, out=buffer, casting='same_kind')
+
+        # The transform zero fills to size points before transforming
+        self.ft.blockFFT(buffer, size, out=out)
+
+    ##################
+    # Static Methods #
+    ##################
+
+    @staticmethod
+    def clArgs(subparser, parent_parser):
+        """
+        Fused Fourier Transform command-line arguments
+
+        Adds Fused Fourier Transform parser to the subparser, with its corresponding default args
+        Called by :py:func:`nmrPype.parse.parser`.
+
+        Parameters
+        ----------
+        subparser : _SubParsersAction[ArgumentParser]
+            Subparser object that will receive function and its arguments
+        """
+        SPFT = subparser.add_parser('SPFT', parents=[parent_parser],
+                                    help='Perform Sine Bell, Zero Fill and Fourier Transform in one pass')
+        group = SPFT.add_argument_group('Sine Bell Options')
+        group.add_argument('-off', type=float, metavar='offset [0.0]', default=0.0,
+                        dest='spft_off', help='Sine Start*PI.    (Q1)')
+        group.add_argument('-end', type=float, metavar='end [1.0]', default=1.0,
+                        dest='spft_end', help='Sine End*PI.    (Q2)')
+        group.add_argument('-pow', type=float, metavar='exp [1.0]', default=1.0,
+                        dest='spft_pow', help='Sine Exponent.  (Q3)')
+        group.add_argument('-size', type=float, metavar='aSize [APOD]', default=0.0,
+                        dest='spft_size', help='Apodize Length')
+        group.add_argument('-start', type=int, metavar='aStart [1]', default=1,
+                        dest='spft_start', help='Apodize Start')
+        group.add_argument('-c', type=float, metavar='fScale [1]', default=1,
+                        dest='spft_c', help='Scaling Value for the First Point')
+        group.add_argument('-one', action='store_true',
+                        dest='spft_one', help='Outside = 1')
+        group.add_argument('-hdr', action='store_true',
+                        dest='spft_hdr', help='Use Q/LB/GB/GOFF from Header')
+        group.add_argument('-inv', action='store_true',
+                        dest='spft_inv', help='Invert Window')
+        group.add_argument('-df', action='store_true',
+                        dest='spft_df', help='Adjust -off for Digital Oversampling')
+
+        group = SPFT.add_argument_group('Zero Fill Options')
+        group.add_argument('-auto', action='store_true',
+                        dest='spft_auto', help='Round Final Size to Power of 2')
+        exclusive = group.add_mutually_exclusive_group()
+        exclusive.add_argument('-zf', type=int, metavar='count', default=-1,
+                        dest='spft_zf', help='-Number of Times to Double the size')
+        exclusive.add_argument('-pad', type=int, metavar='padCount', default=0,
+                        dest='spft_pad', help='Zeros to Add by Padding')
+        exclusive.add_argument('-zfsize', type=int, metavar='xSize', default=0,
+                        dest='spft_zfsize', help='Desired Final size')
+
+    @staticmethod
+    def fromFunctions(sp : SineBell | None, zf : ZeroFill | None, ft : FourierTransform):
+        """
+        Create a fused function from existing function objects,
+        using the multiprocessing settings of the fourier transform
+
+        Parameters
+        ----------
+        sp : SineBell | None
+            Sine Bell to apply before zero filling, None to skip the window
+        zf : ZeroFill | None
+            Zero Fill to apply before the transform, None to skip the zero fill
+        ft : FourierTransform
+            Fourier Transform to fuse with
+
+        Returns
+        -------
+        FusedFourierTransform
+            Fused function object
+        """
+        function = FusedFourierTransform(mp_enable=ft.mp[0], mp_proc=ft.mp[1], mp_threads=ft.mp[2])
+        function.sp = sp
+        function.zf = zf
+        function.ft = ft
+
+        params = {}
+        for fn in (sp, zf, ft):
+            if fn is not None:
+                params.update(fn.params)
+        function.params = params
+        return function
+
+    @staticmethod
+    def fuse(functions : list[Function]) -> list[Function]:
+        """
+        Replace every run of SP, ZF and FT function objects in a list of functions
+        with a single fused function. Either the SP or the ZF may be missing,
+        and the FT must not use the real, negate or alternate options.
+
+        Parameters
+        ----------
+        functions : list[DataFunction]
+            Function objects in the order they are run
+
+        Returns
+        -------
+        list[DataFunction]
+            Function objects with the fusable runs replaced
+        """
+        fused = []
+        i = 0
+        while i < len(functions):
+            sp = functions[i] if type(functions[i]) is SineBell else None
+            j = i + (sp is not None)
+            zf = functions[j] if j < len(functions) and type(functions[j]) is ZeroFill else None
+            k = j + (zf is not None)
+            ft = functions[k] if k < len(functions) and type(functions[k]) is FourierTransform else None
+
+            if (ft is not None) and (k > i) and not (ft.ft_real or ft.ft_neg or ft.ft_alt):
+                fused.append(FusedFourierTransform.fromFunctions(sp, zf, ft))
+                i = k + 1
+            else:
+                fused.append(functions[i])
+                i += 1
+
+        return fused
+
+    ####################
+    #  Proc Functions  #
+    ####################
+
+    def initialize(self, data : DataFrame):
+        """
+        Initialization follows the following steps:
+            - Handle function specific arguments
+            - Update any header values before any calculations occur
+              that are independent of the data, such as flags and parameter storage
+
+        The header is updated by each fused function in the order they would run.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Target data to manipulate
+        """
+        # Skip the window for trivial constants, matching the Sine Bell run
+        self.apodize = (self.sp is not None) and not (self.sp.sp_pow == 0.0 or \
+                       (self.sp.sp_off == 0.5 and self.sp.sp_end == 0.5))
+
+        if self.apodize:
+            self.sp.initialize(data)
+        if self.zf is not None:
+            self.zf.initialize(data)
+        self.ft.initialize(data)
+
+    def updateHeader(self, data : DataFrame):
+        """
+        Update the header following the main function's calculations.
+        Typically this includes header fields that relate to data size.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Target data frame containing header to update
+        """
+        for fn in (self.sp if self.apodize else None, self.zf, self.ft):
+            if fn is not None:
+                fn.updateHeader(data)
@@ -3,10 +3,6 @@ from .function import DataFunction as Function
 import numpy as np
 from enum import Enum
 
-# Multiprocessing
-from multiprocessing import Pool, TimeoutError
-from concurrent.futures import ThreadPoolExecutor
-
 # type Imports/Definitions
 from ..utils import DataFrame
 
@@ -36,6 +32,8 @@ class Transpose(Function):
     tp_axis : int
         Indirect dimension axis to be swapped with direct dimension
     """
+    threaded = True
+
     def __init__(self,
                 tp_noord: bool = False, tp_exch : bool = False,
                 tp_minMax: bool = True, tp_axis : int = 0, params : dict = {}):
@@ -62,7 +60,7 @@ class Transpose(Function):
     # Multiprocessing #
     ###################
         
-    def parallelize(self, array : np.ndarray) -> np.ndarray:
+    def parallelize(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         Blanket transpose parralelize implementation for function, utilizing cores and threads. 
         Function Should be overloaded if array_shape changes in processing or process requires more args.
@@ -76,19 +74,22 @@ class Transpose(Function):
         array : ndarray
             Target data array to process with function
 
+        verb : tuple[int,int,str], optional
+            Tuple containing elements for verbose print, by default (0, 16,'H')
+
         Returns
         -------
         new_array : ndarray
             Updated array after function operation
         """
-        return(self.process(array))
+        return(self.process(array, verb))
     
 
     ######################
     # Default Processing #
     ######################
         
-    def process(self, array : np.ndarray) -> np.ndarray:
+    def process(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         Process is called by function's run, returns modified array when completed.
         Likely attached to multiprocessing for speed
@@ -98,6 +99,9 @@ class Transpose(Function):
         array : ndarray
             array to process
 
+        verb : tuple[int,int,str], optional
+            Tuple containing elements for verbose print, by default (0, 16,'H')
+
         Returns
         -------
         ndarray
@@ -312,7 +316,7 @@ class Transpose2D(Transpose):
     # Default Processing #
     ######################
     
-    def process(self, array : np.ndarray):
+    def process(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         Process is called by function's run, returns modified array when completed.
         Likely attached to multiprocessing for speed
@@ -322,6 +326,9 @@ class Transpose2D(Transpose):
         array : ndarray
             array to process
 
+        verb : tuple[int,int,str], optional
+            Tuple containing elements for verbose print, by default (0, 16,'H')
+
         Returns
         -------
         ndarray
@@ -508,7 +515,7 @@ class Transpose3D(Transpose):
     # Default Processing #
     ######################
 
-    def process(self, array : np.ndarray):
+    def process(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
         """
@@ -671,7 +678,7 @@ class Transpose4D(Transpose):
     # Default Processing #
     ######################
 
-    def process(self, array : np.ndarray):
+    def process(self, array : np.ndarray, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
         """
         See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
         """
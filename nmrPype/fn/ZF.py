@@ -3,7 +3,6 @@ import numpy as np
 from sys import stderr
 
 # Multiprocessing
-from multiprocessing import Pool, TimeoutError
 from concurrent.futures import ThreadPoolExecutor
 
 # type Imports/Definitions
@@ -39,6 +38,8 @@ class ZeroFill(Function):
     mp_threads : int
         Number of threads to utilize per process
     """
+    threaded = True
+
     def __init__(self, zf_count : int = -1, zf_pad : int = 0, zf_size : int = 0,
                  zf_auto : bool = False, zf_inv : bool = False,
                  mp_enable : bool = False, mp_proc : int = 0, mp_threads : int = 0):
@@ -54,28 +55,6 @@ class ZeroFill(Function):
                   'zf_auto':zf_auto, 'zf_inv':zf_inv}
         super().__init__(params)
 
-    ############
-    # Function #
-    ############
-            
-    def run(self, data : DataFrame) -> int:
-        """
-        See :py:func:`nmrPype.fn.function.DataFunction.run` for documentation
-        """
-
-        self.initialize(data)
-
-        # Perform ZF without multiprocessing
-        if not self.mp[0] or data.array.ndim == 1:
-            data.array = self.process(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
-        else:
-            data.array = self.parallelize(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
-
-        # Update header once processing is complete
-        self.updateHeader(data)
-
-        return 0
-
     ###################
     # Multiprocessing #
     ###################
@@ -84,6 +63,9 @@ class ZeroFill(Function):
         """
         Multiprocessing implementation for function to properly optimize for hardware
 
+        Zero filling is a memory copy, so chunks of the array are copied by threads
+        directly into the shared output array rather than sent to worker processes.
+
         Parameters
         ----------
         array : ndarray
@@ -100,121 +82,27 @@ class ZeroFill(Function):
         new_array : ndarray
             Updated array after function operation
         """
-        # Save array shape for reshaping later
-        array_shape = array.shape
-        dataLength = array_shape[-1]
-
-        # By default multiply size by 2
-        new_size = dataLength * 2
-
-        # check if undoing zero-fill operation
-        if self.zf_inv:
-            if self.zf_count:
-                # Reduce size by 2 zf_count times, ensure size is nonzero positive
-                new_size = int(dataLength / (2**self.zf_count))
-                new_size = new_size if new_size > 0 else 1
-            elif self.zf_pad:
-                # Subtract padding, ensure size is nonzero positive
-                new_size = dataLength - self.zf_pad
-                new_size = new_size if new_size >= 1 else 1
-            else: 
-                # Divide size by 2 by default
-                new_size = dataLength / 2
-        else:
-            if self.zf_pad:
-                # Add amount of zeros corresponding to pad amount
-                new_size += self.zf_pad
-            elif self.zf_count >= 0:
-                # Double data zf_count times
-                magnitude = 2**self.zf_count
-                new_size = dataLength * magnitude
-            elif self.zf_size:
-                # Match user inputted size for new array
-                new_size = self.zf_size 
-            if self.zf_auto:
-                # Reach next power of 2 with auto
-                new_size = ZeroFill.nextPowerOf2(new_size)
-        
-        # Obtain new array shape and then create dummy array for data transfer
-        new_shape = array.shape[:-1] + (new_size,)
+        new_array = self.allocate(array)
 
-        # Split array into manageable chunks
-        chunk_size = int(array_shape[0] / self.mp[1])
+        # Split vectors into tasks
+        vectors, tasks = self.schedule(array)
+        new_vectors = new_array.reshape(-1, new_array.shape[-1])
+        sizes = (tasks[0].stop - tasks[0].start, tasks[-1].stop - tasks[-1].start)
 
-        # Assure chunk_size is nonzero
-        chunk_size = array_shape[0] if chunk_size == 0 else chunk_size
-        
-        chunks = [array[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
-
-        chunk_num = len(chunks)
-        # Pad if size is larger and trim if size is shorter
-        if new_size > dataLength:
-            padding = new_size - dataLength
-            operation = np.pad
-
-            # Only pad the last dimension by unchanging other dimension
-            pad_width = [[0,0] for i in range(chunks[0].ndim-1)]
-            pad_width[-1][-1] = padding
-
-            # Pass the chunk, the pad width, and the padding function
-            args = []
-            for i in range(chunk_num):
-                if i == 0:
-                    args.append((chunks[i], pad_width, operation, verb))
-                else:
-                    args.append((chunks[i], pad_width, operation))
-        else:
-            operation = ZeroFill.truncate
-            # Pass the chunk, the new array size, and the trimming function
-            args = []
-            for i in range(chunk_num):
-                if i == 0:
-                    args.append((chunks[i], new_size, operation, verb))
-                else:
-                    args.append((chunks[i], new_size, operation))
-        
         if verb[0]:
-            Function.mpPrint("ZF", chunk_num, (len(chunks[0]), len(chunks[-1])), 'start')
+            Function.mpPrint("ZF", len(tasks), sizes, 'start')
+
+        def copy(task : slice):
+            ZeroFill.fill(vectors[task], new_vectors[task])
 
-        # Process each chunk in processing pool
-        with Pool(processes=self.mp[1]) as pool:
-            output = pool.starmap(self.processMP, args, chunksize=chunk_size)
+        with ThreadPoolExecutor(max_workers=max(1, self.mp[1])) as executor:
+            list(executor.map(copy, tasks))
 
         if verb[0]:
-            Function.mpPrint("ZF", chunk_num, (len(chunks[0]), len(chunks[-1])), 'end')
+            Function.mpPrint("ZF", len(tasks), sizes, 'end')
 
-        # Recombine and reshape data
-        new_array = np.concatenate(output).reshape(new_shape)
         return new_array
-    
 
-    def processMP(self, array : np.ndarray, arg : tuple, operation, verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
-        """
-        Process specifically for MP, changes how it performs operation
-
-        Parameters
-        ----------
-        array : ndarray
-            array to process
-
-        args : tuple
-            Arguments to implement for target operation
-
-        operation : function
-            function to call in each thread 
-
-        Returns
-        -------
-        ndarray
-            modified array post-process
-        """
-        args = ((array[i], arg) for i in range(len(array))) 
-
-        with ThreadPoolExecutor(max_workers=self.mp[2]) as executor:
-            processed_chunk = list(executor.map(lambda p: operation(*p), args))
-            array = np.array(processed_chunk)
-        return array
-    
 
     ######################
     # Default Processing #
@@ -224,63 +112,14 @@ class ZeroFill(Function):
         """
         See :py:func:`nmrPype.fn.function.DataFunction.process` for documentation
         """
-        # Collect last axis shape to fill array size
-        dataLength = array.shape[-1]
+        new_array = self.allocate(array)
+        ZeroFill.fill(array, new_array)
 
-        # By default multiply size by 2 
-        new_size = dataLength * 2
+        if verb[0]:
+            traces = int(array.size / array.shape[-1])
+            Function.verbPrint('ZF', traces, traces, 1, verb[1:], True)
+            print("", file=stderr)
 
-        # check if undoing zero-fill operation
-        if self.zf_inv:
-            if self.zf_count:
-                # Reduce size by 2 zf_count times, ensure size is nonzero positive
-                new_size = int(dataLength / (2**self.zf_count))
-                new_size = new_size if new_size > 0 else 1
-            elif self.zf_pad:
-                # Subtract padding, ensure size is nonzero positive
-                new_size = dataLength - self.zf_pad
-                new_size = new_size if new_size >= 1 else 1
-            else: 
-                # Divide size by 2 by default
-                new_size = dataLength / 2
-        else:
-            if self.zf_pad:
-                # Add amount of zeros corresponding to pad amount
-                new_size = dataLength
-                new_size += self.zf_pad
-            elif self.zf_count >= 0:
-                # Double data zf_count times
-                magnitude = 2**self.zf_count
-                new_size = dataLength * magnitude
-            elif self.zf_size:
-                # Match user inputted size for new array
-                new_size = self.zf_size 
-            if self.zf_auto:
-                # Reach next power of 2 with auto
-                new_size = ZeroFill.nextPowerOf2(dataLength)
-
-        # Obtain new array shape and then create dummy array for data transfer
-        new_shape = array.shape[:-1] + (new_size,)
-        new_array = np.zeros(new_shape, dtype=array.dtype)
-
-        # Ensure both arrays are matching for nditer operation based on size
-        a = array if new_size > dataLength else array[...,:new_size]
-        b = new_array[...,:dataLength] if new_size > dataLength else new_array
-
-        # Iterate through each 1-D strip and copy over existing data
-        it = np.nditer([a,b], flags=['external_loop', 'buffered'], 
-                        op_flags=[['readonly'],['writeonly']],
-                        buffersize=dataLength, order='C')
-        with it:
-            for x,y in it:
-                if verb[0]:
-                    Function.verbPrint('ZF', it.iterindex, it.itersize, array.shape[-1], verb[1:])
-                y[...] = x
-            if verb[0]:
-                print("", file=stderr)
-
-        # Flag operations following operation
-        
         return new_array
     
 
@@ -333,9 +172,59 @@ class ZeroFill(Function):
         """
         return 1 if x == 0 else 2**(x-1).bit_length()
     
+    def zfSize(self, dataLength : int) -> int:
+        """
+        Size of the last axis after zero filling data with a last axis of dataLength points
+        """
+        # By default multiply size by 2
+        new_size = dataLength * 2
+
+        # check if undoing zero-fill operation
+        if self.zf_inv:
+            if self.zf_count > 0:
+                # Reduce size by 2 zf_count times, ensure size is nonzero positive
+                new_size = int(dataLength / (2**self.zf_count))
+                new_size = new_size if new_size > 0 else 1
+            elif self.zf_pad > 0:
+                # Subtract padding, ensure size is nonzero positive
+                new_size = dataLength - self.zf_pad
+                new_size = new_size if new_size >= 1 else 1
+            else:
+                # Divide size by 2 by default
+                new_size = dataLength // 2
+        else:
+            if self.zf_pad:
+                # Add amount of zeros corresponding to pad amount
+                new_size = dataLength + self.zf_pad
+            elif self.zf_count >= 0:
+                # Double data zf_count times
+                magnitude = 2**self.zf_count
+                new_size = dataLength * magnitude
+            elif self.zf_size:
+                # Match user inputted size for new array
+                new_size = self.zf_size
+            if self.zf_auto:
+                # Reach next power of 2 with auto
+                new_size = ZeroFill.nextPowerOf2(new_size)
+
+        return int(new_size)
+
+    def allocate(self, array : np.ndarray) -> np.ndarray:
+        """
+        Allocate the uninitialized output array for zero filling the input array
+        """
+        new_shape = array.shape[:-1] + (self.zfSize(array.shape[-1]),)
+        return self.empty(new_shape, array.dtype)
+
     @staticmethod
-    def truncate(array : np.array, size : int):
-        return array[...,:size]
+    def fill(array : np.ndarray, new_array : np.ndarray):
+        """
+        Copy array into the start of new_array along the last axis
+        with a single slice assignment, then zero only the remaining tail
+        """
+        size = min(array.shape[-1], new_array.shape[-1])
+        new_array[..., :size] = array[..., :size]
+        new_array[..., size:] = 0
 
     def initialize(self, data : DataFrame):
         """
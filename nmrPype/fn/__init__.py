@@ -1,33 +1,94 @@
-from .function import DataFunction
-from .DRAW import Draw
-from .DECO import Decomposition as Deco
-from .FT import FourierTransform as FT
-from .HT import HilbertTransform as HT
-from .ZF import ZeroFill as ZF
-from .DI import DeleteImaginary as DI
-from .SP import SineBell as SP
-from .PS import PhaseCorrection as PS
-from .TP import Transpose as TP
-from .TP import Transpose2D as YTP
-from .TP import Transpose3D as ZTP
-from .TP import Transpose4D as ATP
-
-fn_list = {
-    'function':DataFunction,
-    'NULL':DataFunction,
-    'DECO':Deco,
-    'DRAW':Draw,
-    'FT':FT,
-    'HT':HT,
-    'ZF':ZF,
-    'DI':DI,
-    'SP':SP,
-    'PS':PS,
-    'TP':YTP, 'YTP':YTP, 'XY2YX':YTP,
-    'ZTP':ZTP, 'XYZ2ZYX':ZTP,
-    'ATP':ATP, 'XYZA2AYZX':ATP}
-
-
-__all__ = ['DataFunction', 'Deco', 'Draw', 'FT', 'HT', 'ZF', 
-           'DI','SP', 'PS', 
-           'YTP', 'ZTP', 'ATP']
\ No newline at end of file
+"""
+fn
+
+Data functions of nmrPype. Function modules are imported on first use,
+so running one function does not load the dependencies of all the others.
+"""
+import sys
+import importlib
+from collections.abc import Mapping
+
+# Exported name of each function class, with the module and name of its definition
+_CLASSES = {
+    'DataFunction':('function', 'DataFunction'),
+    'Deco':('DECO', 'Decomposition'),
+    'Draw':('DRAW', 'Draw'),
+    'FT':('FT', 'FourierTransform'),
+    'HT':('HT', 'HilbertTransform'),
+    'ZF':('ZF', 'ZeroFill'),
+    'DI':('DI', 'DeleteImaginary'),
+    'SP':('SP', 'SineBell'),
+    'PS':('PS', 'PhaseCorrection'),
+    'SPFT':('SPFT', 'FusedFourierTransform'),
+    'TP':('TP', 'Transpose'),
+    'YTP':('TP', 'Transpose2D'),
+    'ZTP':('TP', 'Transpose3D'),
+    'ATP':('TP', 'Transpose4D')}
+
+# Function codes and the exported name of the class running each
+FUNCTIONS = {
+    'function':'DataFunction',
+    'NULL':'DataFunction',
+    'DECO':'Deco',
+    'DRAW':'Draw',
+    'FT':'FT',
+    'HT':'HT',
+    'ZF':'ZF',
+    'DI':'DI',
+    'SP':'SP',
+    'PS':'PS',
+    'SPFT':'SPFT',
+    'TP':'YTP', 'YTP':'YTP', 'XY2YX':'YTP',
+    'ZTP':'ZTP', 'XYZ2ZYX':'ZTP',
+    'ATP':'ATP', 'XYZA2AYZX':'ATP'}
+
+
+def _load(name : str) -> type:
+    """
+    Import the module of a function class and bind the class to its exported name
+    """
+    module, _ = _CLASSES[name]
+    importlib.import_module('.' + module, __name__)
+
+    # Importing a module binds the module to the package under the same name as some classes,
+    # so rebind the classes of every module loaded so far
+    for exported, (module, cls) in _CLASSES.items():
+        loaded = sys.modules.get('{}.{}'.format(__name__, module))
+        if loaded is not None and hasattr(loaded, cls):
+            globals()[exported] = getattr(loaded, cls)
+    return globals()[name]
+
+
+def __getattr__(name : str):
+    if name in _CLASSES:
+        return _load(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_CLASSES))
+
+
+class FunctionList(Mapping):
+    """
+    Function codes mapped to their function classes, importing each class on first access
+    """
+    def __getitem__(self, code : str) -> type:
+        return _load(FUNCTIONS[code])
+
+    def __contains__(self, code) -> bool:
+        return code in FUNCTIONS
+
+    def __iter__(self):
+        return iter(FUNCTIONS)
+
+    def __len__(self) -> int:
+        return len(FUNCTIONS)
+
+
+fn_list = FunctionList()
+
+
+__all__ = ['DataFunction', 'Deco', 'Draw', 'FT', 'HT', 'ZF',
+           'DI','SP', 'PS', 'SPFT',
+           'YTP', 'ZTP', 'ATP']
@@ -1,12 +1,56 @@
-from ..utils import catchError, FunctionError, DataFrame
+from ..utils import catchError, FunctionError, DataFrame, toWorkType
+from ..utils.instrument import stage, isProfiling, arrayFields
 import numpy as np
 from sys import stderr
-from sys import stderr
+from functools import wraps
+import threading
+from types import FunctionType
 
 # Multiprocessing
 from multiprocessing import Pool, TimeoutError
 from concurrent.futures import ThreadPoolExecutor
 
+# Target size in bytes of the vectors handled by a single parallel task
+TASK_BYTES = 4 * 1024 * 1024
+# Minimum number of tasks per worker, so faster workers can take on more tasks
+TASKS_PER_WORKER = 4
+
+def _runTask(task : tuple):
+    """
+    Call the function of a task with its arguments, used to hand tasks to a processing pool
+    """
+    func, *args = task
+    return func(*args)
+
+# Function phases recorded when instrumentation is enabled, see nmrPype.utils.instrument
+PHASES = ('initialize', 'process', 'parallelize', 'updateHeader')
+
+def _instrumented(phase : str, method):
+    """
+    Wrap a function phase to record it as an instrumentation stage
+    """
+    @wraps(method)
+    def phaseMethod(self, *args, **kwargs):
+        if not isProfiling():
+            return method(self, *args, **kwargs)
+
+        name = "{0}.{1}".format(getattr(self, 'name', type(self).__name__), phase)
+        with stage(name) as record:
+            result = method(self, *args, **kwargs)
+            if phase in ('process', 'parallelize') and args:
+                array = args[0]
+                record['input'] = arrayFields(array)
+                record['output'] = arrayFields(result)
+                # Bytes of new memory handed out for the result
+                shared = isinstance(result, np.ndarray) and isinstance(array, np.ndarray) \
+                         and np.may_share_memory(result, array)
+                record['alloc_bytes'] = 0 if shared else record['output'].get('nbytes', 0)
+                record['mp'] = self.backend() if phase == 'parallelize' else False
+        return result
+
+    phaseMethod.phase = phase
+    return phaseMethod
+
 class DataFunction:
     """
     Data Function is a template class for all types of functions to run on
@@ -17,7 +61,30 @@ class DataFunction:
     ----------
     params : dict
         Dictionary of parameters associated with the designated function
+
+    Attributes
+    ----------
+    inPlace : bool
+        Class attribute, set True when process and parallelize overwrite the input
+        array and return it instead of allocating a new array
+    threaded : bool
+        Class attribute, set True when process spends its time in numpy routines
+        that release the GIL, so worker threads parallelize it without the cost
+        of sending vectors to worker processes, see :py:class:`nmrPype.pipeline.Pipeline`
     """
+    inPlace = False
+    threaded = False
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Function phases defined by subclasses are recorded by the instrumentation
+        """
+        super().__init_subclass__(**kwargs)
+        for phase in PHASES:
+            method = cls.__dict__.get(phase)
+            if isinstance(method, FunctionType) and not hasattr(method, 'phase'):
+                setattr(cls, phase, _instrumented(phase, method))
+
     def __init__(self, params : dict = {}):
         if not params:
             params = {'mp_enable':False,'mp_proc':0,'mp_threads':0}
@@ -51,11 +118,15 @@ class DataFunction:
         try:
             self.initialize(data)
 
+            array = self.inputArray(data)
+
             # Perform fft without multiprocessing
-            if not self.mp[0] or data.array.ndim == 1:
-                data.array = self.process(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
+            if not self.mp[0] or array.ndim == 1:
+                data.array = self.process(array, (data.verb, data.inc, data.getParam('NDLABEL')))
             else:
-                data.array = self.parallelize(data.array, (data.verb, data.inc, data.getParam('NDLABEL')))
+                data.array = self.parallelize(array, (data.verb, data.inc, data.getParam('NDLABEL')))
+
+            self.releaseInput(data, array)
 
             # Update header once processing is complete
             self.updateHeader(data)
@@ -67,11 +138,94 @@ class DataFunction:
         return 0
 
 
+    def __getstate__(self):
+        """
+        Worker processes receive the function without the data frame being processed
+        """
+        state = self.__dict__.copy()
+        state.pop('frame', None)
+        return state
+
+
+    def inputArray(self, data : DataFrame) -> np.ndarray:
+        """
+        Obtain the array to process from the data frame.
+        The array is cast to the processing precision, see :py:mod:`nmrPype.utils.precision`.
+        In-place functions receive a writable copy of read-only arrays, and of any
+        array of a data frame that does not allow reuse,
+        and :py:func:`empty` allocates from the data frame until :py:func:`releaseInput`.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Target data to run function on
+
+        Returns
+        -------
+        ndarray
+            Array to pass to process or parallelize
+        """
+        self.frame = data
+        array = data.array
+        work = toWorkType(array)
+        private = work is not array
+        if private:
+            array = data.own(work)
+            data.array = array
+        # Arrays may still be referenced by the caller unless the frame allows reuse
+        if self.inPlace and isinstance(array, np.ndarray) \
+        and (not array.flags.writeable or not (data.reuse or private)):
+            array = data.own(np.array(array))
+            data.array = array
+        return array
+
+
+    def releaseInput(self, data : DataFrame, array : np.ndarray):
+        """
+        Hand the input array back to the data frame for reuse
+        if the function replaced it with a new array
+
+        Parameters
+        ----------
+        data : DataFrame
+            Target data the function ran on
+
+        array : ndarray
+            Array obtained from :py:func:`inputArray`
+        """
+        self.frame = None
+        if data.array is not array:
+            data.recycle(array)
+
+
+    def empty(self, shape : tuple, dtype) -> np.ndarray:
+        """
+        Allocate an uninitialized output array, reusing a spare buffer
+        of the data frame being processed when available
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the new array
+        dtype : data-type
+            Data type of the new array
+
+        Returns
+        -------
+        ndarray
+            Uninitialized C-contiguous array
+        """
+        frame = getattr(self, 'frame', None)
+        if frame is not None:
+            return frame.empty(shape, dtype)
+        return np.empty(shape, dtype=dtype)
+
+
     def parallelize(self, array : np.ndarray, verb : tuple[int,int, str] = (0,16,'H')) -> np.ndarray:
         """
         The General Multiprocessing implementation for function, utilizing cores and threads. 
-        Parallelize should be overloaded if array_shape changes in processing
-        or process requires more args.
+        Vectors are split into tasks by :py:func:`schedule` and run by :py:func:`mapTasks`.
+        Parallelize should be overloaded if process requires more args.
 
         Parameters
         ----------
@@ -89,40 +243,149 @@ class DataFunction:
         new_array : ndarray
             Updated array after function operation
         """
-        # Save array shape for reshaping later
-        array_shape = array.shape
+        vectors, tasks = self.schedule(array)
 
-        # Split array into manageable chunks
-        chunk_size = int(array_shape[0] / self.mp[1])
+        new_array = self.mapTasks(self.process, vectors, tasks, verb=verb)
 
-        # Assure chunk_size is nonzero
-        chunk_size = array_shape[0] if chunk_size == 0 else chunk_size
-        
-        chunks = [array[i:i+chunk_size] for i in range(0, array_shape[0], chunk_size)]
-
-        chunk_num = len(chunks)
-        # Process each chunk in processing pool
-        args = []
-        for i in range(chunk_num):
-            if i == 0:
-                args.append((chunks[i], verb))
-            else:
-                args.append((chunks[i], verb))
+        # Recombine and reshape data
+        return new_array.reshape(array.shape[:-1] + new_array.shape[-1:])
 
-        if verb[0]:
-            name = "FN" if not hasattr(self,"name") else self.name
-            self.mpPrint(name, chunk_num, (len(chunks[0]), len(chunks[-1])), 'start')
 
-        with Pool(processes=self.mp[1]) as pool:
-            output = pool.starmap(self.process, args, chunksize=chunk_size)
+    def schedule(self, array : np.ndarray) -> tuple[np.ndarray, list[slice]]:
+        """
+        Split the vectors of an array into parallel tasks.
+
+        All axes but the last are flattened, so every dimension contributes vectors.
+        Each task holds about TASK_BYTES of vectors, reduced when needed
+        to give every worker several tasks to balance the load.
+
+        Parameters
+        ----------
+        array : ndarray
+            Target data array to process with function
+
+        Returns
+        -------
+        vectors : ndarray
+            Array as a 2D array of vectors, a view whenever possible
+        tasks : list[slice]
+            Slices of the vectors handled by each task
+        """
+        vectors = array.reshape(-1, array.shape[-1])
+        count = vectors.shape[0]
+        workers = max(1, self.mp[1])
+
+        vectorBytes = max(1, vectors.shape[-1] * vectors.itemsize)
+        size = max(1, TASK_BYTES // vectorBytes)
+        size = max(1, min(size, -(-count // (workers * TASKS_PER_WORKER))))
+
+        return vectors, [slice(i, min(i + size, count)) for i in range(0, count, size)]
+
+
+    def mapTasks(self, func, vectors : np.ndarray, tasks : list[slice],
+                 args : tuple = (), verb : tuple[int,int,str] = (0,16,'H')) -> np.ndarray:
+        """
+        Run func on each task of vectors in parallel and gather the results into one array.
+
+        The remaining tasks are handed to the workers first, then the first task
+        runs in the calling thread and its result sets the output layout.
+        With the thread backend the remaining tasks run on views of the vectors
+        and write their results directly into the shared output array once it is set.
+        With the process backend tasks are handed out one at a time as workers
+        become free, and results are written as they arrive.
+
+        Parameters
+        ----------
+        func : Callable
+            Function called as func(chunk, *args) and returning the processed chunk,
+            the first task also receives verb as its last argument
+        vectors : ndarray
+            2D array of vectors obtained from :py:func:`schedule`
+        tasks : list[slice]
+            Slices of the vectors handled by each task
+        args : tuple
+            Additional arguments passed to func after the chunk
+        verb : tuple[int,int,str], optional
+        Tuple containing elements for verbose print, by default (0, 16,'H')
+            - Verbosity level
+            - Verbosity Increment
+            - Direct Dimension Label
+
+        Returns
+        -------
+        ndarray
+            2D array of processed vectors, the vectors array itself
+            for in-place functions that keep the shape and type
+        """
+        calls = [(vectors[task],) + tuple(args) + ((verb,) if i == 0 else ()) for i, task in enumerate(tasks)]
+        sizes = (tasks[0].stop - tasks[0].start, tasks[-1].stop - tasks[-1].start)
+        name = "FN" if not hasattr(self,"name") else self.name
+        workers = min(max(1, self.mp[1]), len(tasks))
 
         if verb[0]:
-            name = "FN" if not hasattr(self,"name") else self.name
-            self.mpPrint(name, chunk_num, (len(chunks[0]), len(chunks[-1])), 'end')
+            self.mpPrint(name, len(tasks), sizes, 'start')
+
+        # Output array, chosen from the result of the first task
+        output = []
+        ready = threading.Event()
+
+        def store(task : slice, result : np.ndarray):
+            # Results computed on views of the input are already in place
+            new_array = output[0]
+            if not (new_array is vectors and np.may_share_memory(result, vectors)):
+                new_array[task] = result
+
+        def runFirst():
+            try:
+                first = func(*calls[0])
+                # Write results back into the input when the function works in place
+                if self.inPlace and vectors.flags.writeable \
+                and first.shape == vectors[tasks[0]].shape and first.dtype == vectors.dtype:
+                    output.append(vectors)
+                else:
+                    output.append(self.empty((vectors.shape[0],) + first.shape[1:], first.dtype))
+                store(tasks[0], first)
+            finally:
+                ready.set()
+
+        def runTask(i : int):
+            result = func(*calls[i])
+            ready.wait()
+            if output:
+                store(tasks[i], result)
+
+        # The first task runs while the others are in flight
+        if len(tasks) == 1:
+            runFirst()
+        elif self.backend() == 'threads':
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(runTask, i) for i in range(1, len(tasks))]
+                runFirst()
+                for future in futures:
+                    future.result()
+        else:
+            with Pool(processes=workers) as pool:
+                results = pool.imap(_runTask, [(func,) + call for call in calls[1:]], chunksize=1)
+                runFirst()
+                for task, result in zip(tasks[1:], results):
+                    store(task, result)
 
-        # Recombine and reshape data
-        new_array = np.concatenate(output).reshape(array_shape)
-        return new_array
+        if verb[0]:
+            self.mpPrint(name, len(tasks), sizes, 'end')
+
+        return output[0]
+
+
+    def backend(self) -> str:
+        """
+        Parallel backend selected by mp_enable
+
+        Returns
+        -------
+        str
+            'threads' if threads were requested, otherwise 'processes'
+        """
+        return 'threads' if self.mp[0] == 'threads' else 'processes'
     
 
     def process(self, array : np.ndarray, verb : tuple[int,int, str] = (0,16,'H')) -> np.ndarray:
@@ -314,3 +577,6 @@ class DataFunction:
         """
         # Update ndsize here 
         pass
+
+for _phase in PHASES:
+    setattr(DataFunction, _phase, _instrumented(_phase, DataFunction.__dict__[_phase]))
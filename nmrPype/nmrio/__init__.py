@@ -3,7 +3,10 @@ import numpy as np
 from .read import *
 from .write import *
 from .fileiobase import *
-from .ccp4 import load_ccp4_map
+from .ccp4 import load_ccp4_map, load_ccp4_header, write_ccp4_map
+from .compress import read_compressed, write_compressed, available_codecs
+from .chunked import read_chunked, write_chunked
+from .shared import read_shared, write_shared
 import io
 """
 nmrio
@@ -41,7 +44,7 @@ def read_from_file(file : str) -> tuple[dict,np.ndarray]:
     Parameters
     ----------
     file : str
-        NMR data format file to read from
+        NMR data format file to read from, or ccp4 map ending in .map
 
     Returns
     -------
@@ -51,6 +54,9 @@ def read_from_file(file : str) -> tuple[dict,np.ndarray]:
     data : np.ndarray
         NMR data represented by an ndarray
     """
+    if file.endswith('.map'):
+        return load_ccp4_map(file)
+
     dic = {}
     data = None
     try:
@@ -93,11 +99,63 @@ def read_from_buffer(buffer : BufferStream) -> tuple[dict,np.ndarray]:
     return dic, data
 
 
+def read_header_from_file(file : str) -> dict:
+    """
+    Obtain the header object from the input file without reading the data
+
+    Parameters
+    ----------
+    file : str
+        NMR data format file or filemask to read from, or ccp4 map ending in .map
+
+    Returns
+    -------
+    dic : dict
+        Header Dictionary
+    """
+    if file.endswith('.map'):
+        return load_ccp4_header(file)
+
+    dic = {}
+    try:
+        dic = read_header(file)
+    except Exception as e:
+        from ..utils import catchError, FileIOError
+        e.args = (" ".join(str(arg) for arg in e.args),)
+        catchError(e, new_e=FileIOError, msg="Unable to read header from file!", ePrint=False)
+    return dic
+
+
+def read_header_from_buffer(buffer : BufferStream) -> dict:
+    """
+    Obtain the header object from the input buffer,
+    consuming only the header bytes of the stream
+
+    Parameters
+    ----------
+    buffer : BufferStream [io.TextIOWrapper or io.BufferedReader]
+        input buffer to read from
+
+    Returns
+    -------
+    dic : dict
+        Header Dictionary
+    """
+    dic = {}
+    try:
+        dic = read_header(buffer)
+    except Exception as e:
+        from ..utils import catchError, FileIOError
+        e.args = (" ".join(str(arg) for arg in e.args),)
+        catchError(e, new_e=FileIOError, msg="Unable to read header from buffer!", ePrint=False)
+    return dic
+
+
 ######################
 # Writing Operations #
 ######################
 
-def write_to_file(data : DataFrame, output : str, overwrite : bool) -> int:
+def write_to_file(data : DataFrame, output : str, overwrite : bool, codec : str | None = None) -> int:
     """
     Utilizes modified nmrglue code to output the Dataframe to a file
     in a NMR data format.
@@ -107,9 +165,12 @@ def write_to_file(data : DataFrame, output : str, overwrite : bool) -> int:
     data : DataFrame
         DataFrame object to write out
     output : str
-        Output file path represented as string
+        Output file path represented as string, a ccp4 map is written if it ends in .map
     overwrite : bool
         Choose whether or not to overwrite existing files for file output
+    codec : str | None
+        Compression codec for writing a compressed NMRPipe file,
+        uncompressed output is written if None
 
     Returns
     -------
@@ -121,7 +182,18 @@ def write_to_file(data : DataFrame, output : str, overwrite : bool) -> int:
 
     # Write out if possible
     try:
-        write(output, data.getHeader(), data.getArray(), overwrite)
+        from ..utils.instrument import stage, arrayFields
+        if output.endswith('.map'):
+            with stage('write', format='ccp4') as record:
+                write_ccp4_map(output, data.getHeader(), data.getArray(), overwrite)
+                record.update(arrayFields(data.getArray()))
+                record['bytes_written'] = writtenBytes(output, data.getArray())
+            return 0
+
+        with stage('write', format=codec or 'pipe') as record:
+            write(output, data.getHeader(), data.getArray(), overwrite, codec)
+            record.update(arrayFields(data.getArray()))
+            record['bytes_written'] = writtenBytes(output, data.getArray())
     except Exception as e:
         from ..utils import catchError, FileIOError
         catchError(e, new_e=FileIOError, msg="Unable to write to file!")
@@ -129,7 +201,7 @@ def write_to_file(data : DataFrame, output : str, overwrite : bool) -> int:
     return 0
 
 
-def write_to_buffer(data : DataFrame, output : WriteStream, overwrite : bool) -> int:
+def write_to_buffer(data : DataFrame, output : WriteStream, overwrite : bool, shared : bool = False) -> int:
     """
     Utilizes modified nmrglue code to output the Dataframe
     to standard output or standard output buffer
@@ -143,6 +215,9 @@ def write_to_buffer(data : DataFrame, output : WriteStream, overwrite : bool) ->
         Output stream
     overwrite : bool
         Choose whether or not to overwrite existing files for file output
+    shared : bool
+        Hand the data over in shared memory if the output is a pipe or socket,
+        see :py:mod:`nmrPype.nmrio.shared`
 
     Returns
     -------
@@ -152,6 +227,43 @@ def write_to_buffer(data : DataFrame, output : WriteStream, overwrite : bool) ->
     # Increment pipe count when outputting to buffer
     data.updatePipeCount()
 
+    from ..utils.instrument import stage, arrayFields
+    from .shared import can_share
+
+    if shared and can_share(output):
+        with stage('write', format='shm') as record:
+            record['bytes_written'] = write_shared(output, data.getHeader(), data.getArray())
+            record.update(arrayFields(data.getArray()))
+        return 0
+
+    with stage('write', format='stream') as record:
+        writeArrayToBuffer(data, output)
+        record.update(arrayFields(data.getArray()))
+        record['bytes_written'] = writtenBytes(None, data.getArray())
+
+    return 0
+
+def writtenBytes(output : str | None, array) -> int:
+    """
+    Size in bytes of written data, the file size for single output files and
+    otherwise the float32 header and data size
+    """
+    import os
+    if isinstance(output, str) and os.path.isfile(output):
+        return os.path.getsize(output)
+    return 2048 + int(array.size) * (8 if np.iscomplexobj(array) else 4)
+
+def writeArrayToBuffer(data : DataFrame, output : WriteStream):
+    """
+    Writes the header and data of a DataFrame to the output stream
+
+    Parameters
+    ----------
+    data : DataFrame
+        DataFrame object to write out
+    output : WriteStream [io.TextIOWrapper | .BufferedWriter]
+        Output stream
+    """
     # Write to buffer based on number of dimensions
     match data.getArray().ndim:
         case 1:
@@ -192,8 +304,6 @@ def write_to_buffer(data : DataFrame, output : WriteStream, overwrite : bool) ->
                     #     data.setParam("FDDISPMIN", data.getParam("FDMIN"))
                     writeDataToBuffer(output, plane)
 
-    return 0
-
 def writeHeaderToBuffer(output : WriteStream, header : dict):
     from ..utils.fdata import dic2fdata
     """
@@ -246,6 +356,10 @@ def writeDataToBuffer(output : WriteStream, array : np.ndarray):
         if not isinstance(array, np.ndarray):
             array = array[:]
 
+        # Data processed in double precision is stored as float32
+        from ..utils.precision import toFileType
+        array = toFileType(array)
+
         # append imaginary and flatten
         if array.dtype == "complex64":
             array = append_data(array)
@@ -265,5 +379,8 @@ def writeDataToBuffer(output : WriteStream, array : np.ndarray):
         from ..utils import catchError, FileIOError
         catchError(e, new_e=FileIOError, msg="An exception occured when attempting to write data to buffer!")
 
-all.extend(func.__name__ for func in [read_from_file, read_from_buffer, write_to_file, write_to_buffer, load_ccp4_map])
+all.extend(func.__name__ for func in [read_from_file, read_from_buffer,
+                                           read_header_from_file, read_header_from_buffer, write_to_file, write_to_buffer, load_ccp4_map, load_ccp4_header, write_ccp4_map,
+                                           read_compressed, write_compressed, available_codecs,
+                                           read_chunked, write_chunked, read_shared, write_shared])
 __all__ = all
\ No newline at end of file
@@ -1 +1 @@
-from .ccp4 import load_ccp4_map
\ No newline at end of file
+from .ccp4 import load_ccp4_map, load_ccp4_header, read_ccp4_header, write_ccp4_map
\ No newline at end of file
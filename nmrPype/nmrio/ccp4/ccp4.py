@@ -1,13 +1,71 @@
-import gemmi
 from ...utils import catchError
 import numpy as np
-import json
+import copy
 
 FDDIMORDER = [2,1,3,4]
 
+# CCP4/MRC header layout, 256 words followed by NSYMBT bytes of extended header
+CCP4_HEADER_SIZE = 1024
+CCP4_MACHST = 212
+
+# Data types of the CCP4 map modes
+CCP4_MODES = {0 : 'i1', 1 : 'i2', 2 : 'f4', 6 : 'u2', 12 : 'f2'}
+
+def read_ccp4_header(file : str) -> dict:
+    """
+    Reads the main header of a ccp4 map without touching its data
+
+    Parameters
+    ----------
+    file : str
+        .map file path
+
+    Returns
+    -------
+    dict
+        Map header values
+            - shape: data block shape as stored, (sections, rows, columns)
+            - dtype: data type of the map mode in the file byte order
+            - offset: byte offset of the data block
+            - dmin, dmax, dmean: density statistics stored in the header
+    """
+    with open(file, 'rb') as f:
+        raw = f.read(CCP4_HEADER_SIZE)
+    if len(raw) < CCP4_HEADER_SIZE:
+        raise ValueError("File is too short to hold a ccp4 header")
+
+    # Machine stamp gives the byte order, 0x44 little-endian and 0x11 big-endian
+    stamp = raw[CCP4_MACHST]
+    if stamp in (0x44, 0x11):
+        order = '<' if stamp == 0x44 else '>'
+    else:
+        # Older maps leave the stamp empty, pick the byte order giving a known mode
+        order = '<' if int(np.frombuffer(raw, '<i4', 1, 12)[0]) in CCP4_MODES else '>'
+
+    words = np.frombuffer(raw, order + 'i4')
+    floats = np.frombuffer(raw, order + 'f4')
+
+    nc, nr, ns, mode = (int(w) for w in words[:4])
+    if mode not in CCP4_MODES:
+        raise ValueError("Unsupported ccp4 map mode {}".format(mode))
+    if min(nc, nr, ns) < 1:
+        raise ValueError("Invalid ccp4 map size {} x {} x {}".format(nc, nr, ns))
+
+    return {'shape' : (ns, nr, nc),
+            'dtype' : np.dtype(order + CCP4_MODES[mode]),
+            'offset' : CCP4_HEADER_SIZE + int(words[23]),
+            'dmin' : float(floats[19]),
+            'dmax' : float(floats[20]),
+            'dmean' : float(floats[21])}
+
+
 def load_ccp4_map(file : str) -> tuple[dict, np.ndarray]:
     """
-    Loads electron density map into nmrPype format using gemmi
+    Loads electron density map into nmrPype format
+
+    The data block is memory-mapped copy-on-write, so planes are only read from
+    the file as they are used and modifying the array never changes the map.
+    Maps stored in another type than native float32 are converted in memory.
 
     Parameters
     ----------
@@ -19,42 +77,196 @@ def load_ccp4_map(file : str) -> tuple[dict, np.ndarray]:
     dic, map_array : tuple[dict, np.ndarray]
         Returns the dictionary and ndarray to be added to dataframe
     """
-    # Attempt to load ccp4 map but return error otherwise
+    from ...utils.instrument import stage, arrayFields
+
+    with stage('read.data', format='ccp4') as record:
+        # Attempt to load ccp4 map but return error otherwise
+        try:
+            map_header = read_ccp4_header(file)
+            data = np.memmap(file, dtype=map_header['dtype'], mode='c',
+                             offset=map_header['offset'], shape=map_header['shape'])
+        except Exception as e:
+            catchError(e, msg='Failed to read ccp4 map input file!', ePrint=False)
+
+        if data.dtype != np.float32 or not data.dtype.isnative:
+            data = data.astype('float32')
+
+        # Columns vary fastest, index the map by column, row then section
+        map_array = data.T
+        dic = init_ccp4_header(map_array.shape, *ccp4_range(map_header, map_array))
+        record.update(arrayFields(map_array))
+
+    return dic, map_array
+
+
+def load_ccp4_header(file : str) -> dict:
+    """
+    Creates the nmrPype header of a ccp4 map without reading its data
+
+    Parameters
+    ----------
+    file : str
+        .map file path
+
+    Returns
+    -------
+    dict
+        NMR data header matching the ccp4 map data
+    """
     try:
-        ccp4_map = gemmi.read_ccp4_map(file)
+        map_header = read_ccp4_header(file)
     except Exception as e:
-        catchError(e, msg='Failed to read ccp4 map input file!', ePrint=False)
-    
-    map_array = np.array(ccp4_map.grid, copy=False)
-    dic = init_ccp4_header(ccp4_map, map_array)
+        catchError(e, msg='Failed to read ccp4 map header!', ePrint=False)
 
-    return dic, map_array
+    return init_ccp4_header(tuple(reversed(map_header['shape'])), map_header['dmin'], map_header['dmax'])
 
 
-def init_ccp4_header(ccp4_map : gemmi.Ccp4Map, array : np.ndarray) -> dict:
+def write_ccp4_map(file : str, dic : dict, array : np.ndarray, overwrite : bool = False) -> int:
     """
-    Creates a header based in nmrPype format using a ccp4 file
+    Writes data as a ccp4 map, the inverse of :py:func:`load_ccp4_map`
+
+    The real part of the data is written as a float32 map one section at a time,
+    collecting the density statistics on the way, then the header is rewritten
+    with the final statistics. Maps have a voxel size of 1, as nmrPype headers
+    do not keep the map's unit cell.
 
     Parameters
     ----------
-    ccp4_map : Ccp4Map
-        Target ccp4 map data
+    file : str
+        .map file path
+    dic : dict
+        NMR data header, currently unused as the map header follows the array
+    array : ndarray
+        Data indexed by column, row then section, more dimensions are stacked as sections
+    overwrite : bool
+        Overwrite the file if it exists
+
+    Returns
+    -------
+    int
+        Number of bytes written
+    """
+    from ..fileiobase import open_towrite
+
+    # Columns vary fastest in the file, the transpose is indexed by section, row then column
+    data = array.T
+    if data.ndim == 1:
+        data = data[np.newaxis]
+    nr, nc = data.shape[-2:]
+    ns = int(np.prod(data.shape[:-2]))
+
+    dmin, dmax = np.inf, -np.inf
+    total = squares = 0.0
+
+    with open_towrite(file, overwrite=overwrite) as f:
+        # Reserve the header, it is written once the statistics are known
+        f.write(bytes(CCP4_HEADER_SIZE))
+        for index in np.ndindex(data.shape[:-2]):
+            plane = np.ascontiguousarray(data[index].real, dtype='<f4')
+            dmin = min(dmin, float(plane.min()))
+            dmax = max(dmax, float(plane.max()))
+            total += float(plane.sum(dtype='float64'))
+            squares += float(np.square(plane, dtype='float64').sum())
+            f.write(plane.tobytes())
+
+        count = ns * nr * nc
+        dmean = total / count
+        rms = np.sqrt(max(squares / count - dmean**2, 0.0))
+
+        f.seek(0)
+        f.write(ccp4_header((ns, nr, nc), dmin, dmax, dmean, rms))
+
+    return CCP4_HEADER_SIZE + 4 * count
+
+
+def ccp4_header(shape : tuple[int, int, int], dmin : float, dmax : float,
+                dmean : float, rms : float) -> bytes:
+    """
+    Creates a little-endian ccp4 header of a float32 map
+
+    Parameters
+    ----------
+    shape : tuple[int, int, int]
+        Data block shape, (sections, rows, columns)
+    dmin, dmax, dmean, rms : float
+        Density statistics of the map
+
+    Returns
+    -------
+    bytes
+        1024 byte map header
+    """
+    ns, nr, nc = shape
+    words = np.zeros(CCP4_HEADER_SIZE // 4, dtype='<i4')
+    floats = words.view('<f4')
+
+    words[0:4] = nc, nr, ns, 2          # Size and float32 mode
+    words[7:10] = nc, nr, ns            # Sampling along the unit cell
+    floats[10:13] = nc, nr, ns          # Cell lengths with a voxel size of 1
+    floats[13:16] = 90.0                # Cell angles
+    words[16:19] = 1, 2, 3              # Columns, rows and sections along x, y, z
+    floats[19:22] = dmin, dmax, dmean
+    words[22] = 1                       # Space group
+    words[27] = 20140                   # MRC2014 format version
+    floats[54] = rms
+    words[55] = 1                       # Number of labels
+
+    raw = bytearray(words.tobytes())
+    raw[208:212] = b'MAP '
+    raw[CCP4_MACHST:CCP4_MACHST+4] = b'\x44\x44\x00\x00'
+    raw[224:304] = b'nmrPype'.ljust(80)
+    return bytes(raw)
+
+
+def ccp4_range(map_header : dict, array : np.ndarray) -> tuple[float, float]:
+    """
+    Minimum and maximum of the map, taken from the header
+    unless the header marks them as not computed
+
+    Parameters
+    ----------
+    map_header : dict
+        Map header obtained from :py:func:`read_ccp4_header`
     array : ndarray
-        Array generated from ccp4_map grid
+        Map data, scanned only if the header statistics are unusable
+
+    Returns
+    -------
+    tuple[float, float]
+        Minimum and maximum density
+    """
+    dmin, dmax = map_header['dmin'], map_header['dmax']
+    if np.isfinite(dmin) and np.isfinite(dmax) and dmin <= dmax:
+        return dmin, dmax
+    return float(np.min(array)), float(np.max(array))
+
+
+def init_ccp4_header(shape : tuple[int, ...], dmin : float, dmax : float) -> dict:
+    """
+    Creates a header based in nmrPype format using a ccp4 file
+
+    Parameters
+    ----------
+    shape : tuple[int, ...]
+        Shape of the map array, direct dimension last
+    dmin : float
+        Minimum density of the map
+    dmax : float
+        Maximum density of the map
 
     Returns
     -------
     dict
         NMR data header matching the ccp4 map data
     """
-    # initialize header dictionary
-    dic = HEADER_TEMPLATE
+    # initialize a new header dictionary for every map
+    dic = copy.deepcopy(HEADER_TEMPLATE)
 
     # Identify how many dimensions there are
-    dim_count = array.ndim
+    dim_count = len(shape)
 
     for dim in range(1,dim_count+1):
-        size = float(array.shape[-1*dim])
+        size = float(shape[-1*dim])
         # set NDSIZE, APOD, SW to SIZE
         # OBS is default 1
         # CAR is 0
@@ -75,17 +287,14 @@ def init_ccp4_header(ccp4_map : gemmi.Ccp4Map, array : np.ndarray) -> dict:
         dic[ft_flag] = 1 
 
     # Miscellaneous parameters
-    slices = np.prod(array.shape[:-1])
+    slices = int(np.prod(shape[:-1]))
     dic['FDSLICECOUNT'] = slices if slices != 1 else 0
     dic['FDSLICECOUNT1'] = slices if slices != 1 else 0
 
     dic['FDDIMCOUNT'] = float(dim_count)
 
-    dic['FDMAX'] = float(np.max(array))
-    dic['FDMIN'] = float(np.min(array))
-
-    dic['FDMAX'] = float(np.max(array))
-    dic['FDMIN'] = float(np.min(array))
+    dic['FDMAX'] = float(dmax)
+    dic['FDMIN'] = float(dmin)
     
     # Update pipe flag for dim 3 or higher
     if dim_count >= 3:
@@ -0,0 +1,288 @@
+"""
+chunked
+
+Chunked N-D array store for NMR data with random access along any axis.
+
+A store is a directory holding the NMRPipe header and the data array,
+kept in memory layout (complex direct dimension unappended), split into
+regular N-D chunks::
+
+    spectrum.chunks/
+        header.json     header dictionary, shape, dtype, chunk shape, codec
+        0.0.0           chunk files named by their chunk grid index
+        0.0.1
+        ...
+
+Slicing a store only reads the chunks the slice intersects, so planes and
+vectors along indirect dimensions cost about the same as direct ones.
+Chunks are raw little-endian arrays unless a codec from
+:py:mod:`nmrPype.nmrio.compress` is given.
+"""
+
+import numpy as np
+import itertools
+import json
+import os
+import shutil
+from .fileiobase import data_nd
+
+CHUNK_EXT = '.chunks'
+CHUNK_META = 'header.json'
+
+# Target size of a chunk in bytes when the chunk shape is not given
+CHUNK_BYTES = 1024 * 1024
+
+
+def is_chunked(filename) -> bool:
+    """
+    Check whether a path points to a chunked array store
+
+    Parameters
+    ----------
+    filename : str | pathlib.Path
+        Path to check
+
+    Returns
+    -------
+    bool
+        True if the path is a directory holding a chunk store header
+    """
+    if type(filename) is bytes or not isinstance(filename, (str, os.PathLike)):
+        return False
+    return os.path.isfile(os.path.join(filename, CHUNK_META))
+
+
+def default_chunks(shape : tuple, itemsize : int) -> tuple:
+    """
+    Choose a chunk shape of about CHUNK_BYTES with similar extents in
+    every dimension, so no axis is favored when slicing.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of the full array
+    itemsize : int
+        Size in bytes of a single array element
+
+    Returns
+    -------
+    tuple
+        Chunk shape
+    """
+    chunks = [1] * len(shape)
+    points = max(1, CHUNK_BYTES // itemsize)
+    free = list(range(len(shape)))
+    # Grow every unfinished axis evenly, axes shorter than the target side are taken whole
+    while free:
+        side = int(round((points / np.prod([chunks[i] for i in range(len(shape)) if i not in free]))
+                         ** (1 / len(free))))
+        full = [i for i in free if shape[i] <= side]
+        if not full:
+            for i in free:
+                chunks[i] = max(1, side)
+            break
+        for i in full:
+            chunks[i] = shape[i]
+            free.remove(i)
+    return tuple(chunks)
+
+
+def _read_meta(filename) -> dict:
+    with open(os.path.join(filename, CHUNK_META), 'r') as f:
+        return json.load(f)
+
+
+def _chunk_path(filename, index : tuple) -> str:
+    return os.path.join(filename, ".".join(str(i) for i in index))
+
+
+################
+# file reading #
+################
+
+def read_chunked(filename):
+    """
+    Read a chunked array store fully into memory.
+
+    Parameters
+    ----------
+    filename : str | pathlib.Path
+        Path of the chunk store directory
+
+    Returns
+    -------
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : ndarray
+        Array of NMR data.
+    """
+    data = pipe_chunked(filename)
+    dic = data.dic
+    return dic, data.__fgetitem__(tuple(slice(None) for _ in data.fshape))
+
+
+def read_lowmem_chunked(filename):
+    """
+    Read a chunked array store using minimal memory.
+
+    See :py:func:`read_lowmem` for documentation.
+    """
+    data = pipe_chunked(filename)
+    return data.dic, data
+
+
+#####################
+# writing functions #
+#####################
+
+def write_chunked(filename, dic, data, overwrite=False, chunks=None, codec=None):
+    """
+    Write NMR data and its header to a chunked array store.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the chunk store directory to create.
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : array_like
+        Array of NMR data, low memory objects are read chunk by chunk.
+    overwrite : bool, optional.
+        Set True to overwrite an existing store, False will raise an error if
+        the path exists.
+    chunks : tuple, optional
+        Chunk shape, see :py:func:`default_chunks` for the default
+    codec : str, optional
+        Compression codec applied to each chunk, chunks are stored raw if None
+    """
+    shape = tuple(data.shape)
+    dtype = np.dtype(data.dtype).newbyteorder('<')
+    if chunks is None:
+        chunks = default_chunks(shape, dtype.itemsize)
+    chunks = tuple(int(min(max(c, 1), s)) for c, s in zip(chunks, shape))
+    if len(chunks) != len(shape):
+        raise ValueError("chunk shape {} does not match data shape {}".format(chunks, shape))
+
+    compress = None
+    if codec is not None:
+        from .compress import _compressor
+        compress = _compressor(codec, None)
+
+    if os.path.exists(filename):
+        if overwrite is False:
+            raise OSError("File exists, re-call with -overwrite/-ov flag")
+        if is_chunked(filename):
+            shutil.rmtree(filename)
+        else:
+            raise OSError("{} exists and is not a chunk store".format(filename))
+    os.makedirs(filename)
+
+    meta = {'header' : dic,
+            'shape' : list(shape),
+            'dtype' : dtype.str,
+            'chunks' : list(chunks),
+            'codec' : codec}
+    with open(os.path.join(filename, CHUNK_META), 'w') as f:
+        json.dump(meta, f, indent=1, default=float)
+
+    grid = [range(-(-s // c)) for s, c in zip(shape, chunks)]
+    for index in itertools.product(*grid):
+        region = tuple(slice(i * c, min((i + 1) * c, s)) for i, c, s in zip(index, chunks, shape))
+        block = np.asarray(data[region], dtype=dtype)
+        # low memory objects squeeze singleton dimensions
+        block = np.ascontiguousarray(block.reshape([r.stop - r.start for r in region]))
+        if compress is None:
+            block.tofile(_chunk_path(filename, index))
+        else:
+            with open(_chunk_path(filename, index), 'wb') as f:
+                f.write(compress(block))
+
+
+###########
+# Classes #
+###########
+
+class pipe_chunked(data_nd):
+    """
+    Emulate a ndarray objects without loading data into memory for low memory
+    reading of chunked array stores.
+
+    * slicing operations return ndarray objects.
+    * can iterate over with expected results.
+    * transpose and swapaxes methods create a new objects with correct axes
+      ordering.
+    * has ndim, shape, and dtype attributes.
+
+    Only the chunks intersecting a slice are read from disk.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the chunk store directory.
+    order : tuple
+        Ordering of axes against file.
+
+    """
+    def __init__(self, filename, order=None):
+        """
+        Create and set up object
+        """
+        meta = _read_meta(filename)
+
+        self.dic = meta['header']
+        self.fdtype = np.dtype(meta['dtype'])
+        self.chunks = tuple(meta['chunks'])
+        self.codec = meta.get('codec')
+        self.decompress = None
+        if self.codec is not None:
+            from .compress import CODECS, _decompressor
+            self.decompress = _decompressor(CODECS[self.codec])
+
+        # finalize
+        self.filename = filename
+        self.dtype = self.fdtype.newbyteorder('=')
+        self.fshape = tuple(meta['shape'])
+        self.order = tuple(range(len(self.fshape))) if order is None else order
+        self.__setdimandshape__()   # set ndim and shape attributes
+
+    def __fcopy__(self, order):
+        """
+        Create a copy
+        """
+        n = pipe_chunked(self.filename, order)
+        return n
+
+    def __chunk__(self, index : tuple) -> np.ndarray:
+        """
+        Load a single chunk by its chunk grid index
+        """
+        shape = [min(c, s - i * c) for i, c, s in zip(index, self.chunks, self.fshape)]
+        path = _chunk_path(self.filename, index)
+        if self.decompress is None:
+            chunk = np.fromfile(path, dtype=self.fdtype)
+        else:
+            with open(path, 'rb') as f:
+                chunk = np.frombuffer(self.decompress(f.read()), dtype=self.fdtype)
+        return chunk.reshape(shape)
+
+    def __fgetitem__(self, slices):
+        """
+        Return ndarray of selected values
+
+        slices is a well formatted tuple of slices
+        """
+        # selected points and the chunk holding each of them, per dimension
+        points = [np.arange(n)[s] for n, s in zip(self.fshape, slices)]
+        owners = [p // c for p, c in zip(points, self.chunks)]
+
+        # create an empty array to store the selected slice
+        out = np.empty(tuple(len(p) for p in points), dtype=self.dtype)
+        if out.size == 0:
+            return out
+
+        # read each intersecting chunk once and scatter its selected points
+        for index in itertools.product(*[np.unique(o) for o in owners]):
+            dest = [np.nonzero(o == i)[0] for o, i in zip(owners, index)]
+            src = [p[d] - i * c for p, d, i, c in zip(points, dest, index, self.chunks)]
+            out[np.ix_(*dest)] = self.__chunk__(tuple(int(i) for i in index))[np.ix_(*src)]
+        return out
@@ -0,0 +1,405 @@
+"""
+compress
+
+Compressed variant of the single-file NMRPipe format.
+
+The file begins with the regular 2048-byte NMRPipe header so header-only
+tools keep working, followed by a small index and the compressed blocks::
+
+    [ 512 x float32 NMRPipe header ]
+    [ magic | codec | traces per block | trace count | trace length ]
+    [ trace count / traces per block x (offset, nbytes) ]
+    [ compressed block 0 ][ compressed block 1 ] ...
+
+Each block holds a fixed number of traces in the on-disk R|I layout, so
+slices only decompress the blocks they touch. 3D/4D data uses one plane
+per block, 1D/2D data is split into blocks of roughly BLOCK_BYTES.
+"""
+
+import numpy as np
+import struct
+import zlib
+import io
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from .fileiobase import data_nd, open_towrite
+
+# Optional codecs, zlib is always available
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4frame
+except ImportError:
+    lz4frame = None
+
+COMP_MAGIC = b'NMRPZ\x00\x01\x00'
+COMP_INFO = struct.Struct('<8sIIQQ')
+COMP_ENTRY = struct.Struct('<QQ')
+HEADER_BYTES = 2048
+
+# Target uncompressed size of a block when data has no planes
+BLOCK_BYTES = 4 * 1024 * 1024
+
+CODECS = {'zlib' : 0, 'zstd' : 1, 'lz4' : 2}
+
+
+###################
+# Codec Functions #
+###################
+
+def available_codecs() -> list[str]:
+    """
+    Return the names of the compression codecs usable in this environment
+
+    Returns
+    -------
+    list[str]
+        Codec names, zlib is always present
+    """
+    codecs = ['zlib']
+    if zstandard is not None:
+        codecs.append('zstd')
+    if lz4frame is not None:
+        codecs.append('lz4')
+    return codecs
+
+
+def _compressor(codec : str, level : int | None):
+    if codec not in CODECS:
+        raise ValueError("Unknown compression codec '{}', choose from {}".format(codec, list(CODECS)))
+    if codec not in available_codecs():
+        raise ImportError("Compression codec '{}' requires a module that is not installed".format(codec))
+
+    if codec == 'zlib':
+        lvl = 6 if level is None else level
+        return lambda buf: zlib.compress(buf, lvl)
+    if codec == 'zstd':
+        lvl = 3 if level is None else level
+        # Compressor objects are not thread-safe, create one per block
+        return lambda buf: zstandard.ZstdCompressor(level=lvl).compress(buf)
+    lvl = 0 if level is None else level
+    return lambda buf: lz4frame.compress(buf, compression_level=lvl)
+
+
+def _decompressor(codec_id : int):
+    if codec_id == CODECS['zlib']:
+        return zlib.decompress
+    if codec_id == CODECS['zstd']:
+        if zstandard is None:
+            raise ImportError("File is zstd compressed but the zstandard module is not installed")
+        return lambda buf: zstandard.ZstdDecompressor().decompress(buf)
+    if codec_id == CODECS['lz4']:
+        if lz4frame is None:
+            raise ImportError("File is lz4 compressed but the lz4 module is not installed")
+        return lz4frame.decompress
+    raise ValueError("Unknown compression codec id {}".format(codec_id))
+
+
+################
+# file reading #
+################
+
+def is_compressed(filename) -> bool:
+    """
+    Check whether a file or bytes buffer holds compressed NMRPipe data
+
+    Parameters
+    ----------
+    filename : str | pathlib.Path | bytes
+        File path or in-memory data to check for the magic number
+
+    Returns
+    -------
+    bool
+        True if the data following the header starts with the magic number
+    """
+    if type(filename) is bytes:
+        return filename[HEADER_BYTES:HEADER_BYTES + len(COMP_MAGIC)] == COMP_MAGIC
+    try:
+        with open(filename, 'rb') as f:
+            f.seek(HEADER_BYTES)
+            return f.read(len(COMP_MAGIC)) == COMP_MAGIC
+    except (OSError, TypeError, ValueError):
+        return False
+
+
+def _open_source(filename):
+    if type(filename) is bytes:
+        return io.BytesIO(filename)
+    return open(filename, 'rb')
+
+
+def _read_index(fh) -> tuple[int, int, int, int, np.ndarray]:
+    """
+    Read the compression info block and the block index from an open file
+    """
+    fh.seek(HEADER_BYTES)
+    magic, codec_id, block_traces, ntraces, trace_len = COMP_INFO.unpack(fh.read(COMP_INFO.size))
+    if magic != COMP_MAGIC:
+        raise ValueError("File is not a compressed NMRPipe file")
+    nblocks = -(-ntraces // block_traces)
+    index = np.frombuffer(fh.read(COMP_ENTRY.size * nblocks), dtype='<u8').reshape(nblocks, 2)
+    return codec_id, block_traces, ntraces, trace_len, index
+
+
+def _data_dtype(fdata : np.ndarray) -> np.dtype:
+    """
+    Blocks are stored with the byte order of the header
+    """
+    return np.dtype(fdata.dtype)
+
+
+def read_compressed(filename, workers=None):
+    """
+    Read a compressed NMRPipe file into memory.
+
+    Blocks are decompressed in parallel directly into one preallocated
+    array, which is then reshaped and unappended as in :py:func:`read_2D`.
+
+    Parameters
+    ----------
+    filename : str | pathlib.Path | bytes
+        Compressed NMRPipe file or its contents
+    workers : int, optional
+        Number of decompression threads, defaults to the executor default
+
+    Returns
+    -------
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : ndarray
+        Array of NMR data.
+    """
+    from ..utils.fdata import get_fdata, fdata2dic, reshape_data, find_shape, unappend_data
+
+    fdata = get_fdata(filename)
+    dic = fdata2dic(fdata)
+    dtype = _data_dtype(fdata)
+
+    with _open_source(filename) as fh:
+        codec_id, block_traces, ntraces, trace_len, index = _read_index(fh)
+        payloads = []
+        for offset, nbytes in index:
+            fh.seek(int(offset))
+            payloads.append(fh.read(int(nbytes)))
+    decompress = _decompressor(codec_id)
+
+    data = np.empty(ntraces * trace_len, dtype='float32')
+    block_size = block_traces * trace_len
+
+    def load(i):
+        block = np.frombuffer(decompress(payloads[i]), dtype=dtype)
+        data[i * block_size:i * block_size + block.size] = block
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(load, range(len(payloads))))
+
+    data = reshape_data(data, find_shape(dic))
+
+    # unappend imaginary data if needed
+    if dic["FDTRANSPOSED"] == 1 and dic["FDF1QUADFLAG"] != 1:
+        data = unappend_data(data)
+    elif dic["FDTRANSPOSED"] == 0 and dic["FDF2QUADFLAG"] != 1:
+        data = unappend_data(data)
+
+    return (dic, data)
+
+
+def read_lowmem_compressed(filename):
+    """
+    Read a compressed NMRPipe file using minimal memory.
+
+    See :py:func:`read_lowmem` for documentation.
+    """
+    from ..utils.fdata import fdata2dic, get_fdata
+    dic = fdata2dic(get_fdata(filename))
+    if dic["FDDIMCOUNT"] == 1:
+        return read_compressed(filename)    # there is no 1D low memory option
+    return dic, pipe_compressed(filename)
+
+
+#####################
+# writing functions #
+#####################
+
+def write_compressed(filename, dic, data, overwrite=False, codec='zlib', level=None, workers=None):
+    """
+    Write a compressed NMRPipe file to disk.
+
+    Traces are grouped into blocks which are compressed concurrently
+    by a thread pool and written out in order.
+
+    Parameters
+    ----------
+    filename : str
+        Filename of the compressed NMRPipe file to write to.
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : array_like
+        Array of NMR data.
+    overwrite : bool, optional.
+        Set True to overwrite files, False will raise a Warning if file
+        exists.
+    codec : str, optional
+        Compression codec, one of :py:func:`available_codecs`
+    level : int, optional
+        Codec specific compression level
+    workers : int, optional
+        Number of compression threads, defaults to the executor default
+    """
+    from ..utils.fdata import append_data, dic2fdata
+
+    compress = _compressor(codec, level)
+
+    # load all data if the data is not a numpy ndarray
+    if not isinstance(data, np.ndarray):
+        data = data[:]
+
+    traces = data.reshape(-1, data.shape[-1])
+    ntraces = traces.shape[0]
+    trace_len = traces.shape[-1] * (2 if data.dtype == "complex64" else 1)
+
+    # one plane per block for 3D/4D, otherwise split by size
+    if data.ndim >= 3:
+        block_traces = data.shape[-2]
+    else:
+        block_traces = max(1, min(ntraces, BLOCK_BYTES // (4 * trace_len)))
+    nblocks = -(-ntraces // block_traces)
+
+    def pack(i):
+        block = traces[i * block_traces:(i + 1) * block_traces]
+        # append imaginary data in on-disk order
+        if block.dtype == "complex64":
+            block = append_data(block)
+        if block.dtype != 'float32':
+            raise TypeError('data.dtype is not float32')
+        return compress(np.ascontiguousarray(block))
+
+    fdata = dic2fdata(dic)
+    if fdata.dtype != 'float32':
+        raise TypeError('fdata.dtype is not float32')
+
+    index = np.zeros((nblocks, 2), dtype='<u8')
+    f = open_towrite(filename, overwrite=overwrite)
+    try:
+        f.write(fdata.tobytes())
+        f.write(COMP_INFO.pack(COMP_MAGIC, CODECS[codec], block_traces, ntraces, trace_len))
+        index_pos = f.tell()
+        f.write(index.tobytes())    # placeholder until block sizes are known
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for i, payload in enumerate(executor.map(pack, range(nblocks))):
+                index[i] = (f.tell(), len(payload))
+                f.write(payload)
+
+        f.seek(index_pos)
+        f.write(index.tobytes())
+    finally:
+        f.close()
+
+
+###########
+# Classes #
+###########
+
+class pipe_compressed(data_nd):
+    """
+    Emulate a ndarray objects without loading data into memory for low memory
+    reading of compressed NMRPipe files.
+
+    * slicing operations return ndarray objects.
+    * can iterate over with expected results.
+    * transpose and swapaxes methods create a new objects with correct axes
+      ordering.
+    * has ndim, shape, and dtype attributes.
+
+    Only the blocks holding the selected traces are decompressed, the most
+    recently used block is kept so iterating over planes decodes each once.
+
+    Parameters
+    ----------
+    filename : str
+        Filename of compressed NMRPipe file.
+    order : tuple
+        Ordering of axes against file.
+
+    """
+    def __init__(self, filename, order=None):
+        """
+        Create and set up object
+        """
+        from ..utils.fdata import get_fdata, fdata2dic, find_shape
+
+        # read and parse the NMRPipe header
+        fdata = get_fdata(filename)
+        self.fdtype = _data_dtype(fdata)
+        dic = fdata2dic(fdata)
+        fshape = find_shape(dic)
+        fshape = list(fshape) if isinstance(fshape, tuple) else [fshape]
+
+        with open(filename, 'rb') as fh:
+            codec_id, self.block_traces, ntraces, self.trace_len, self.index = _read_index(fh)
+        self.decompress = _decompressor(codec_id)
+        self.cache = (None, None)
+
+        # check last axis quadrature
+        fn = "FDF" + str(int(dic["FDDIMORDER1"]))
+        if dic[fn + "QUADFLAG"] == 1.0:
+            self.cplex = False
+            self.dtype = np.dtype('float32')
+        else:
+            self.cplex = True
+            self.dtype = np.dtype('complex64')
+            fshape[-1] = fshape[-1] // 2
+
+        # finalize
+        self.filename = filename
+        self.order = tuple(range(len(fshape))) if order is None else order
+        self.fshape = tuple(fshape)
+        self.__setdimandshape__()   # set ndim and shape attributes
+
+    def __fcopy__(self, order):
+        """
+        Create a copy
+        """
+        n = pipe_compressed(self.filename, order)
+        return n
+
+    def __block__(self, fh, nblock):
+        """
+        Return the traces of a decompressed block
+        """
+        if self.cache[0] != nblock:
+            offset, nbytes = self.index[nblock]
+            fh.seek(int(offset))
+            block = np.frombuffer(self.decompress(fh.read(int(nbytes))), dtype=self.fdtype)
+            self.cache = (nblock, block.reshape(-1, self.trace_len))
+        return self.cache[1]
+
+    def __fgetitem__(self, slices):
+        """
+        Return ndarray of selected values
+
+        slices is a well formatted tuple of slices
+        """
+        from ..utils.fdata import unappend_data
+
+        # determine which objects should be selected
+        lead = [range(n)[s] for n, s in zip(self.fshape[:-1], slices[:-1])]
+        xch = range(self.fshape[-1])[slices[-1]]
+
+        # create an empty array to store the selected slice
+        out = np.empty(tuple(len(r) for r in lead) + (len(xch),), dtype=self.dtype)
+
+        # read in the data trace by trace, decompressing blocks as needed
+        with open(self.filename, 'rb') as fh:
+            for oi, ti in zip(np.ndindex(*out.shape[:-1]), itertools.product(*lead)):
+                ntrace = int(np.ravel_multi_index(ti, self.fshape[:-1])) if ti else 0
+                nblock = ntrace // self.block_traces
+                trace = self.__block__(fh, nblock)[ntrace - nblock * self.block_traces]
+                if self.cplex:
+                    trace = unappend_data(trace)
+                out[oi] = trace[slices[-1]]
+        return out
@@ -14,6 +14,8 @@ import os
 import string
 import sys
 import itertools
+import threading
+import queue
 from functools import reduce
 import operator
 
@@ -571,6 +573,63 @@ def trace2index_reg(shape, ntrace):
 #
 
 
+# background reading
+
+
+def prefetch_iter(iterable, depth=2):
+    """
+    Iterate over `iterable` while a background thread reads ahead.
+
+    Up to `depth` items are produced ahead of the consumer and held in a
+    bounded queue, so disk reads overlap with processing of the current
+    item while memory use stays capped at depth + 2 items: those queued,
+    the one the reader is waiting to queue and the one being consumed.  Exceptions
+    raised while reading are re-raised in the consumer.  Closing the
+    generator early stops the reader thread.
+    """
+    if depth < 1:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        # give up when the consumer has stopped listening
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def reader():
+        try:
+            for item in iterable:
+                if not put((None, item)):
+                    return
+        except BaseException as e:
+            put((e, None))
+            return
+        put((None, done))
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        while True:
+            error, item = items.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
 class data_nd:
     """
     Base class for building objects which emulate ndarray objects without
@@ -689,6 +748,46 @@ class data_nd:
         for index in range(0, self.shape[0]):
             yield self[index]
 
+    def prefetch(self, depth=2, axis=0, step=1):
+        """
+        Iterate over the object while reading ahead in a background thread.
+
+        Parameters
+        ----------
+        depth : int
+            Maximum number of blocks read ahead of the consumer, 0 reads
+            synchronously
+        axis : int
+            Axis to iterate over, e.g. 0 for the planes of a 3D object
+        step : int
+            Number of indices per block, 1 yields squeezed planes/vectors
+            like iteration, larger values yield blocks of that many with
+            every axis kept, the last block holding the remaining indices
+
+        Returns
+        -------
+        generator
+            Generator of ndarray blocks in index order
+        """
+        axis = axis + self.ndim if axis < 0 else axis
+        if axis >= self.ndim:
+            raise ValueError("invalid axis for this array")
+
+        def blocks():
+            for start in range(0, self.shape[axis], step):
+                key = [slice(None)] * self.ndim
+                if step == 1:
+                    key[axis] = start
+                    yield self[tuple(key)]
+                    continue
+                key[axis] = slice(start, start + step)
+                # slicing squeezes length one axes, blocks keep them
+                shape = list(self.shape)
+                shape[axis] = min(step, self.shape[axis] - start)
+                yield self[tuple(key)].reshape(shape)
+
+        return prefetch_iter(blocks(), depth)
+
     def swapaxes(self, axis1, axis2):
         """
         Return object with `axis1` and `axis2` interchanged.
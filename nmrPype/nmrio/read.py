@@ -5,6 +5,7 @@
 ################
 
 import numpy as np
+import os
 
 ################
 # file reading #
@@ -27,6 +28,12 @@ def read(filename):
     An in memory binary stream (io.BytesIO) or bytes buffer containing an NMRPipe
     dataset can also be read.
 
+    Compressed NMRPipe files (see :py:mod:`nmrPype.nmrio.compress`) are
+    detected by their magic number and decompressed transparently.
+    Chunked array stores (see :py:mod:`nmrPype.nmrio.chunked`) are read
+    when filename is a store directory. Streams referencing data in shared
+    memory (see :py:mod:`nmrPype.nmrio.shared`) are attached to.
+
     Parameters
     ----------
     filename : str | pathlib.Path | bytes | io.BytesIO
@@ -47,11 +54,20 @@ def read(filename):
 
     """
     from ..utils.fdata import get_fdata, fdata2dic
+    from ..utils.instrument import stage
+    from .compress import is_compressed, read_compressed
+    from .chunked import is_chunked, read_chunked
+    from .shared import is_shared, read_shared
+
+    if is_chunked(filename):
+        return _read_stage(read_chunked, filename, format='chunked')
 
     if (type(filename) is bytes):
         filemask = None
     elif hasattr(filename, "read"):
-        filename = filename.read()
+        with stage('read.stream') as record:
+            filename = filename.read()
+            record['bytes_read'] = len(filename)
         filemask = None
     elif hasattr(filename, "read_bytes") and (filename.name.count("%") == 0):
         filemask = None
@@ -66,25 +82,52 @@ def read(filename):
         else:
             filemask = None
 
-    fdata = get_fdata(filename)
-    dic = fdata2dic(fdata)
+    if filemask is None and is_compressed(filename):
+        return _read_stage(read_compressed, filename, format='compressed')
+
+    if filemask is None and is_shared(filename):
+        return _read_stage(read_shared, filename, format='shm')
+
+    with stage('read.header', bytes_read=2048):
+        fdata = get_fdata(filename)
+        dic = fdata2dic(fdata)
     order = dic["FDDIMCOUNT"]
 
     if order == 1:
-        return read_1D(filename)
+        return _read_stage(read_1D, filename)
     if order == 2:
-        return read_2D(filename)
+        return _read_stage(read_2D, filename)
     if dic["FDPIPEFLAG"] != 0:  # open streams
-        return read_stream(filename)
+        return _read_stage(read_stream, filename)
     if filemask is None:     # if no filemask open as 2D
-        return read_2D(filename)
+        return _read_stage(read_2D, filename)
     if order == 3:
-        return read_3D(filemask)
+        return _read_stage(read_3D, filemask)
     if order == 4:
-        return read_4D(filemask)
+        return _read_stage(read_4D, filemask)
     raise ValueError('unknown dimensionality: %s' % order)
 
 
+def _read_stage(reader, filename, **fields):
+    """
+    Call a reader as the data read stage of the instrumentation,
+    see :py:mod:`nmrPype.utils.instrument`
+    """
+    from ..utils.instrument import stage, arrayFields
+
+    with stage('read.data', **fields) as record:
+        dic, data = reader(filename)
+        record.update(arrayFields(data))
+        if type(filename) is bytes:
+            record['bytes_read'] = len(filename)
+        elif isinstance(filename, str) and os.path.isfile(filename):
+            record['bytes_read'] = os.path.getsize(filename)
+        else:
+            # Multi-file data sets, stored as float32
+            record['bytes_read'] = int(data.size) * (8 if np.iscomplexobj(data) else 4)
+    return dic, data
+
+
 def read_lowmem(filename):
     """
     Read a NMRPipe file with minimal memory usage.
@@ -105,6 +148,11 @@ def read_lowmem(filename):
 
     """
     from ..utils.fdata import get_fdata, fdata2dic
+    from .compress import is_compressed, read_lowmem_compressed
+    from .chunked import is_chunked, read_lowmem_chunked
+
+    if is_chunked(filename):
+        return read_lowmem_chunked(filename)
 
     if filename.count("%") == 1:
         filemask = filename
@@ -115,6 +163,9 @@ def read_lowmem(filename):
     else:
         filemask = None
 
+    if filemask is None and is_compressed(filename):
+        return read_lowmem_compressed(filename)
+
     fdata = get_fdata(filename)
     dic = fdata2dic(fdata)
     order = dic["FDDIMCOUNT"]
@@ -135,6 +186,57 @@ def read_lowmem(filename):
     raise ValueError('unknown dimensionality: %s' % order)
 
 
+def read_header(filename):
+    """
+    Read only the header of a NMRPipe file.
+
+    Only the first 2048 bytes are read and decoded, the data itself is never
+    loaded. For filemasks of multi-file 3D/4D data sets only the first plane
+    file is inspected. Compressed NMRPipe files and chunked array stores are
+    supported as well. The shared-memory file of a stream handed over with
+    -shm is removed, see :py:mod:`nmrPype.nmrio.shared`.
+
+    Parameters
+    ----------
+    filename : str | pathlib.Path | bytes | io.BytesIO
+        Filename or filemask of NMRPipe file(s), binary stream or bytes buffer
+
+    Returns
+    -------
+    dic : dict
+        Dictionary of NMRPipe parameters.
+
+    See Also
+    --------
+    read : Read NMRPipe files.
+
+    """
+    from ..utils.fdata import get_fdata, fdata2dic
+    from .chunked import is_chunked, _read_meta
+    from .shared import release_shared
+
+    if is_chunked(filename):
+        return _read_meta(filename)['header']
+
+    if (type(filename) is bytes):
+        # Data handed over in shared memory is not read
+        release_shared(filename)
+    elif hasattr(filename, "read"):
+        stream = filename
+        filename = stream.read(2048)
+        release_shared(stream)
+    elif hasattr(filename, "read_bytes") and (filename.name.count("%") == 0):
+        pass
+    else:
+        filename = str(filename)
+        if filename.count("%") == 1:
+            filename = filename % 1
+        elif filename.count("%") == 2:
+            filename = filename % (1, 1)
+
+    return fdata2dic(get_fdata(filename))
+
+
 # dimension specific reading
 def read_1D(filename):
     """
@@ -151,6 +253,8 @@ def read_1D(filename):
     # unappend imaginary data if needed
     if dic["FDF2QUADFLAG"] != 1:
         data = unappend_data(data)
+    else:
+        data = data.astype('float32', copy=False)   # only copies foreign-endian data
 
     return (dic, data)
 
@@ -172,6 +276,8 @@ def read_2D(filename):
         data = unappend_data(data)
     elif dic["FDTRANSPOSED"] == 0 and dic["FDF2QUADFLAG"] != 1:
         data = unappend_data(data)
+    else:
+        data = data.astype('float32', copy=False)   # only copies foreign-endian data
 
     return (dic, data)
 
@@ -0,0 +1,276 @@
+"""
+shared
+
+Shared-memory handoff of data between nmrPype processes connected by a pipe.
+
+Instead of the data, the stream carries the regular 2048-byte NMRPipe header
+followed by a reference to a file in shared memory holding the array::
+
+    [ 512 x float32 NMRPipe header ]
+    [ magic | reference length ][ JSON reference: path, dtype, shape ]
+
+The reading process memory-maps the file and unlinks it, so the data is
+copied once by the writing process and never passes through the pipe.
+Reading only the header, see :py:func:`nmrPype.nmrio.read.read_header`,
+unlinks the file as well.
+
+Files are named after the process writing them. Files left behind by a
+reader that never consumed its input, such as a stage reading another input
+file or failing on its arguments, are removed by the next process handing
+data over once their writer has exited and they are older than SHM_ORPHAN_AGE.
+
+Only nmrPype understands the reference. Programs other than nmrPype reading
+the stream (e.g. NMRPipe or head) see the header followed by the reference
+instead of the data, and their files are only removed by that cleanup, so the
+handoff should only be used when the next stage of the pipeline is nmrPype.
+"""
+
+import json
+import os
+import re
+import stat
+import struct
+import tempfile
+import time
+import numpy as np
+
+SHM_MAGIC = b'NMRPSHM\x01'
+SHM_INFO = struct.Struct('<8sI')
+HEADER_BYTES = 2048
+
+# Largest reference accepted, anything longer is regular data
+SHM_MAX_REFERENCE = 4096
+
+# Shared-memory file system, a temporary directory is used where it is unavailable
+SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+SHM_PREFIX = 'nmrPype-'
+
+# Shared-memory file names, with the process id of the writer
+SHM_NAME = re.compile(re.escape(SHM_PREFIX) + r'(\d+)-[^/]+$')
+
+# Seconds before an unread file of an exited writer is removed
+SHM_ORPHAN_AGE = 60.0
+
+
+def is_shared(buffer) -> bool:
+    """
+    Check whether a stream read into bytes holds a shared-memory reference
+
+    Parameters
+    ----------
+    buffer : bytes
+        Stream contents
+
+    Returns
+    -------
+    bool
+        True if the header is followed by a shared-memory reference
+    """
+    if type(buffer) is not bytes or len(buffer) < HEADER_BYTES + SHM_INFO.size:
+        return False
+    magic, length = SHM_INFO.unpack_from(buffer, HEADER_BYTES)
+    return magic == SHM_MAGIC and len(buffer) == HEADER_BYTES + SHM_INFO.size + length \
+        and length <= SHM_MAX_REFERENCE
+
+
+def can_share(output) -> bool:
+    """
+    Check whether an output stream can carry a shared-memory reference,
+    only pipes and sockets lead to another process
+
+    Parameters
+    ----------
+    output : WriteStream
+        Output stream
+
+    Returns
+    -------
+    bool
+        True if the stream is a pipe or a socket
+    """
+    try:
+        mode = os.fstat(output.fileno()).st_mode
+    except (AttributeError, OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+def read_shared(buffer : bytes) -> tuple[dict, np.ndarray]:
+    """
+    Read the header from a stream and attach to the data it references
+
+    The shared-memory file is unlinked once mapped, the mapping stays valid
+    for as long as the array is alive.
+
+    Parameters
+    ----------
+    buffer : bytes
+        Stream contents, see :py:func:`is_shared`
+
+    Returns
+    -------
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : ndarray
+        Array of NMR data, mapped from shared memory
+    """
+    from ..utils.fdata import get_fdata, fdata2dic
+
+    dic = fdata2dic(get_fdata(buffer[:HEADER_BYTES]))
+    _, length = SHM_INFO.unpack_from(buffer, HEADER_BYTES)
+    start = HEADER_BYTES + SHM_INFO.size
+    reference = json.loads(buffer[start:start + length])
+
+    path = shared_path(reference)
+    try:
+        data = np.memmap(path, dtype=np.dtype(reference['dtype']), mode='r+',
+                         shape=tuple(reference['shape']))
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    return dic, data
+
+
+def release_shared(stream) -> bool:
+    """
+    Remove the shared-memory file referenced after a header that was read on its own
+
+    Parameters
+    ----------
+    stream : bytes | ReadStream
+        Stream contents, or a stream positioned right after the header
+
+    Returns
+    -------
+    bool
+        True if the header was followed by a shared-memory reference
+    """
+    if type(stream) is bytes:
+        if not is_shared(stream):
+            return False
+        _, length = SHM_INFO.unpack_from(stream, HEADER_BYTES)
+        start = HEADER_BYTES + SHM_INFO.size
+        reference = stream[start:start + length]
+    else:
+        # Look ahead without consuming regular data
+        peek = getattr(stream, 'peek', None)
+        if peek is None:
+            return False
+        info = peek(SHM_INFO.size)[:SHM_INFO.size]
+        if len(info) < SHM_INFO.size:
+            return False
+        magic, length = SHM_INFO.unpack(info)
+        if magic != SHM_MAGIC or length > SHM_MAX_REFERENCE:
+            return False
+        reference = stream.read(SHM_INFO.size + length)[SHM_INFO.size:]
+
+    try:
+        os.unlink(shared_path(json.loads(reference)))
+    except (ValueError, KeyError, OSError):
+        pass
+    return True
+
+
+def shared_path(reference : dict) -> str:
+    """
+    Path of the file of a shared-memory reference,
+    only files written by nmrPype in the shared-memory directory are accepted
+    """
+    path = reference['path']
+    directory, name = os.path.split(path)
+    if os.path.realpath(directory) != os.path.realpath(SHM_DIR) or not SHM_NAME.match(name):
+        raise ValueError("Shared-memory reference outside of {}: {}".format(SHM_DIR, path))
+    return path
+
+
+def remove_orphans(age : float = SHM_ORPHAN_AGE) -> int:
+    """
+    Remove shared-memory files that were never read,
+    whose writer has exited and which are older than age seconds
+
+    Returns
+    -------
+    int
+        Number of files removed
+    """
+    removed = 0
+    now = time.time()
+    try:
+        names = os.listdir(SHM_DIR)
+    except OSError:
+        return 0
+    for name in names:
+        match = SHM_NAME.match(name)
+        if match is None:
+            continue
+        pid = int(match.group(1))
+        if pid == os.getpid() or writer_alive(pid):
+            continue
+        path = os.path.join(SHM_DIR, name)
+        try:
+            if now - os.stat(path).st_mtime > age:
+                os.unlink(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def writer_alive(pid : int) -> bool:
+    """
+    Check whether the process that wrote a shared-memory file still exists
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def write_shared(output, dic : dict, data : np.ndarray) -> int:
+    """
+    Copy data to shared memory and write the header and a reference to it to a stream
+
+    Parameters
+    ----------
+    output : WriteStream
+        Output stream leading to another nmrPype process
+    dic : dict
+        Dictionary of NMRPipe parameters.
+    data : ndarray
+        Array of NMR data
+
+    Returns
+    -------
+    int
+        Number of bytes written to the stream
+    """
+    from ..utils.fdata import dic2fdata
+    from ..utils.precision import toFileType
+
+    # Data processed in double precision is handed over in single precision like in files
+    data = toFileType(data)
+
+    remove_orphans()
+
+    fd, path = tempfile.mkstemp(prefix='{}{}-'.format(SHM_PREFIX, os.getpid()), dir=SHM_DIR)
+    try:
+        os.ftruncate(fd, max(data.nbytes, 1))
+        shared = np.memmap(path, dtype=data.dtype, mode='r+', shape=data.shape)
+        shared[...] = data
+        del shared
+
+        reference = json.dumps({'path' : path, 'dtype' : data.dtype.str, 'shape' : list(data.shape)}).encode()
+        stream = dic2fdata(dic).astype('float32').tobytes() + SHM_INFO.pack(SHM_MAGIC, len(reference)) + reference
+        output.write(stream)
+    except BaseException:
+        # Nobody will attach to the data
+        os.unlink(path)
+        raise
+    finally:
+        os.close(fd)
+    return len(stream)
@@ -12,7 +12,7 @@ from . import fileiobase
 #####################
 
 
-def write(filename, dic, data, overwrite=False):
+def write(filename, dic, data, overwrite=False, codec=None):
     """
     Write a NMRPipe file to disk.
 
@@ -27,6 +27,10 @@ def write(filename, dic, data, overwrite=False):
     overwrite : bool, optional.
         Set True to overwrite files, False will raise a Warning if file
         exists.
+    codec : str, optional
+        Compression codec, writes a single compressed NMRPipe file when set,
+        the filename may not have a '%' formatter.
+        See :py:func:`nmrPype.nmrio.compress.write_compressed`.
 
     Notes
     -----
@@ -42,6 +46,11 @@ def write(filename, dic, data, overwrite=False):
     that this value is 0.0 for standard non-data stream files, and 1.0 for data
     stream files or an file may be written with an incorrect header.
 
+    Filenames ending in '.chunks' are written as a chunked array store
+    directory, see :py:func:`nmrPype.nmrio.chunked.write_chunked`.
+
+    Double precision data is converted to float32 before writing.
+
     Set overwrite to True to overwrite files that exist.
 
     See Also
@@ -50,10 +59,25 @@ def write(filename, dic, data, overwrite=False):
     read : Read NMRPipe files.
 
     """
+    from .chunked import CHUNK_EXT, write_chunked
+    from ..utils.precision import toFileType
+
+    # Data processed in double precision is stored as float32
+    data = toFileType(data)
+
+    if str(filename).endswith(CHUNK_EXT):
+        return write_chunked(filename, dic, data, overwrite, codec=codec)
+
     # load all data if the data is not a numpy ndarray
     if not isinstance(data, np.ndarray):
         data = data[:]
 
+    if codec is not None:
+        if filename.count("%") != 0:
+            raise ValueError("Compressed data is written to a single file, "
+                             "remove the '%' formatter from {0}".format(filename))
+        from .compress import write_compressed
+        return write_compressed(filename, dic, data, overwrite, codec)
     if filename.count("%") == 0:
         return write_single(filename, dic, data, overwrite)
     elif data.ndim == 3:
@@ -150,6 +174,9 @@ def write_lowmem(filename, dic, data, overwrite=False):
     read_lowmem : Read a NMRPipe file using minimal memory.
 
     """
+    from .chunked import CHUNK_EXT, write_chunked
+    if str(filename).endswith(CHUNK_EXT):
+        return write_chunked(filename, dic, data, overwrite)
     if data.ndim == 1:
         return write_single(filename, dic, data, overwrite)
     if data.ndim == 2:
@@ -1,3 +1,3 @@
-from .parser import parser
+from .parser import parser, buildParser
 
-__all__ = ['parser']
\ No newline at end of file
+__all__ = ['parser', 'buildParser']
\ No newline at end of file
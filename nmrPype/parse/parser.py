@@ -1,9 +1,17 @@
-from ..fn import __dict__ as fn_dict
-from argparse import ArgumentParser
+from ..fn import fn_list
+from argparse import ArgumentParser, SUPPRESS
 from argparse import Namespace
-from sys import stdin,stdout, stderr
+from functools import lru_cache
+from sys import stderr
+import sys
 import os
 
+# Switches preceding the function code
+FUNCTION_SWITCHES = ('-fn', '--function')
+
+# Switches asking for the help message, which lists every function
+HELP_SWITCHES = ('-help', '-h', '--help')
+
 class Container(Namespace):
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -14,6 +22,10 @@ def parser(input_args : list[str]) -> Namespace:
     Takes arguments defined within functions as well to allow for
     easier integration of custom functions.
 
+    Only the arguments of the function following -fn are added to the parser,
+    and parsers are cached so repeated calls do not rebuild them.
+    Input and output default to the standard streams at the time of the call.
+
     Parameters
     ----------
     input_args : list[str]
@@ -25,79 +37,153 @@ def parser(input_args : list[str]) -> Namespace:
         argparse Namespace object which has attributes and values
         properly handled to use in processing
     """
-    # Common Operations 
+    input_args = list(input_args)
+    args, unknown = buildParser(functionCode(input_args)).parse_known_args(input_args, namespace=Container())
+
+    if unknown:
+        print("WARNING! Unknown Arguments:", *unknown, file=stderr)
+
+    # Resolve the standard streams now, they may have been replaced since the parser was built
+    if args.input is None:
+        args.input = sys.stdin.buffer if hasattr(sys.stdin, 'buffer') else sys.stdin
+    if args.output is None:
+        args.output = sys.stdout.buffer if hasattr(sys.stdout, 'buffer') else sys.stdout
+
+    return args
+
+
+def functionCode(input_args : list[str]) -> str:
+    """
+    Function code requested by the arguments
+
+    Parameters
+    ----------
+    input_args : list[str]
+        List of arguments from the command-line
+
+    Returns
+    -------
+    str
+        Function code following -fn if it is a known function,
+        '*' if every function is needed for help or error messages,
+        or an empty string if no function is requested
+    """
+    if any(arg in HELP_SWITCHES for arg in input_args):
+        return '*'
+    for i, arg in enumerate(input_args):
+        if arg in FUNCTION_SWITCHES:
+            code = input_args[i+1] if i + 1 < len(input_args) else ''
+            return code if code in fn_list else '*'
+    return ''
+
+
+@lru_cache(maxsize=None)
+def buildParser(code : str = '*') -> ArgumentParser:
+    """
+    Build the argument parser of a function
+
+    Parameters
+    ----------
+    code : str
+        Function code to add the arguments of, '*' for every function
+        or an empty string for none
+
+    Returns
+    -------
+    ArgumentParser
+        Parser of the common arguments and the function's subparser
+    """
+    parser = ArgumentParser(prog='nmrPype', parents=[commonParser()], description='Handle NMR Data inputted through file or pipeline \
+                                and perform desired operations for output',
+                        usage='nmrPype -in inFile -fn fnName') # -out outFile -ov
+
+    # Add subparsers for the requested functions
+    subparser = parser.add_subparsers(title='Function Commands', dest='fc')
+
+    # Common arguments repeated after the function only replace values given before it
+    parent_parser = commonParser(suppress=True)
+
+    if code == '*':
+        functions = {fn_list[name] : name for name in fn_list}
+    elif code:
+        functions = {fn_list[code] : code}
+    else:
+        functions = {}
+
+    # Arguments may be declared by a parent class for all of its subclasses
+    declared = set()
+    for fn, name in functions.items():
+        if name in ('NULL', 'function') and 'null' not in declared:
+            fn.nullDeclare(subparser, parent_parser)
+            declared.add('null')
+        for cls in fn.__mro__:
+            clArgs = vars(cls).get('clArgs')
+            if clArgs is not None and clArgs not in declared:
+                clArgs.__func__(subparser, parent_parser)
+                declared.add(clArgs)
+
+    return parser
+
+
+@lru_cache(maxsize=None)
+def commonParser(suppress : bool = False) -> ArgumentParser:
+    """
+    Parent parser of the arguments common to every function
+
+    Parameters
+    ----------
+    suppress : bool
+        Leave arguments that are not given unset instead of setting their defaults
+
+    Returns
+    -------
+    ArgumentParser
+        Parent parser
+    """
+    default = lambda value : SUPPRESS if suppress else value
+
+    # Common Operations
     parent_parser = ArgumentParser(add_help=False)
-    parent_parser.add_argument('-in', '--input', nargs='?', metavar='inName', 
-                        help='NMRPipe format input file name', default=stdin.buffer)
-    parent_parser.add_argument('-mod', '--modify', nargs=2, metavar=('Param', 'Value'))
-    parent_parser.add_argument('-fn','--function', dest='rf', action='store_true',
+    parent_parser.add_argument('-in', '--input', nargs='?', metavar='inName',
+                        help='NMRPipe format input file name', default=default(None))
+    parent_parser.add_argument('-mod', '--modify', nargs=2, metavar=('Param', 'Value'), default=default(None))
+    parent_parser.add_argument('-header', '--header-only', action='store_true', dest='hdr', default=default(False),
+                        help='Print the input header and exit without reading the data')
+    parent_parser.add_argument('-fn','--function', dest='rf', action='store_true', default=default(False),
                         help='Read for inputted function')
     parent_parser.add_argument('-help', action='help', help='Use the -fn fnName switch for more')
-    parent_parser.add_argument('-verb', '--verbose', metavar='[0]', type=int, const=1, default=0, nargs='?', dest='verb',
+    parent_parser.add_argument('-verb', '--verbose', metavar='[0]', type=int, const=1, default=default(0), nargs='?', dest='verb',
                         help='Debug verbose level')
-    parent_parser.add_argument('-inc','--increment', metavar='[16]', type=int, default=16, dest='inc',
+    parent_parser.add_argument('-inc','--increment', metavar='[16]', type=int, default=default(16), dest='inc',
                         help='Verbose loop print increment')
+    parent_parser.add_argument('-double', '--double-precision', action='store_true', dest='double', default=default(False),
+                        help='Process data in double precision, output remains float32')
+    parent_parser.add_argument('-prof', '--profile', nargs='?', metavar='reportFile', const='-', default=default(None), dest='prof',
+                        help='Report per-stage timing and memory as JSON to a file [stderr]')
     # Add parsers for multiprocessing
-    parent_parser.add_argument('-mp', '--multi-processing', action='store_const', dest='mp_enable', const=True,
-                                default=False, help='Enable Multiprocessing')
+    parent_parser.add_argument('-mp', '--multi-processing', nargs='?', metavar='backend', dest='mp_enable',
+                                const='processes', default=default(False), choices=['threads', 'processes'],
+                                help='Enable Multiprocessing, with worker threads or processes [processes]')
     parent_parser.add_argument('-nomp', '--no-multi-processing', action='store_const', dest='mp_enable', const=False,
-                                help='Disable Multiprocessing')
-    parent_parser.add_argument('-proc', '--processors', nargs='?', metavar='#', type=int, 
-                            default=os.cpu_count(), dest='mp_proc',
+                                default=default(False), help='Disable Multiprocessing')
+    parent_parser.add_argument('-proc', '--processors', nargs='?', metavar='#', type=int,
+                            default=default(os.cpu_count()), dest='mp_proc',
                             help='Number of processors to use for multiprocessing')
     parent_parser.add_argument('-t', '--threads', nargs='?', metavar='#', type=int,
-                            default=min(os.cpu_count(),4), dest='mp_threads', 
+                            default=default(min(os.cpu_count(),4)), dest='mp_threads',
                             help='Number of threads per process to use for multiprocessing')
-    
+
     # Add file output params
-    parent_parser.add_argument('-di', '--delete-imaginary', action='store_true', dest='di',
+    parent_parser.add_argument('-di', '--delete-imaginary', action='store_true', dest='di', default=default(False),
                         help='Remove imaginary elements from dataset')
-    parent_parser.add_argument('-out', '--output', nargs='?', metavar='outName',
-                        default=(stdout.buffer if hasattr(stdout,'buffer') else stdout),
-                        help='NMRPipe format output file name')
-    parent_parser.add_argument('-ov', '--overwrite', action='store_true', 
+    parent_parser.add_argument('-out', '--output', nargs='?', metavar='outName', default=default(None),
+                        help='NMRPipe format output file name, or ccp4 map ending in .map [stdout]')
+    parent_parser.add_argument('-ov', '--overwrite', action='store_true', default=default(False),
                         help='Call this argument to overwrite when sending output to file')
+    parent_parser.add_argument('-comp', '--compress', nargs='?', metavar='codec', const='zlib', default=default(None),
+                        choices=['zlib', 'zstd', 'lz4'], dest='comp',
+                        help='Write output file as compressed NMRPipe data, not applied to stdout [zlib]')
+    parent_parser.add_argument('-shm', '--shared-memory', action='store_true', dest='shm', default=default(False),
+                        help='Hand data to the next nmrPype stage in shared memory instead of the pipe')
 
-    parser = ArgumentParser(prog='nmrPype', parents=[parent_parser], description='Handle NMR Data inputted through file or pipeline \
-                                and perform desired operations for output',
-                        usage='nmrPype -in inFile -fn fnName') # -out outFile -ov
-    
-    # Add subparsers for each function available
-    subparser = parser.add_subparsers(title='Function Commands', dest='fc')
-
-    # Gather list of functions
-    fn_list = dict([(name, cls) for name, cls in fn_dict.items() if isinstance(cls, type)])
-
-    for fn in fn_list.values():
-        if hasattr(fn, 'clArgs'):
-            fn.clArgs(subparser, parent_parser)
-    
-    fn_list['DataFunction'].nullDeclare(subparser, parent_parser)
-    
-    empty_container = Container()
-    initial_container = Container()
-    container = Container()
-
-    input_args = " ".join(input_args).split(" -fn ")
-
-    general_args = input_args[0].split(" ")
-
-    parser.parse_known_args(args=[], namespace=empty_container)
-    _, unknown = parser.parse_known_args(args=general_args, namespace=initial_container)
-
-    if len(input_args) == 1:
-        return initial_container
-    if len(input_args) == 2:
-        fn_args = " ".join(["-fn",*input_args[1].split(" ")]).split(" ")
-        _, fn_unknown = parser.parse_known_args(args=fn_args, namespace=container)
-
-    if unknown or fn_unknown:
-        print("WARNING! Unknown Arguments:", *unknown, *fn_unknown, file=stderr)
-
-    for attribute in vars(empty_container):
-        # Check if the attribute has been changed from default in the initial container
-        if ((getattr(container,attribute) != getattr(initial_container,attribute)) and
-            (getattr(container,attribute) == getattr(empty_container,attribute))):
-            setattr(container,attribute, getattr(initial_container,attribute))
-
-    return container
+    return parent_parser
@@ -0,0 +1,348 @@
+"""
+pipeline
+
+Builder of processing pipelines for scripts and notebooks.
+
+Functions are recorded by calling methods named after their function codes,
+with their arguments given without the function prefix, and are checked
+against the function's parameters as they are added. Nothing is processed
+until :py:meth:`Pipeline.run`, which fuses functions that can run in a single
+pass, runs every function on the same data frame so replaced arrays are reused
+as output buffers, and picks serial, threaded or process parallelism per function.
+
+Usage::
+
+    from nmrPype import Pipeline
+
+    df = Pipeline("h.fid").sp(off=0.5, end=0.98, pow=2, c=0.5).zf(auto=True) \\
+                          .ft().ps(p0=43, p1=0).di().tp().run()
+"""
+
+import copy
+import inspect
+import numbers
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .utils import DataFrame, catchError, FunctionError, FileIOError
+
+# Parallelism of a function, auto picks one from the data and the function
+PARALLEL = ('auto', 'serial', 'threads', 'processes')
+
+# Smallest array in bytes processed in parallel by auto, below it starting workers costs more than it saves
+PARALLEL_BYTES = 8 * 1024 * 1024
+
+# Value types accepted for each annotated parameter type,
+# whole numbers are accepted for integers as the command-line reads some as floats
+KINDS = {bool : (bool, np.bool_),
+         int : (numbers.Real,),
+         float : (numbers.Real,),
+         str : (str,)}
+
+
+@lru_cache(maxsize=None)
+def parameters(cls : type) -> dict[str, inspect.Parameter]:
+    """
+    Arguments of a function class accepted by the pipeline,
+    every argument except the multiprocessing settings
+
+    Parameters
+    ----------
+    cls : type
+        Function class
+
+    Returns
+    -------
+    dict[str, inspect.Parameter]
+        Parameters by argument name (e.g. sp_off)
+    """
+    return {name : param for name, param in inspect.signature(cls).parameters.items()
+            if not name.startswith('mp_') and name != 'params'
+            and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)}
+
+
+def shortName(name : str) -> str:
+    """
+    Argument name without the function prefix (e.g. off for sp_off)
+    """
+    return name.split('_', 1)[-1]
+
+
+class Pipeline:
+    """
+    Sequence of functions to run on NMR data, built one function at a time.
+
+    Every function code is available as a lowercase method taking the function's
+    arguments by name, with or without the function prefix (e.g. ``sp(off=0.5)``
+    or ``sp(sp_off=0.5)``), and an optional ``parallel`` choice for that function.
+    Methods return a new pipeline, so a pipeline may be extended in several ways.
+
+    Parameters
+    ----------
+    source : DataFrame | str | None
+        Data frame to process in place, or file to read when the pipeline is run,
+        None for a pipeline given its source later with :py:meth:`withSource`
+    fuse : bool
+        Fuse functions that can be run in a single pass, see :py:class:`nmrPype.fn.SPFT`
+    parallel : str
+        Parallelism of every function unless chosen per function,
+        'serial', 'threads', 'processes' or 'auto' to choose from the data
+        size and whether the function runs well in threads
+    processors : int | None
+        Number of workers for parallel functions, by default the number of processors
+    """
+    def __init__(self, source : DataFrame | str | None, fuse : bool = True,
+                 parallel : str = 'auto', processors : int | None = None):
+        self.source = source
+        self.fuse = fuse
+        self.parallel = self.checkParallel(parallel)
+        self.processors = max(1, processors or os.cpu_count() or 1)
+        self.stages = []
+
+
+    def __getattr__(self, name : str):
+        """
+        Builder method of the function with the code name
+        """
+        from .fn import fn_list
+
+        if name.startswith('_') or name.upper() not in fn_list:
+            raise AttributeError("{!r} object has no attribute {!r}".format(type(self).__name__, name))
+
+        def builder(parallel : str | None = None, **arguments) -> 'Pipeline':
+            return self.add(name.upper(), parallel, **arguments)
+        builder.__name__ = name
+        return builder
+
+
+    def __repr__(self) -> str:
+        """
+        Printable string describing the pipeline, with the source and every function
+        """
+        source = self.source if isinstance(self.source, str) else str(self.source)
+        stages = [source]
+        for code, arguments, parallel in self.stages:
+            words = [code] + ["{}={!r}".format(shortName(name), value) for name, value in arguments.items()]
+            if parallel is not None:
+                words.append("parallel={!r}".format(parallel))
+            stages.append(" ".join(words))
+        return "Pipeline({})".format(" | ".join(stages))
+
+
+    def add(self, code : str, parallel : str | None = None, **arguments) -> 'Pipeline':
+        """
+        Add a function to the end of the pipeline, checking its arguments
+
+        Parameters
+        ----------
+        code : str
+            Function Code (e.g. FT, SP, ZF)
+        parallel : str | None
+            Parallelism of the function, by default the pipeline's
+        **arguments
+            Arguments of the function, with or without the function prefix
+
+        Returns
+        -------
+        Pipeline
+            New pipeline with the function added
+        """
+        from .fn import fn_list
+
+        try:
+            cls = fn_list[code]
+        except Exception as e:
+            catchError(e, FunctionError, msg='Unknown or Unimplemented function called!', ePrint=False)
+
+        try:
+            arguments = self.resolve(cls, arguments)
+            parallel = None if parallel is None else self.checkParallel(parallel)
+        except (TypeError, ValueError) as e:
+            catchError(e, FunctionError, msg='Invalid arguments for function {0}!'.format(code), ePrint=False)
+
+        pipeline = copy.copy(self)
+        pipeline.stages = self.stages + [(code, arguments, parallel)]
+        return pipeline
+
+
+    def withSource(self, source : DataFrame | str | None) -> 'Pipeline':
+        """
+        Same pipeline run on another data frame or file
+
+        Parameters
+        ----------
+        source : DataFrame | str | None
+            Data frame to process in place, or file to read when the pipeline is run
+
+        Returns
+        -------
+        Pipeline
+            New pipeline with the source replaced
+        """
+        pipeline = copy.copy(self)
+        pipeline.source = source
+        return pipeline
+
+
+    @staticmethod
+    def resolve(cls : type, arguments : dict) -> dict:
+        """
+        Argument names and values of a function checked against its parameters
+
+        Parameters
+        ----------
+        cls : type
+            Function class
+        arguments : dict
+            Arguments by name, with or without the function prefix
+
+        Returns
+        -------
+        dict
+            Arguments by full name (e.g. sp_off)
+        """
+        params = parameters(cls)
+        short = {shortName(name) : name for name in params}
+
+        resolved = {}
+        for key, value in arguments.items():
+            name = key if key in params else short.get(key)
+            if name is None:
+                raise TypeError("unknown argument '{0}', choose from {1}".format(key, ", ".join(short)))
+            if name in resolved:
+                raise TypeError("argument '{0}' given more than once".format(key))
+
+            annotation = params[name].annotation
+            kinds = KINDS.get(annotation)
+            mistyped = kinds is not None and (not isinstance(value, kinds) or \
+                       (isinstance(value, (bool, np.bool_)) and annotation is not bool) or \
+                       (annotation is int and not float(value).is_integer()))
+            if mistyped:
+                raise TypeError("argument '{0}' must be {1}, not {2}".format(
+                    key, annotation.__name__, type(value).__name__))
+            resolved[name] = value
+
+        # Required arguments
+        inspect.signature(cls).bind(**resolved)
+        return resolved
+
+
+    @staticmethod
+    def checkParallel(parallel : str) -> str:
+        """
+        Check a parallelism choice, see :py:data:`PARALLEL`
+        """
+        if parallel not in PARALLEL:
+            raise ValueError("parallel must be one of {0}, not {1!r}".format(", ".join(PARALLEL), parallel))
+        return parallel
+
+
+    def plan(self) -> list[tuple]:
+        """
+        Function objects to run, with runs of functions fused if enabled
+
+        Returns
+        -------
+        list[tuple[DataFunction, str | None]]
+            Function objects in the order they are run and their parallelism choice,
+            fused functions take the choice of their fourier transform
+        """
+        from .fn import fn_list, SPFT
+
+        functions = []
+        choices = {}
+        for code, arguments, parallel in self.stages:
+            if code == 'NULL':
+                continue
+            function = fn_list[code](**arguments)
+            functions.append(function)
+            choices[id(function)] = parallel
+
+        if self.fuse:
+            functions = SPFT.fuse(functions)
+
+        planned = []
+        for function in functions:
+            # Fused functions take the choice of their fourier transform
+            chosen = function if id(function) in choices else getattr(function, 'ft', None)
+            planned.append((function, choices.get(id(chosen))))
+        return planned
+
+
+    def backend(self, function, parallel : str | None, array) -> list:
+        """
+        Multiprocessing settings of a function about to process an array
+
+        Parameters
+        ----------
+        function : DataFunction
+            Function object to run
+        parallel : str | None
+            Parallelism chosen for the function, by default the pipeline's
+        array : ndarray
+            Array the function will process
+
+        Returns
+        -------
+        list
+            Multiprocessing enable, processors and threads, see :py:class:`nmrPype.fn.DataFunction`
+        """
+        parallel = self.parallel if parallel is None else parallel
+        if parallel == 'auto':
+            if self.processors < 2 or not isinstance(array, np.ndarray) \
+            or array.ndim < 2 or array.nbytes < PARALLEL_BYTES:
+                parallel = 'serial'
+            else:
+                parallel = 'threads' if function.threaded else 'processes'
+        return [False if parallel == 'serial' else parallel, self.processors, 0]
+
+
+    def frame(self) -> DataFrame:
+        """
+        Data frame to process, read from the source file if needed
+        """
+        if self.source is None:
+            raise FileIOError("FileIOError - The pipeline has no data to process, set it with withSource")
+        if not isinstance(self.source, str):
+            return self.source
+        data = DataFrame(self.source, reuse=True)
+        # Data read by the pipeline is not shared, its buffers can be reused
+        data.setArray(data.own(data.array))
+        return data
+
+
+    def run(self, output : str | None = None, overwrite : bool = False) -> DataFrame:
+        """
+        Run every function of the pipeline on the data
+
+        Parameters
+        ----------
+        output : str | None
+            File to write the processed data to, not written if None
+        overwrite : bool
+            Choose whether or not to overwrite an existing output file
+
+        Returns
+        -------
+        DataFrame
+            Processed data frame, the source frame itself if the pipeline was built on a frame
+        """
+        data = self.frame()
+
+        for function, parallel in self.plan():
+            function.mp = self.backend(function, parallel, data.array)
+            exitCode = function.run(data)
+            if exitCode:
+                raise FunctionError("FunctionError - Function {0} exited with code {1}".format(
+                    getattr(function, 'name', type(function).__name__), exitCode))
+
+        if output is not None:
+            from .nmrio import write_to_file
+            write_to_file(data, output, overwrite)
+
+        return data
+
+
+__all__ = ['Pipeline']
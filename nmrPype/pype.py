@@ -1,5 +1,6 @@
 import sys, io
-from .utils import DataFrame, catchError, PipeBurst
+from .utils import DataFrame, catchError, PipeBurst, setPrecision
+from .utils.instrument import enableProfiling
 from .parse import parser
 from typing import TypeAlias
 import io
@@ -30,22 +31,49 @@ def fileInput(df : DataFrame, input : InputStream) -> int:
     int
         Integer exit code (e.g. 0 success 1 fail)
     """
-    from .nmrio import read_from_file, read_from_buffer, load_ccp4_map
+    from .nmrio import read_from_file, read_from_buffer
 
     # Determine whether or not reading from the pipeline
     if type(input) == str:
-        if input.endswith('.map'):
-            dic, data = load_ccp4_map(input)
-        else:
-            dic, data = read_from_file(input)
+        dic, data = read_from_file(input)
     else:
         dic, data = read_from_buffer(input)
         
     df.setHeader(dic)
-    df.setArray(data)
+    # Data read for the command-line is not shared, its buffer can be reused
+    df.setArray(df.own(data))
     return 0
     
 
+def headerOutput(input : InputStream) -> int:
+    """
+    nmrPype's header-only handler when run in command-line mode,
+    prints the input header as JSON without reading the data
+
+    Parameters
+    ----------
+    input : InputStream
+        - str: reading file name or filemask
+        - io.TextIOWrapper: read from standard input
+        - io.BufferedReader: read from standard input buffer
+
+    Returns
+    -------
+    int
+        Integer exit code (e.g. 0 success 1 fail)
+    """
+    import json
+    from .nmrio import read_header_from_file, read_header_from_buffer
+
+    if type(input) == str:
+        dic = read_header_from_file(input)
+    else:
+        dic = read_header_from_buffer(input)
+
+    print(json.dumps(dic, indent=1, default=float))
+    return 0
+
+
 def fileOutput(data : DataFrame, args : argparse.Namespace) -> int:
     """
     nmrPype's default file output handler when run by command-line mode
@@ -62,6 +90,8 @@ def fileOutput(data : DataFrame, args : argparse.Namespace) -> int:
             - str: output file name
             - io.BufferedWriter: write to standard output buffer
         - args.overwrite : bool
+        - args.comp : str | None
+        - args.shm : bool
 
     Returns
     -------
@@ -70,14 +100,19 @@ def fileOutput(data : DataFrame, args : argparse.Namespace) -> int:
     """
     output = args.output
     overwrite = args.overwrite
+    codec = args.comp
 
     from .nmrio import write_to_file, write_to_buffer
     
     # Determine whether or not writing to pipeline
     if type(output) == str:
-        return write_to_file(data, output, overwrite)
+        return write_to_file(data, output, overwrite, codec)
     else:
-        return write_to_buffer(data, output, overwrite)
+        # Programs reading the pipeline expect uncompressed data
+        if codec is not None:
+            print("WARNING! Compression only applies to output files, writing uncompressed data to the pipeline",
+                  file=sys.stderr)
+        return write_to_buffer(data, output, overwrite, args.shm)
 
 
 def headerModify(data : DataFrame, param : str, value : float) -> int:
@@ -126,7 +161,7 @@ def function(data : DataFrame, args : argparse.Namespace) -> int:
     fn_params = {}
     # Add operations based on the function
     for opt in vars(args):
-        if (opt.startswith(fn.lower())):
+        if (opt.startswith(fn.lower() + '_')):
             fn_params[opt] = getattr(args, opt)
         elif (opt.startswith('mp')):
             fn_params[opt] = getattr(args,opt)
@@ -134,10 +169,15 @@ def function(data : DataFrame, args : argparse.Namespace) -> int:
     # Attempt to run operation, error handling within is handled per function
     return (data.runFunc(fn, fn_params))
 
-def main() -> int:
+def main(argv : list[str] | None = None) -> int:
     """
     Starting-point for the command-line mode of NMRPype.
 
+    Parameters
+    ----------
+    argv : list[str] | None
+        Command-line arguments, by default the arguments of the current process
+
     Returns
     -------
     int
@@ -145,12 +185,19 @@ def main() -> int:
     """
 
     try:
-        data = DataFrame() # Initialize DataFrame
+        data = DataFrame(reuse=True) # Initialize DataFrame, its arrays are never seen outside of nmrPype
 
-        args = parser(sys.argv[1:]) # Parse user command line arguments
+        args = parser(sys.argv[1:] if argv is None else argv) # Parse user command line arguments
+        setPrecision(args.double)
+        if args.prof:
+            enableProfiling(args.prof)
         data.setVerb(args.verb)
         data.setInc(args.inc)
 
+        # Only report the header if requested
+        if args.hdr:
+            return headerOutput(args.input)
+
         fileInput(data, args.input) # Determine whether reading from pipeline or not
             
         if hasattr(args.input, 'close'): # Close file/datastream if necessary
@@ -171,13 +218,17 @@ def main() -> int:
         # Obtain delete imaginary parameter only if no function is called
         # runDI = args.di if not args.fc else (args.di or args.di_alt)
 
-        # Delete imaginary element if prompted
+        # Delete imaginary element if prompted, output is written directly so a view is sufficient
         if args.di:
-            data.runFunc('DI', {'mp_enable':args.mp_enable,'mp_proc':args.mp_proc,'mp_threads':args.mp_threads})
+            data.runFunc('DI', {'di_view':True, 'mp_enable':args.mp_enable,'mp_proc':args.mp_proc,'mp_threads':args.mp_threads})
 
         # Output Data as Necessary
         fileOutput(data, args)
 
+        # Hand the output downstream before drawing
+        if processLater and hasattr(args.output, 'flush'):
+            args.output.flush()
+
         # Process function after passing data
         if processLater:
             function(data,args)
@@ -1,6 +1,7 @@
 import numpy as np 
 from .errorHandler import *
 import sys
+import weakref
 from typing import TypeAlias
 
 # Type declarations
@@ -21,8 +22,13 @@ class DataFrame:
         Header to initialize, by default obtained from file or set
     array : Array [numpy.ndarray or None]
         Array to initialize, by default obtained from file or set
+    reuse : bool
+        Let functions overwrite the frame's arrays and recycle replaced arrays as
+        output buffers. Only enable it when the frame's arrays are never referenced
+        outside of it, as in the command-line, or a Pipeline or batch reading its input file.
     """
-    def __init__(self, file : str = "", header : dict = {}, array : Array = None, verb : int = 0, inc : int = 16):
+    def __init__(self, file : str = "", header : dict = {}, array : Array = None, verb : int = 0, inc : int = 16,
+                 reuse : bool = False):
         if (file): # Read only if file is provided
             from ..nmrio import read_from_file
 
@@ -42,6 +48,11 @@ class DataFrame:
             self.verb = verb
             self.inc = inc
 
+        # Buffer kept for reuse and arrays allocated by the frame itself
+        self.reuse = reuse
+        self.spare = None
+        self.owned = weakref.WeakValueDictionary()
+
 
     def __repr__(self):
         """
@@ -112,6 +123,123 @@ class DataFrame:
         return(function.run(self))
 
 
+    def runFuncs(self, functions : list[tuple[str, dict]], fuse : bool = True) -> int:
+        """
+        Run a sequence of functions on the data, see :py:func:`runFunc`.
+
+        Neighbouring SP, ZF and FT calls are fused into a single pass over the data
+        unless fuse is disabled, see :py:class:`nmrPype.fn.SPFT`.
+
+        Parameters
+        ----------
+        functions : list[tuple[str, dict]]
+            Function codes and their arguments in the order to run them
+            (e.g. [('SP', {'sp_off':0.5}), ('ZF', {}), ('FT', {})])
+        fuse : bool
+            Fuse functions that can be run in a single pass
+
+        Returns
+        -------
+        int
+            Integer exit code obtained by the first failing function, 0 on success
+        """
+        from ..fn import fn_list, SPFT
+
+        objects = []
+        for targetFunction, arguments in functions:
+            if targetFunction == 'NULL':
+                continue
+            try:
+                objects.append(fn_list[targetFunction](**arguments))
+            except Exception as e:
+                catchError(e, FunctionError, msg='Unknown or Unimplemented function called!', ePrint=False)
+
+        if fuse:
+            objects = SPFT.fuse(objects)
+
+        for function in objects:
+            exitCode = function.run(self)
+            if exitCode:
+                return exitCode
+        return 0
+
+
+    def own(self, array : Array) -> Array:
+        """
+        Mark an array as allocated by the data frame, so that it may be reused
+        for a later function's output once a function replaces it.
+        Only mark arrays that are not referenced outside of the frame.
+
+        Parameters
+        ----------
+        array : Array
+            Array owned by the frame
+
+        Returns
+        -------
+        Array
+            The same array
+        """
+        if isinstance(array, np.ndarray):
+            self.owned[id(array)] = array
+        return array
+
+
+    def empty(self, shape : tuple, dtype) -> np.ndarray:
+        """
+        Allocate an uninitialized array owned by the frame,
+        reusing the spare buffer when it is large enough
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the new array
+        dtype : data-type
+            Data type of the new array
+
+        Returns
+        -------
+        np.ndarray
+            Uninitialized C-contiguous array
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+
+        spare, self.spare = self.spare, None
+        if spare is not None and spare.nbytes >= nbytes:
+            array = spare.reshape(-1).view(np.uint8)[:nbytes].view(dtype).reshape(shape)
+        else:
+            # Release a spare that is too small before allocating
+            del spare
+            array = np.empty(shape, dtype=dtype)
+
+        return self.own(array)
+
+
+    def recycle(self, array : Array):
+        """
+        Keep an array replaced by a function as the spare buffer,
+        if reuse is enabled, the frame owns it and it does not overlap the current array
+
+        Parameters
+        ----------
+        array : Array
+            Array that is no longer the frame's array
+        """
+        if not self.reuse or not isinstance(array, np.ndarray) or self.owned.get(id(array)) is not array:
+            return
+        del self.owned[id(array)]
+
+        if not (array.flags.c_contiguous and array.flags.writeable):
+            return
+        if isinstance(self.array, np.ndarray) and np.may_share_memory(array, self.array):
+            return
+
+        # Keep only the largest buffer
+        if self.spare is None or array.nbytes > self.spare.nbytes:
+            self.spare = array
+
+
     def updateParamSyntax(self, param : str, dim : int) -> str :
         """
         Converts header keywords from ND to proper parameter syntax if necessary
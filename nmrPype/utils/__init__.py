@@ -1,7 +1,9 @@
 from .errorHandler import PipeBurst, FileIOError, UnknownHeaderParam, FunctionError, catchError
 from .DataFrame import DataFrame
+from .precision import setPrecision, isDouble, realType, complexType, toWorkType, toFileType
 
 __all__ = [
     'PipeBurst', 'FileIOError', 'UnknownHeaderParam',
-    'FunctionError', 'catchError', 'DataFrame'
+    'FunctionError', 'catchError', 'DataFrame',
+    'setPrecision', 'isDouble', 'realType', 'complexType', 'toWorkType', 'toFileType'
 ]
\ No newline at end of file
@@ -1,10 +1,10 @@
 from .datamanip import fdata2dic, dic2fdata
-from .datamanip import get_fdata, get_fdata_data
+from .datamanip import get_dtype, get_fdata, get_fdata_data
 from .datamanip import reshape_data, unshape_data, unappend_data, append_data, find_shape
 from .datamanip import put_fdata, put_trace, put_data, get_trace
 from .datamanip import pipe_2d, pipe_3d, pipestream_3d, pipe_4d, pipestream_4d
 
-__all__ = ['fdata2dic','dic2fdata','get_fdata','get_fdata_data',
+__all__ = ['fdata2dic','dic2fdata','get_dtype','get_fdata','get_fdata_data',
            'reshape_data','unshape_data','unappend_data','append_data',
            'find_shape','put_fdata','put_trace','put_data',
            'get_trace','pipe_2d','pipe_3d','pipestream_3d',
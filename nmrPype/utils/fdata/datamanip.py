@@ -115,6 +115,26 @@ def dic2fdata(dic : dict) -> np.ndarray:
 #################################
 
 
+def get_dtype(fdata : np.ndarray) -> np.dtype:
+    """
+    Determine the float32 dtype with the byte order of a NMRPipe file.
+
+    Parameters
+    ----------
+    fdata : ndarray
+        Raw header (or header and data) read as native float32,
+        fdata[2] holds 2.345 when the file matches the native byte order
+
+    Returns
+    -------
+    np.dtype
+        Native float32 or its byteswapped counterpart ('>f4'/'<f4')
+    """
+    if abs(fdata[2] - 2.345) > 1e-6:
+        return np.dtype('float32').newbyteorder('S')
+    return np.dtype('float32')
+
+
 def get_fdata(filename : InputFile) -> np.ndarray:
     """
     Get an array of length 512-bytes holding NMRPipe header.
@@ -127,16 +147,16 @@ def get_fdata(filename : InputFile) -> np.ndarray:
     Returns
     -------
     fdata : ndarray
-        512x4-byte numpy array for header
+        512x4-byte numpy array for header, its dtype carries the
+        byte order of the file (see :py:func:`get_dtype`)
     """
     if type(filename) is bytes:
         fdata = np.frombuffer(filename, dtype=np.float32, count=512)
     else:
         fdata = np.fromfile(filename, 'float32', 512)
 
-    if fdata[2] - 2.345 > 1e-6:    # fdata[2] should be 2.345
-        fdata = fdata.byteswap()
-    return fdata
+    # view foreign-endian headers with the file byte order instead of copying
+    return fdata.view(get_dtype(fdata))
 
 
 def get_fdata_data(filename : InputFile) -> tuple[np.ndarray, np.ndarray]:
@@ -153,15 +173,15 @@ def get_fdata_data(filename : InputFile) -> tuple[np.ndarray, np.ndarray]:
     fdata : ndarray
         512x4-byte header array
     data : ndarray
-        1D array representation of NMR data 
+        1D array representation of NMR data, in the byte order of the file
     """
     if type(filename) is bytes:
         data = np.frombuffer(filename, dtype=np.float32)
     else:
         data = np.fromfile(filename, 'float32')
 
-    if data[2] - 2.345 > 1e-6:  # check for byteswap
-        data = data.byteswap()
+    # foreign-endian data is viewed in place and converted when decoded
+    data = data.view(get_dtype(data))
     return data[:512], data[512:]
 
 
@@ -204,7 +224,8 @@ def unappend_data(data : np.ndarray) -> np.ndarray:
     """
     Return complex data with last axis (-1) unappended.
 
-    Data should have imaginary data vector appended to real data vector
+    Data should have imaginary data vector appended to real data vector,
+    it may be in either byte order.
 
     See :py:func:`append_data` for the inverse operation.
 
@@ -219,7 +240,12 @@ def unappend_data(data : np.ndarray) -> np.ndarray:
         NMR data with direct dimension represented as complex numpy values
     """
     h = int(data.shape[-1] / 2)
-    return np.array(data[..., :h] + data[..., h:] * 1.j, dtype="complex64")
+
+    # Write each half straight into the output, converting byte order on the way
+    out = np.empty(data.shape[:-1] + (h,), dtype="complex64")
+    out.real = data[..., :h]
+    out.imag = data[..., h:2*h]
+    return out
 
 
 def append_data(data : np.ndarray) -> np.ndarray:
@@ -367,14 +393,17 @@ def get_trace(fhandle, ntrace, pts, bswap, cplex):
         tpts = pts
 
     fhandle.seek(4 * (512 + ntrace * tpts))  # seek to the start of the trace
-    trace = np.fromfile(fhandle, 'float32', tpts)
 
+    # read in file byte order, conversion happens once when decoding
+    dtype = np.dtype('float32')
     if bswap:
-        trace = trace.byteswap()
+        dtype = dtype.newbyteorder('S')
+    trace = np.fromfile(fhandle, dtype, tpts)
+
     if cplex:
         return unappend_data(trace)
     else:
-        return trace
+        return trace.astype('float32', copy=False)
     
 
 ###########
@@ -407,10 +436,7 @@ class pipe_2d(data_nd):
         """
         # read and parse the NMRPipe header
         fdata = get_fdata(filename)  # get the header data
-        if fdata[2] - 2.345 > 1e-6:  # check if byteswapping will be necessary
-            self.bswap = True
-        else:
-            self.bswap = False
+        self.bswap = not fdata.dtype.isnative  # check if byteswapping will be necessary
 
         dic = fdata2dic(fdata)  # create the dictionary
         fshape = list(find_shape(dic))
@@ -505,10 +531,7 @@ class pipe_3d(data_nd):
 
         # read and parse the NMRPipe header in the first file of the 3D
         fdata = get_fdata(filename)  # get the header data
-        if fdata[2] - 2.345 > 1e-6:  # check if byteswapping will be necessary
-            self.bswap = True
-        else:
-            self.bswap = False
+        self.bswap = not fdata.dtype.isnative  # check if byteswapping will be necessary
 
         # find the shape of the first two dimensions
         dic = fdata2dic(fdata)  # create the dictionary
@@ -618,10 +641,7 @@ class pipestream_3d(data_nd):
         """
         # read and parse the NMRPipe header
         fdata = get_fdata(filename)  # get the header data
-        if fdata[2] - 2.345 > 1e-6:  # check if byteswapping will be necessary
-            self.bswap = True
-        else:
-            self.bswap = False
+        self.bswap = not fdata.dtype.isnative  # check if byteswapping will be necessary
 
         dic = fdata2dic(fdata)  # create the dictionary
         fshape = list(find_shape(dic))
@@ -722,10 +742,7 @@ class pipe_4d(data_nd):
 
         # read and parse the NMRPipe header in the first file of the 3D
         fdata = get_fdata(filename)  # get the header data
-        if fdata[2] - 2.345 > 1e-6:  # check if byteswapping will be necessary
-            self.bswap = True
-        else:
-            self.bswap = False
+        self.bswap = not fdata.dtype.isnative  # check if byteswapping will be necessary
 
         # find the shape of the first two dimensions
         dic = fdata2dic(fdata)  # create the dictionary
@@ -857,10 +874,7 @@ class pipestream_4d(data_nd):
         """
         # read and parse the NMRPipe header
         fdata = get_fdata(filename)  # get the header data
-        if fdata[2] - 2.345 > 1e-6:  # check if byteswapping will be necessary
-            self.bswap = True
-        else:
-            self.bswap = False
+        self.bswap = not fdata.dtype.isnative  # check if byteswapping will be necessary
 
         dic = fdata2dic(fdata)  # create the dictionary
         fshape = list(find_shape(dic))
@@ -0,0 +1,233 @@
+"""
+instrument
+
+Per-stage timing and memory instrumentation of an nmrPype run.
+
+When enabled, the stages of a run (header decode, data read, each
+:py:class:`nmrPype.fn.function.DataFunction` phase and the data write)
+record their wall time, CPU time, bytes read or written, array sizes and
+the peak resident set size of the process. The records are emitted as a
+JSON report to stderr or a file once the run exits.
+
+Instrumentation is enabled by the ``-prof [file]`` command-line switch or by
+setting the ``NMRPYPE_PROFILE`` environment variable to a file path, or to
+``1``/``stderr`` to report on stderr. It is disabled by default and costs a
+single check per stage when disabled.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # resource is unavailable on windows, peak RSS is not reported
+    resource = None
+
+PROFILE_ENV = 'NMRPYPE_PROFILE'
+
+# Targets meaning the report is written to stderr
+STDERR_TARGETS = ('', '-', '1', 'stderr', 'true', 'yes', 'on')
+
+_profiler = None
+
+
+class Profiler:
+    """
+    Collects stage records for the running process
+
+    Only the outermost stage is recorded when stages nest, so functions that
+    run other functions internally or process tasks on threads are reported once.
+    Records made by worker processes are ignored.
+
+    Parameters
+    ----------
+    output : str | None
+        File path to write the report to, the report is written to stderr if None
+    """
+    def __init__(self, output : str | None = None):
+        self.output = output
+        self.stages = []
+        self.pid = os.getpid()
+        self.depth = 0
+        self.lock = threading.Lock()
+        self.start = (time.perf_counter(), time.process_time())
+        self.reported = False
+
+    def enter(self) -> bool:
+        """
+        Open a stage, returns True if the stage is the outermost stage of the process
+        """
+        with self.lock:
+            self.depth += 1
+            return self.depth == 1
+
+    def exit(self):
+        """
+        Close a stage opened by :py:func:`enter`
+        """
+        with self.lock:
+            self.depth -= 1
+
+    def report(self) -> dict:
+        """
+        Build the report of all recorded stages
+
+        Returns
+        -------
+        dict
+            Report with the stage records and the totals of the run
+        """
+        wall, cpu = self.start
+        return {'argv' : sys.argv,
+                'stages' : self.stages,
+                'total' : {'wall' : time.perf_counter() - wall,
+                           'cpu' : time.process_time() - cpu,
+                           'peak_rss' : peakRSS()}}
+
+    def write(self):
+        """
+        Write the report to the output file or stderr, only once per run
+        """
+        if self.reported or os.getpid() != self.pid:
+            return
+        self.reported = True
+        text = json.dumps(self.report(), indent=1, default=str)
+        if self.output:
+            with open(self.output, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text, file=sys.stderr)
+
+
+def peakRSS() -> int | None:
+    """
+    Peak resident set size of the process in bytes
+
+    Returns
+    -------
+    int | None
+        Peak RSS in bytes, None if unavailable on the platform
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def enableProfiling(output : str | None = None):
+    """
+    Enable instrumentation for the rest of the run, the report is written at exit
+
+    Parameters
+    ----------
+    output : str | None
+        File path to write the report to, stderr is used for None,
+        ``-`` or any of the values accepted for ``NMRPYPE_PROFILE``
+    """
+    global _profiler
+    if output is not None and str(output).lower() in STDERR_TARGETS:
+        output = None
+    if _profiler is None:
+        _profiler = Profiler(output)
+        atexit.register(_profiler.write)
+    elif output is not None:
+        _profiler.output = output
+
+
+def finishProfiling():
+    """
+    Write the report of this process now and disable instrumentation,
+    for processes ending without running exit handlers (e.g. forked server stages).
+    Instrumentation inherited from a parent process is dropped without a report.
+    """
+    global _profiler
+    if _profiler is not None:
+        _profiler.write()
+    _profiler = None
+
+
+def isProfiling() -> bool:
+    """
+    Check whether instrumentation is enabled
+
+    Returns
+    -------
+    bool
+        True if stages are being recorded
+    """
+    return _profiler is not None
+
+
+def profileReport() -> dict | None:
+    """
+    Obtain the report of the stages recorded so far
+
+    Returns
+    -------
+    dict | None
+        Current report, None if instrumentation is disabled
+    """
+    return None if _profiler is None else _profiler.report()
+
+
+@contextmanager
+def stage(name : str, **fields):
+    """
+    Record a stage of the run
+
+    The yielded dictionary is added to the record, so the stage can
+    report values only known once it completes (e.g. bytes read).
+
+    Parameters
+    ----------
+    name : str
+        Stage name, e.g. ``read.header`` or ``FT.process``
+    **fields
+        Initial values of the record
+
+    Yields
+    ------
+    dict
+        Record of the stage
+    """
+    profiler = _profiler
+    if profiler is None or os.getpid() != profiler.pid:
+        yield fields
+        return
+
+    outer = profiler.enter()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield fields
+    finally:
+        if outer:
+            record = {'stage' : name,
+                      'wall' : time.perf_counter() - wall,
+                      'cpu' : time.process_time() - cpu}
+            record.update(fields)
+            record['peak_rss'] = peakRSS()
+            profiler.stages.append(record)
+        profiler.exit()
+
+
+def arrayFields(array) -> dict:
+    """
+    Shape, type and size in bytes of an array for a stage record
+    """
+    if array is None or not hasattr(array, 'shape'):
+        return {}
+    return {'shape' : list(array.shape),
+            'dtype' : str(array.dtype),
+            'nbytes' : int(getattr(array, 'nbytes', 0))}
+
+
+_env = os.environ.get(PROFILE_ENV)
+if _env and _env.lower() not in ('0', 'false', 'no', 'off'):
+    enableProfiling(_env)
@@ -0,0 +1,119 @@
+"""
+precision
+
+Floating point precision policy for the arrays processed by functions.
+
+NMRPipe data is stored as float32, so arrays are kept in float32 and complex64
+by default and functions build their windows, phases and filters to match.
+Double precision is an explicit opt-in, data is always written back as float32.
+"""
+
+import numpy as np
+
+_double = False
+
+
+def setPrecision(double : bool = False):
+    """
+    Select the precision used for processing
+
+    Parameters
+    ----------
+    double : bool
+        Process in float64/complex128 instead of float32/complex64
+    """
+    global _double
+    _double = bool(double)
+
+
+def isDouble() -> bool:
+    """
+    Check whether double precision processing is enabled
+
+    Returns
+    -------
+    bool
+        True if processing in double precision
+    """
+    return _double
+
+
+def realType() -> np.dtype:
+    """
+    Real data type used for processing
+
+    Returns
+    -------
+    np.dtype
+        float64 in double precision mode, otherwise float32
+    """
+    return np.dtype('float64') if _double else np.dtype('float32')
+
+
+def complexType() -> np.dtype:
+    """
+    Complex data type used for processing
+
+    Returns
+    -------
+    np.dtype
+        complex128 in double precision mode, otherwise complex64
+    """
+    return np.dtype('complex128') if _double else np.dtype('complex64')
+
+
+def workType(array : np.ndarray) -> np.dtype:
+    """
+    Processing data type matching an array's real or complex type
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Target array
+
+    Returns
+    -------
+    np.dtype
+        Complex processing type for complex arrays, otherwise the real processing type
+    """
+    return complexType() if np.iscomplexobj(array) else realType()
+
+
+def toWorkType(array : np.ndarray) -> np.ndarray:
+    """
+    Cast a floating point array to the processing precision, without copying
+    if it already matches. Other arrays are returned unchanged.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Target array
+
+    Returns
+    -------
+    np.ndarray
+        Array in the processing precision
+    """
+    if not isinstance(array, np.ndarray) or array.dtype.kind not in 'fc':
+        return array
+    return array.astype(workType(array), copy=False)
+
+
+def toFileType(array : np.ndarray) -> np.ndarray:
+    """
+    Cast a floating point array to the float32 or complex64 type stored in
+    NMRPipe files, without copying if it already matches.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Target array
+
+    Returns
+    -------
+    np.ndarray
+        Array in single precision
+    """
+    if not isinstance(array, np.ndarray) or array.dtype.kind not in 'fc':
+        return array
+    return array.astype('complex64' if np.iscomplexobj(array) else 'float32', copy=False)
@@ -2,16 +2,18 @@ from setuptools import setup,find_packages
 
 setup(name='nmrPype',
     version='1.0.8',
-    packages=find_packages(), 
+    packages=find_packages(exclude=['benchmarks']), 
     install_requires=[
         'numpy',
         'scipy',
-        'gemmi',
         'matplotlib',
     ],
     entry_points={
         'console_scripts': [
             'nmrPype = nmrPype.pype:main',
+            'nmrPype-daemon = nmrPype.daemon:serverMain',
+            'nmrPype-client = nmrPype.daemon:clientMain',
+            'nmrPype-batch = nmrPype.batch:main',
         ]
     },
     author='Micah Smith',
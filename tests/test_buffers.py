@@ -0,0 +1,29 @@
+"""
+Arrays handed out by a data frame stay intact while later functions run on it
+"""
+import numpy as np
+
+from benchmarks.synthetic import syntheticFrame
+
+
+def test_functions_keep_earlier_arrays():
+    df = syntheticFrame((16, 256))
+    df.runFunc('ZF', {'zf_count' : 1})
+    a1 = df.array
+    c1 = a1.copy()
+    df.runFunc('FT', {})
+    a2 = df.array
+    c2 = a2.copy()
+    df.runFunc('DI', {})
+    df.runFunc('ZF', {})
+
+    assert np.array_equal(a1, c1)
+    assert np.array_equal(a2, c2)
+
+
+def test_reuse_frame_recycles_buffers():
+    df = syntheticFrame((16, 256))
+    df.reuse = True
+    df.runFunc('ZF', {'zf_count' : 1})
+    df.runFunc('DI', {})
+    assert df.spare is not None